@@ -66,13 +66,13 @@ def _raw_remove_deliveries(deliveries_ids):
             Exists(deliveries.filter(payload_id=OuterRef("id")))
         ).values_list("id", flat=True)
     )
-    payloads = EventPayload.objects.filter(id__in=payloads_ids)
     attempts = EventDeliveryAttempt.objects.filter(
         Exists(deliveries.filter(id=OuterRef("delivery_id")))
     )
     attempts._raw_delete(attempts.db)  # type: ignore[attr-defined] # raw access # noqa: E501
     deliveries._raw_delete(deliveries.db)  # type: ignore[attr-defined] # raw access # noqa: E501
-    payloads._raw_delete(payloads.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+    # payloads are shared between deliveries, also of other apps
+    EventPayload.objects.filter(id__in=payloads_ids).delete_unused()
 
 
 @celeryconf.app.task
@@ -0,0 +1,12 @@
+"""Gunicorn configuration of the API server.
+
+Used with `gunicorn --config python:saleor.asgi.gunicorn_config`.
+"""
+
+
+def on_starting(server):
+    # Runs in the master process, after the application is loaded with `--preload`
+    # and before the workers are forked.
+    from . import preload_app
+
+    preload_app()
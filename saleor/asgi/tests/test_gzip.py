@@ -86,3 +86,40 @@ async def test_with_supported_compression(large_asgi_app: ASGI3Application, sett
             type="http.response.body", body=expected_payload, more_body=False
         ),
     ]
+
+
+async def test_streaming_response_compression(settings):
+    # given
+    settings.ALLOWED_GRAPHQL_ORIGINS = ["*"]
+    chunks = [1000 * b"x", 1000 * b"y", 1000 * b"z"]
+
+    async def streaming_app(scope, receive, send) -> None:
+        await send(
+            HTTPResponseStartEvent(
+                type="http.response.start",
+                status=200,
+                headers=[(b"content-type", b"application/json")],
+                trailers=False,
+            )
+        )
+        for index, chunk in enumerate(chunks, start=1):
+            await send(
+                HTTPResponseBodyEvent(
+                    type="http.response.body",
+                    body=chunk,
+                    more_body=index < len(chunks),
+                )
+            )
+
+    app = gzip_compression(streaming_app)
+
+    # when
+    events = await run_app(app, build_scope("http://localhost:3000", b"gzip"))
+
+    # then
+    body_events = [event for event in events if event["type"] == "http.response.body"]
+    assert len(body_events) == len(chunks)
+    assert body_events[-1]["more_body"] is False
+    body = b"".join(event["body"] for event in body_events)
+    assert gzip.decompress(body) == b"".join(chunks)
+    assert (b"content-encoding", b"gzip") in events[0]["headers"]
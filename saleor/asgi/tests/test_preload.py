@@ -0,0 +1,30 @@
+import logging
+from unittest.mock import Mock, patch
+
+from .. import preload_app
+from ..gunicorn_config import on_starting
+
+
+@patch("saleor.asgi.gc.freeze")
+def test_preload_app(mocked_freeze, caplog):
+    # given
+    caplog.set_level(logging.INFO, logger="saleor.asgi")
+
+    # when
+    preload_app()
+
+    # then
+    mocked_freeze.assert_called_once_with()
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("Application preloaded in")
+    for phase in ["schema", "urls", "cost_map", "plugins"]:
+        assert f"{phase}: " in message
+
+
+@patch("saleor.asgi.preload_app")
+def test_gunicorn_on_starting_preloads_app(mocked_preload_app):
+    # when
+    on_starting(Mock())
+
+    # then
+    mocked_preload_app.assert_called_once_with()
@@ -16,6 +16,26 @@ class AllocationStrategy:
     ]
 
 
+class ReservationStrategy:
+    """Determine how the stocks are reserved for checkouts in the channel.
+
+    LOCK_STOCKS - lock the stocks of the checkout lines before calculating the
+    reservations
+
+    OPTIMISTIC - calculate the reservations without locking the stocks and verify
+    the stocks after saving them, falling back to locking the stocks when they were
+    reserved in the meantime; suited for variants reserved by many checkouts at once
+    """
+
+    LOCK_STOCKS = "lock-stocks"
+    OPTIMISTIC = "optimistic"
+
+    CHOICES = [
+        (LOCK_STOCKS, "Lock stocks"),
+        (OPTIMISTIC, "Optimistic"),
+    ]
+
+
 class MarkAsPaidStrategy:
     """Determine the mark as paid strategy for the channel.
 
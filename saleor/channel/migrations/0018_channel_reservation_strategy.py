@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-19 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("channel", "0017_channel_include_draft_order_in_voucher_usage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="reservation_strategy",
+            field=models.CharField(
+                choices=[("lock-stocks", "Lock stocks"), ("optimistic", "Optimistic")],
+                default="lock-stocks",
+                max_length=255,
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            ALTER TABLE channel_channel
+            ALTER COLUMN reservation_strategy
+            SET DEFAULT 'lock-stocks';
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
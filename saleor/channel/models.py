@@ -6,7 +6,12 @@ from django_countries.fields import CountryField
 
 from ..core.models import ModelWithMetadata
 from ..permission.enums import ChannelPermissions
-from . import AllocationStrategy, MarkAsPaidStrategy, TransactionFlowStrategy
+from . import (
+    AllocationStrategy,
+    MarkAsPaidStrategy,
+    ReservationStrategy,
+    TransactionFlowStrategy,
+)
 
 
 class Channel(ModelWithMetadata):
@@ -20,6 +25,11 @@ class Channel(ModelWithMetadata):
         choices=AllocationStrategy.CHOICES,
         default=AllocationStrategy.PRIORITIZE_SORTING_ORDER,
     )
+    reservation_strategy = models.CharField(
+        max_length=255,
+        choices=ReservationStrategy.CHOICES,
+        default=ReservationStrategy.LOCK_STOCKS,
+    )
     order_mark_as_paid_strategy = models.CharField(
         max_length=255,
         choices=MarkAsPaidStrategy.CHOICES,
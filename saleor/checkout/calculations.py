@@ -1,7 +1,9 @@
+import hashlib
+import json
 import logging
 from collections.abc import Iterable
 from decimal import Decimal
-from typing import TYPE_CHECKING, Optional, cast
+from typing import TYPE_CHECKING, Optional, Union, cast
 
 from django.conf import settings
 from django.utils import timezone
@@ -25,16 +27,40 @@ from ..tax.utils import (
     normalize_tax_rate_for_db,
 )
 from .fetch import find_checkout_line_info
-from .models import Checkout
+from .models import Checkout, CheckoutLine
 from .payment_utils import update_checkout_payment_statuses
 
 if TYPE_CHECKING:
     from ..account.models import Address
+    from ..discount.models import CheckoutDiscount, CheckoutLineDiscount
     from ..plugins.manager import PluginsManager
     from .fetch import CheckoutInfo, CheckoutLineInfo
 
 logger = logging.getLogger(__name__)
 
+CHECKOUT_PRICE_FIELDS = [
+    "voucher_code",
+    "total_net_amount",
+    "total_gross_amount",
+    "subtotal_net_amount",
+    "subtotal_gross_amount",
+    "shipping_price_net_amount",
+    "shipping_price_gross_amount",
+    "shipping_tax_rate",
+    "translated_discount_name",
+    "discount_amount",
+    "discount_name",
+    "currency",
+    "last_change",
+    "price_fingerprint",
+    "tax_error",
+]
+CHECKOUT_LINE_PRICE_FIELDS = [
+    "total_price_net_amount",
+    "total_price_gross_amount",
+    "tax_rate",
+]
+
 
 def checkout_shipping_price(
     *,
@@ -236,14 +262,26 @@ def _fetch_checkout_prices_if_expired(
     First calculate and apply all checkout prices with taxes separately,
     then apply tax data as well if we receive one.
 
-    Prices can be updated only if force_update == True, or if time elapsed from the
-    last price update is greater than settings.CHECKOUT_PRICES_TTL.
+    Prices can be updated only if force_update == True, if the checkout data the
+    prices are calculated from changed since the last price update, or if time
+    elapsed from the last price update is greater than settings.CHECKOUT_PRICES_TTL.
     """
     checkout = checkout_info.checkout
 
-    if not force_update and checkout.price_expiration > timezone.now():
+    if (
+        not force_update
+        and checkout.price_expiration > timezone.now()
+        and checkout.price_fingerprint
+        in ("", get_checkout_price_fingerprint(checkout_info, lines))
+    ):
         return checkout_info, lines
 
+    previous_checkout_prices = _get_checkout_prices(checkout)
+    previous_lines_prices = {
+        line_info.line.pk: _get_checkout_line_prices(line_info.line)
+        for line_info in lines
+    }
+
     tax_configuration = checkout_info.tax_configuration
     tax_calculation_strategy = get_tax_calculation_strategy_for_checkout(
         checkout_info, lines, database_connection_name=database_connection_name
@@ -311,42 +349,138 @@ def _fetch_checkout_prices_if_expired(
             # Calculate net prices without taxes.
             _set_checkout_base_prices(checkout, checkout_info, lines)
 
-    checkout_update_fields = [
-        "voucher_code",
-        "total_net_amount",
-        "total_gross_amount",
-        "subtotal_net_amount",
-        "subtotal_gross_amount",
-        "shipping_price_net_amount",
-        "shipping_price_gross_amount",
-        "shipping_tax_rate",
-        "translated_discount_name",
-        "discount_amount",
-        "discount_name",
-        "currency",
-        "last_change",
-        "price_expiration",
-        "tax_error",
+    checkout_update_fields = [*CHECKOUT_PRICE_FIELDS, "price_expiration"]
+    # the line prices are changed only by the prices calculation, so the lines
+    # which prices didn't change don't need to be saved
+    changed_lines = [
+        line_info.line
+        for line_info in lines
+        if _get_checkout_line_prices(line_info.line)
+        != previous_lines_prices.get(line_info.line.pk)
     ]
 
     checkout.price_expiration = timezone.now() + settings.CHECKOUT_PRICES_TTL
+    checkout.price_fingerprint = get_checkout_price_fingerprint(checkout_info, lines)
+    if not changed_lines and _get_checkout_prices(checkout) == previous_checkout_prices:
+        # the prices were refreshed after the TTL passed, but didn't change
+        checkout_update_fields = ["price_expiration"]
 
     with allow_writer():
         checkout.save(
             update_fields=checkout_update_fields,
             using=settings.DATABASE_CONNECTION_DEFAULT_NAME,
         )
-        checkout.lines.bulk_update(
-            [line_info.line for line_info in lines],
-            [
-                "total_price_net_amount",
-                "total_price_gross_amount",
-                "tax_rate",
-            ],
-        )
+        if changed_lines:
+            checkout.lines.bulk_update(changed_lines, CHECKOUT_LINE_PRICE_FIELDS)
     return checkout_info, lines
 
 
+def _get_checkout_prices(checkout: "Checkout") -> list:
+    return [getattr(checkout, field) for field in CHECKOUT_PRICE_FIELDS]
+
+
+def _get_checkout_line_prices(line: "CheckoutLine") -> list:
+    return [getattr(line, field) for field in CHECKOUT_LINE_PRICE_FIELDS]
+
+
+def _get_discount_fingerprint(
+    discount: Union["CheckoutDiscount", "CheckoutLineDiscount"],
+) -> list:
+    return [
+        discount.type,
+        discount.value_type,
+        discount.value,
+        discount.amount_value,
+        discount.voucher_id,
+        discount.voucher_code,
+        discount.promotion_rule_id,
+        discount.reason,
+    ]
+
+
+def get_checkout_price_fingerprint(
+    checkout_info: "CheckoutInfo", lines: Iterable["CheckoutLineInfo"]
+) -> str:
+    """Return the hash of the checkout data the prices are calculated from.
+
+    The hash is calculated from the already fetched checkout data, without database
+    queries. The data that is not fetched with the checkout, like the flat tax rates,
+    the order promotions or the responses of the tax apps, is refreshed after
+    settings.CHECKOUT_PRICES_TTL.
+    """
+    checkout = checkout_info.checkout
+    tax_configuration = checkout_info.tax_configuration
+    data = {
+        "checkout": [
+            checkout.channel_id,
+            checkout.currency,
+            checkout.country.code,
+            checkout.voucher_code,
+            checkout.tax_exemption,
+            checkout.shipping_method_id,
+            checkout.collection_point_id,
+        ],
+        "addresses": [
+            address.as_data() if address else None
+            for address in [
+                checkout_info.shipping_address,
+                checkout_info.billing_address,
+            ]
+        ],
+        "shipping": [
+            [listing.price_amount, listing.currency]
+            for listing in checkout_info.shipping_channel_listings
+            if listing.shipping_method_id == checkout.shipping_method_id
+        ],
+        "tax_configuration": [
+            tax_configuration.charge_taxes,
+            tax_configuration.tax_calculation_strategy,
+            tax_configuration.prices_entered_with_tax,
+            tax_configuration.tax_app_id,
+        ],
+        "discounts": [
+            _get_discount_fingerprint(discount) for discount in checkout_info.discounts
+        ],
+        "lines": [_get_line_fingerprint(line_info) for line_info in lines],
+    }
+    serialized = json.dumps(data, default=_serialize_fingerprint_value, sort_keys=True)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _serialize_fingerprint_value(value) -> str:
+    # the amounts calculated in the process and the ones fetched from the database
+    # differ in the number of decimal places
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    return str(value)
+
+
+def _get_line_fingerprint(line_info: "CheckoutLineInfo") -> list:
+    line = line_info.line
+    channel_listing = line_info.channel_listing
+    return [
+        line.pk,
+        line.variant_id,
+        line.quantity,
+        line.is_gift,
+        line.price_override,
+        channel_listing.price_amount if channel_listing else None,
+        channel_listing.discounted_price_amount if channel_listing else None,
+        line_info.tax_class.pk if line_info.tax_class else None,
+        [
+            [
+                rule_info.rule.pk,
+                rule_info.promotion.updated_at,
+                rule_info.variant_listing_promotion_rule.discount_amount
+                if rule_info.variant_listing_promotion_rule
+                else None,
+            ]
+            for rule_info in line_info.rules_info
+        ],
+        [_get_discount_fingerprint(discount) for discount in line_info.discounts],
+    ]
+
+
 def _calculate_and_add_tax(
     tax_calculation_strategy: str,
     tax_app_identifier: Optional[str],
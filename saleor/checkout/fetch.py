@@ -12,10 +12,21 @@ from typing import (
 from uuid import UUID
 
 from django.conf import settings
+from django.db.models import Prefetch
 
 from ..core.pricing.interface import LineInfo
 from ..discount import VoucherType
 from ..discount.interface import fetch_variant_rules_info, fetch_voucher_info
+from ..discount.models import (
+    CheckoutLineDiscount,
+    PromotionRuleTranslation,
+    PromotionTranslation,
+)
+from ..product.models import (
+    ProductChannelListing,
+    ProductVariantChannelListing,
+    VariantChannelListingPromotionRule,
+)
 from ..shipping.interface import ShippingMethodData
 from ..shipping.models import ShippingMethod, ShippingMethodChannelListing
 from ..shipping.utils import (
@@ -29,20 +40,9 @@ if TYPE_CHECKING:
     from ..account.models import Address, User
     from ..channel.models import Channel
     from ..checkout.models import CheckoutLine
-    from ..discount.models import (
-        CheckoutDiscount,
-        CheckoutLineDiscount,
-        Voucher,
-        VoucherCode,
-    )
+    from ..discount.models import CheckoutDiscount, Voucher, VoucherCode
     from ..plugins.manager import PluginsManager
-    from ..product.models import (
-        Product,
-        ProductChannelListing,
-        ProductType,
-        ProductVariant,
-        ProductVariantChannelListing,
-    )
+    from ..product.models import Product, ProductType, ProductVariant
     from ..tax.models import TaxClass, TaxConfiguration
     from .models import Checkout
 
@@ -298,16 +298,53 @@ def fetch_checkout_lines(
     from ..discount.utils.voucher import apply_voucher_to_line
     from .utils import get_voucher_for_checkout
 
-    select_related_fields = ["variant__product__product_type__tax_class"]
+    channel_id = checkout.channel_id
+    language_code = checkout.language_code
+    select_related_fields = [
+        "variant__product__product_type__tax_class",
+        "variant__product__tax_class",
+    ]
+    # only the listings of the checkout channel and the translations in the checkout
+    # language are used, and the single-valued relations are joined to the prefetch
+    # queries, instead of being fetched with separate ones
     prefetch_related_fields = [
         "variant__product__collections",
-        "variant__product__channel_listings__channel",
+        Prefetch(
+            "variant__product__channel_listings",
+            queryset=ProductChannelListing.objects.filter(
+                channel_id=channel_id
+            ).select_related("channel"),
+        ),
         "variant__product__product_type__tax_class__country_rates",
         "variant__product__tax_class__country_rates",
-        "variant__channel_listings__channel",
-        "variant__channel_listings__variantlistingpromotionrule__promotion_rule__promotion__translations",
-        "variant__channel_listings__variantlistingpromotionrule__promotion_rule__translations",
-        "discounts__promotion_rule__promotion",
+        Prefetch(
+            "variant__channel_listings",
+            queryset=ProductVariantChannelListing.objects.filter(
+                channel_id=channel_id
+            ).select_related("channel"),
+        ),
+        Prefetch(
+            "variant__channel_listings__variantlistingpromotionrule",
+            queryset=VariantChannelListingPromotionRule.objects.select_related(
+                "promotion_rule__promotion"
+            ),
+        ),
+        Prefetch(
+            "variant__channel_listings__variantlistingpromotionrule__promotion_rule__promotion__translations",
+            queryset=PromotionTranslation.objects.filter(language_code=language_code),
+        ),
+        Prefetch(
+            "variant__channel_listings__variantlistingpromotionrule__promotion_rule__translations",
+            queryset=PromotionRuleTranslation.objects.filter(
+                language_code=language_code
+            ),
+        ),
+        Prefetch(
+            "discounts",
+            queryset=CheckoutLineDiscount.objects.select_related(
+                "promotion_rule__promotion"
+            ),
+        ),
     ]
     if prefetch_variant_attributes:
         prefetch_related_fields.extend(
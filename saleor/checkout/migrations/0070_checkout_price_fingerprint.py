@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-19 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checkout", "0069_merge_20240514_1008"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="checkout",
+            name="price_fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.RunSQL(
+            """
+            ALTER TABLE checkout_checkout
+            ALTER COLUMN price_fingerprint
+            SET DEFAULT '';
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -172,6 +172,9 @@ class Checkout(models.Model):
     )
 
     price_expiration = models.DateTimeField(default=timezone.now)
+    # hash of the inputs of the last prices calculation, the prices are recalculated
+    # as soon as it doesn't match the current checkout data
+    price_fingerprint = models.CharField(max_length=64, blank=True, default="")
 
     discount_amount = models.DecimalField(
         max_digits=settings.DEFAULT_MAX_DIGITS,
@@ -1,14 +1,18 @@
 import logging
+import time
 from decimal import Decimal
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Exists, OuterRef, Q, QuerySet, Subquery
 from django.utils import timezone
 
 from ..celeryconf import app
-from ..payment.models import TransactionItem
-from .models import Checkout, CheckoutLine
+from ..discount.models import CheckoutDiscount, CheckoutLineDiscount
+from ..payment.models import Payment, TransactionItem
+from ..warehouse.models import PreorderReservation, Reservation
+from .models import Checkout, CheckoutLine, CheckoutMetadata
 
 task_logger: logging.Logger = get_task_logger(__name__)
 
@@ -32,9 +36,14 @@ def delete_expired_checkouts(
     - All anonymous and users checkouts after 6h of inactivity
       if there are no lines associated, refer to ``settings.EMPTY_CHECKOUTS_TIMEDELTA``.
 
+    The checkouts are deleted from the longest inactive ones, together with their
+    related rows, with a single ``DELETE FROM`` SQL statement per table. The
+    checkouts locked by the other running tasks are skipped, so the task can be run
+    by several workers at once.
+
     :param batch_size: The maximum row count that can be deleted per ``DELETE FROM``
-        SQL statement. Around 13.5 KB of memory will be utilized by the Celery
-        worker per row, thus 2000 will be using around 27 MB.
+        SQL statement. Only the primary keys of the deleted checkouts are loaded
+        by the Celery worker.
     :param batch_count: How many batches can be executed in a single task.
         This limits how long can the task run as there may be lots of checkouts
         to delete.
@@ -81,21 +90,50 @@ def delete_expired_checkouts(
         (empty_checkouts | expired_anonymous_checkouts | expired_user_checkout)
         & ~Q(Exists(with_transactions))
     )
-    qs = qs.only("pk").order_by()[:batch_size]
+    qs = qs.order_by("last_change")
 
     total_deleted: int = 0
+    total_related_deleted: int = 0
     has_more: bool = True
+    start = time.monotonic()
     for batch_number in range(batch_count):
-        deleted_count, _ = Checkout.objects.filter(pk__in=qs.values_list("pk")).delete()
+        # deleting the stock reservations locks the stocks to update their reserved
+        # quantity, so they are deleted in a separate short transaction to not keep
+        # the stocks locked until all the checkout rows are deleted
+        with transaction.atomic():
+            checkout_pks = list(
+                qs.select_for_update(of=("self",), skip_locked=True).values_list(
+                    "pk", flat=True
+                )[:batch_size]
+            )
+            total_related_deleted += _raw_delete_reservations(checkout_pks)
+        with transaction.atomic():
+            # the checkouts which were updated in the meantime are no longer expired
+            expired_checkout_pks = list(
+                qs.filter(pk__in=checkout_pks)
+                .select_for_update(of=("self",), skip_locked=True)
+                .values_list("pk", flat=True)
+            )
+            deleted_count, related_deleted_count = _raw_delete_checkouts(
+                expired_checkout_pks
+            )
         total_deleted += deleted_count
+        total_related_deleted += related_deleted_count
 
         # Stop deleting inactive checkouts if there was no match.
-        if deleted_count < batch_size:
+        if len(checkout_pks) < batch_size:
             has_more = False
             break
 
     if total_deleted:
-        task_logger.debug("Deleted %d checkouts.", total_deleted)
+        duration = time.monotonic() - start
+        task_logger.info(
+            "Deleted %d checkouts and %d related rows in %.2fs (%.0f rows/s).",
+            total_deleted,
+            total_related_deleted,
+            duration,
+            (total_deleted + total_related_deleted) / max(duration, 1e-6),
+        )
 
     if has_more:
         if invocation_count < invocation_limit:
@@ -109,3 +147,49 @@ def delete_expired_checkouts(
         else:
             task_logger.warning("Invocation limit reached, aborting task")
     return total_deleted, has_more
+
+
+def _raw_delete_reservations(checkout_pks: list) -> int:
+    """Delete the stock reservations of the checkouts without the ORM cascade.
+
+    Return the count of deleted reservations.
+    """
+    if not checkout_pks:
+        return 0
+    reservations = Reservation.objects.filter(
+        checkout_line__checkout_id__in=checkout_pks
+    )
+    return reservations._raw_delete(reservations.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+
+
+def _raw_delete_checkouts(checkout_pks: list) -> tuple[int, int]:
+    """Delete the checkouts and their related rows without the ORM cascade.
+
+    Return the count of deleted checkouts and the count of deleted related rows.
+    """
+    if not checkout_pks:
+        return 0, 0
+
+    # the rows referencing the checkout lines are deleted first, then the lines and
+    # the rows referencing the checkouts, the reserved quantity of the stocks is
+    # updated by the database triggers of the reservations; the reservations are
+    # usually deleted already, unless they were created in the meantime
+    related_querysets: list[QuerySet] = [
+        Reservation.objects.filter(checkout_line__checkout_id__in=checkout_pks),
+        PreorderReservation.objects.filter(checkout_line__checkout_id__in=checkout_pks),
+        CheckoutLineDiscount.objects.filter(line__checkout_id__in=checkout_pks),
+        CheckoutLine.objects.filter(checkout_id__in=checkout_pks),
+        CheckoutDiscount.objects.filter(checkout_id__in=checkout_pks),
+        CheckoutMetadata.objects.filter(checkout_id__in=checkout_pks),
+        Checkout.gift_cards.through.objects.filter(checkout_id__in=checkout_pks),
+    ]
+    related_deleted_count = 0
+    for related_qs in related_querysets:
+        related_deleted_count += related_qs._raw_delete(related_qs.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+
+    Payment.objects.filter(checkout_id__in=checkout_pks).update(checkout=None)
+    TransactionItem.objects.filter(checkout_id__in=checkout_pks).update(checkout=None)
+
+    checkouts = Checkout.objects.filter(pk__in=checkout_pks)
+    deleted_count = checkouts._raw_delete(checkouts.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+    return deleted_count, related_deleted_count
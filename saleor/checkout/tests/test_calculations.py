@@ -3,7 +3,9 @@ from typing import Literal, Union
 from unittest.mock import Mock, patch
 
 import pytest
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 from graphene import Node
@@ -26,6 +28,7 @@ from ..calculations import (
     _calculate_and_add_tax,
     _set_checkout_base_prices,
     fetch_checkout_data,
+    get_checkout_price_fingerprint,
 )
 from ..fetch import CheckoutLineInfo, fetch_checkout_info, fetch_checkout_lines
 
@@ -752,3 +755,119 @@ def test_calculate_and_add_tax_empty_tax_data_logging_address(
         f"Fetching tax data for checkout with address validation skipped. "
         f"Address ID: {address.pk}" in caplog.text
     )
+
+
+def _fetch_checkout_data_for_checkout(checkout, manager):
+    lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
+    return fetch_checkout_data(checkout_info, manager, lines)
+
+
+def test_fetch_checkout_data_saves_price_fingerprint(
+    checkout_with_items, plugins_manager
+):
+    # given
+    checkout = checkout_with_items
+
+    # when
+    checkout_info, lines = _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+
+    # then
+    checkout.refresh_from_db()
+    assert checkout.price_fingerprint
+    assert checkout.price_fingerprint == get_checkout_price_fingerprint(
+        checkout_info, lines
+    )
+
+
+def test_fetch_checkout_data_fingerprint_not_changed(
+    checkout_with_items, plugins_manager
+):
+    # given
+    checkout = checkout_with_items
+    _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+    checkout.refresh_from_db()
+    total = checkout.total
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+
+    # then
+    assert checkout.total == total
+    assert not [query for query in queries if query["sql"].startswith("UPDATE")]
+
+
+def test_fetch_checkout_data_fingerprint_changed(checkout_with_items, plugins_manager):
+    # given
+    checkout = checkout_with_items
+    _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+    checkout.refresh_from_db()
+    price_expiration = checkout.price_expiration
+    assert price_expiration > timezone.now()
+    total = checkout.total
+
+    # the quantity is changed without invalidating the prices
+    line = checkout.lines.first()
+    line.quantity += 1
+    line.save(update_fields=["quantity"])
+
+    # when
+    _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+
+    # then
+    checkout.refresh_from_db()
+    assert checkout.price_expiration > price_expiration
+    assert checkout.total > total
+
+
+def test_fetch_checkout_data_saves_only_changed_lines(
+    checkout_with_items, plugins_manager
+):
+    # given
+    checkout = checkout_with_items
+    _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+    checkout.refresh_from_db()
+    checkout.price_expiration = timezone.now()
+    checkout.save(update_fields=["price_expiration"])
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+
+    # then
+    checkout.refresh_from_db()
+    assert checkout.price_expiration > timezone.now()
+    assert not [
+        query
+        for query in queries
+        if query["sql"].startswith('UPDATE "checkout_checkoutline"')
+    ]
+
+
+def test_fetch_checkout_data_expired_unchanged_prices_saves_only_expiration(
+    checkout_with_items, plugins_manager
+):
+    # given
+    checkout = checkout_with_items
+    _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+    checkout.refresh_from_db()
+    checkout.price_expiration = timezone.now()
+    checkout.save(update_fields=["price_expiration"])
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        _fetch_checkout_data_for_checkout(checkout, plugins_manager)
+
+    # then
+    checkout_updates = [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('UPDATE "checkout_checkout"')
+    ]
+    assert len(checkout_updates) == 1
+    updated_fields = checkout_updates[0].split(" WHERE ")[0]
+    assert updated_fields.count(" = ") == 1
+    assert '"price_expiration" = ' in updated_fields
+    checkout.refresh_from_db()
+    assert checkout.price_expiration > timezone.now()
@@ -23,6 +23,8 @@ from ...discount.interface import VariantPromotionRuleInfo
 from ...discount.models import (
     CheckoutLineDiscount,
     NotApplicable,
+    PromotionRuleTranslation,
+    PromotionTranslation,
     Voucher,
     VoucherChannelListing,
     VoucherCode,
@@ -2360,3 +2362,48 @@ def test_get_checkout_metadata(checkout):
 
     # then
     assert metadata_container
+
+
+def test_fetch_checkout_lines_uses_checkout_channel_and_language(
+    checkout_with_item_on_promotion, channel_PLN
+):
+    # given
+    checkout = checkout_with_item_on_promotion
+    checkout.language_code = "pl"
+    checkout.save(update_fields=["language_code"])
+
+    line = checkout.lines.get()
+    variant = line.variant
+    variant_listing = variant.channel_listings.get(channel=checkout.channel)
+    variant.channel_listings.create(
+        channel=channel_PLN, price_amount=Decimal("50"), currency="PLN"
+    )
+    variant.product.channel_listings.create(channel=channel_PLN, is_published=True)
+
+    rule = line.discounts.get().promotion_rule
+    promotion = rule.promotion
+    PromotionTranslation.objects.create(
+        promotion=promotion, language_code="de", name="DE promotion"
+    )
+    promotion_translation = PromotionTranslation.objects.create(
+        promotion=promotion, language_code="pl", name="PL promotion"
+    )
+    PromotionRuleTranslation.objects.create(
+        promotion_rule=rule, language_code="de", name="DE rule"
+    )
+    rule_translation = PromotionRuleTranslation.objects.create(
+        promotion_rule=rule, language_code="pl", name="PL rule"
+    )
+
+    # when
+    lines, _ = fetch_checkout_lines(checkout)
+
+    # then
+    line_info = lines[0]
+    assert line_info.channel_listing == variant_listing
+    assert line_info.product.channel_listings.all()[0].channel == checkout.channel
+    assert len(line_info.variant.channel_listings.all()) == 1
+    rule_info = line_info.rules_info[0]
+    assert rule_info.promotion_translation == promotion_translation
+    assert rule_info.rule_translation == rule_translation
+    assert len(line_info.discounts) == 1
@@ -2341,6 +2341,14 @@ def test_complete_checkout_ensure_prices_are_not_recalculated_in_post_payment_pa
         transaction_id="1234",
         error=None,
     )
+    checkout.user = customer_user
+    checkout.billing_address = customer_user.default_billing_address
+    checkout.shipping_address = customer_user.default_billing_address
+    checkout.shipping_method = shipping_method
+    checkout.tracking_code = ""
+    checkout.redirect_url = "https://www.example.com"
+    checkout.save()
+
     manager = get_plugins_manager(allow_replica=False)
     lines, _ = fetch_checkout_lines(checkout)
     checkout_info = fetch_checkout_info(checkout, lines, manager)
@@ -2357,14 +2365,8 @@ def test_complete_checkout_ensure_prices_are_not_recalculated_in_post_payment_pa
     payment.checkout = checkout
     payment.save()
 
-    checkout.user = customer_user
-    checkout.billing_address = customer_user.default_billing_address
-    checkout.shipping_address = customer_user.default_billing_address
-    checkout.shipping_method = shipping_method
-    checkout.tracking_code = ""
-    checkout.redirect_url = "https://www.example.com"
     checkout.price_expiration = timezone.now() + timedelta(hours=2)
-    checkout.save()
+    checkout.save(update_fields=["price_expiration"])
 
     lines, _ = fetch_checkout_lines(checkout)
     checkout_info = fetch_checkout_info(checkout, lines, manager)
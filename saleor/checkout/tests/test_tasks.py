@@ -4,9 +4,13 @@ from unittest import mock
 from uuid import UUID
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from ..models import Checkout
+from ...discount.models import CheckoutLineDiscount
+from ...warehouse.models import Reservation
+from ..models import Checkout, CheckoutLine, CheckoutMetadata
 from ..tasks import delete_expired_checkouts
 
 
@@ -454,3 +458,112 @@ def test_aborts_deleting_checkouts_when_invocation_count_exhausted(
 
     # Should have stopped there
     mocked_task.assert_not_called()
+
+
+def test_delete_expired_checkouts_deletes_related_rows(
+    checkout_with_item_on_promotion, gift_card, payment_dummy
+):
+    # given
+    checkout = checkout_with_item_on_promotion
+    checkout.gift_cards.add(gift_card)
+
+    line = checkout.lines.get()
+    stock = line.variant.stocks.first()
+    Reservation.objects.create(
+        checkout_line=line,
+        stock=stock,
+        quantity_reserved=line.quantity,
+        reserved_until=timezone.now() + timedelta(minutes=5),
+    )
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == line.quantity
+
+    payment_dummy.checkout = checkout
+    payment_dummy.save(update_fields=["checkout"])
+    transaction_item = checkout.payment_transactions.create()
+    Checkout.objects.filter(pk=checkout.pk).update(
+        email=None, user=None, last_change=timezone.now() - timedelta(days=35)
+    )
+
+    # when
+    deleted_count, has_more = delete_expired_checkouts()
+
+    # then
+    assert deleted_count == 1
+    assert has_more is False
+    assert not Checkout.objects.filter(pk=checkout.pk).exists()
+    assert not CheckoutLine.objects.filter(pk=line.pk).exists()
+    assert not CheckoutLineDiscount.objects.filter(line_id=line.pk).exists()
+    assert not CheckoutMetadata.objects.filter(checkout_id=checkout.pk).exists()
+    assert not Reservation.objects.filter(checkout_line_id=line.pk).exists()
+    assert not Checkout.gift_cards.through.objects.filter(
+        checkout_id=checkout.pk
+    ).exists()
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 0
+    payment_dummy.refresh_from_db()
+    assert payment_dummy.checkout is None
+    transaction_item.refresh_from_db()
+    assert transaction_item.checkout is None
+
+
+def test_delete_expired_checkouts_skips_locked_checkouts(channel_USD):
+    # given
+    Checkout.objects.create(
+        currency=channel_USD.currency_code,
+        channel=channel_USD,
+    )
+    Checkout.objects.update(last_change=timezone.now() - timedelta(hours=7))
+
+    # when
+    with CaptureQueriesContext(connection) as ctx:
+        deleted_count, has_more = delete_expired_checkouts()
+
+    # then
+    assert deleted_count == 1
+    assert has_more is False
+    select_query = next(
+        query["sql"] for query in ctx.captured_queries if "SELECT" in query["sql"]
+    )
+    assert "ORDER BY" in select_query
+    assert 'FOR UPDATE OF "checkout_checkout" SKIP LOCKED' in select_query
+
+
+def test_delete_expired_checkouts_deletes_reservations_in_separate_transaction(
+    checkout_with_item,
+):
+    # given
+    checkout = checkout_with_item
+    line = checkout.lines.get()
+    Reservation.objects.create(
+        checkout_line=line,
+        stock=line.variant.stocks.first(),
+        quantity_reserved=line.quantity,
+        reserved_until=timezone.now() + timedelta(minutes=5),
+    )
+    Checkout.objects.filter(pk=checkout.pk).update(
+        email=None, user=None, last_change=timezone.now() - timedelta(days=35)
+    )
+
+    # when
+    with CaptureQueriesContext(connection) as ctx:
+        deleted_count, _ = delete_expired_checkouts()
+
+    # then
+    assert deleted_count == 1
+    queries = [query["sql"] for query in ctx.captured_queries]
+    reservations_delete_index = next(
+        index
+        for index, sql in enumerate(queries)
+        if sql.startswith('DELETE FROM "warehouse_reservation"')
+    )
+    lines_delete_index = next(
+        index
+        for index, sql in enumerate(queries)
+        if sql.startswith('DELETE FROM "checkout_checkoutline"')
+    )
+    assert any(
+        sql.startswith("RELEASE SAVEPOINT")
+        for sql in queries[reservations_delete_index:lines_delete_index]
+    )
+    assert not Reservation.objects.exists()
@@ -1,6 +1,14 @@
+import time
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 
-from ...tasks import delete_event_payloads_task
+from ...utils.event_retention import (
+    EventDataDeletionStats,
+    delete_event_data_bucket,
+    iterate_event_data_buckets,
+)
 
 
 class Command(BaseCommand):
@@ -10,5 +18,35 @@ class Command(BaseCommand):
         "in EVENT_PAYLOAD_DELETE_PERIOD environment variable."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--time-limit",
+            type=float,
+            help=(
+                "Number of seconds after which no more data is deleted. The bucket "
+                "being deleted when the limit is reached is completed."
+            ),
+        )
+
     def handle(self, **options):
-        delete_event_payloads_task()
+        time_limit = options.get("time_limit")
+        verbosity = options["verbosity"]
+        deadline = time.monotonic() + time_limit if time_limit else None
+        delete_before = timezone.now() - settings.EVENT_PAYLOAD_DELETE_PERIOD
+        total = EventDataDeletionStats()
+        for start, end in iterate_event_data_buckets(delete_before):
+            if deadline and time.monotonic() >= deadline:
+                self.stdout.write("Time limit reached, aborting.")
+                break
+            stats = delete_event_data_bucket(start, end)
+            total.add(stats)
+            if verbosity > 1:
+                self.stdout.write(
+                    f"Deleted data created from {start} to {end}: {stats.rows} rows "
+                    f"in {stats.duration:.2f}s ({stats.rows_per_second:.0f} rows/s)."
+                )
+        self.stdout.write(
+            f"Deleted {total.deliveries} deliveries, {total.attempts} attempts and "
+            f"{total.payloads} payloads in {total.buckets} buckets, "
+            f"{total.duration:.2f}s ({total.rows_per_second:.0f} rows/s)."
+        )
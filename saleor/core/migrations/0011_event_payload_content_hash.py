@@ -0,0 +1,81 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0010_drop_vatlayer_tables"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventpayload",
+            name="payload_compressed",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="eventpayload",
+            name="payload_file",
+            field=models.FileField(null=True, upload_to="event_payloads"),
+        ),
+        migrations.AlterField(
+            model_name="eventpayload",
+            name="payload",
+            field=models.TextField(blank=True, db_column="payload", default=""),
+        ),
+        migrations.RenameField(
+            model_name="eventpayload",
+            old_name="payload",
+            new_name="payload_text",
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AddField(
+                    model_name="eventpayload",
+                    name="hash",
+                    field=models.CharField(blank=True, max_length=64, null=True),
+                ),
+                migrations.RunSQL(
+                    sql="""
+                    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS
+                    core_eventpayload_hash_key
+                    ON core_eventpayload ("hash");
+                    """,
+                    reverse_sql="""
+                    DROP INDEX CONCURRENTLY IF EXISTS core_eventpayload_hash_key;
+                    """,
+                ),
+                migrations.RunSQL(
+                    sql="""
+                        DO
+                        $do$
+                        BEGIN
+                        IF NOT EXISTS (
+                            SELECT 1 FROM pg_catalog.pg_constraint
+                            WHERE conname LIKE 'core_eventpayload_hash_key'
+                        ) THEN
+                            ALTER TABLE core_eventpayload
+                            ADD CONSTRAINT core_eventpayload_hash_key
+                            UNIQUE USING INDEX core_eventpayload_hash_key;
+                        END IF;
+                        END
+                        $do$
+                    """,
+                    reverse_sql="""
+                    ALTER TABLE core_eventpayload
+                    DROP CONSTRAINT IF EXISTS core_eventpayload_hash_key;
+                    """,
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name="eventpayload",
+                    name="hash",
+                    field=models.CharField(
+                        blank=True, max_length=64, null=True, unique=True
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0011_event_payload_content_hash"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="eventpayload",
+            index=models.Index(
+                fields=["created_at"], name="core_eventpayload_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="eventdelivery",
+            index=models.Index(
+                fields=["created_at"], name="core_eventdelivery_created_idx"
+            ),
+        ),
+    ]
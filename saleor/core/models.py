@@ -1,10 +1,16 @@
 import datetime
+import hashlib
+import zlib
 from typing import Any, TypeVar
 
 import pytz
+from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
-from django.db import models, transaction
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, models, transaction
 from django.db.models import F, JSONField, Max, Q
+from django.utils import timezone
 
 from . import EventDeliveryStatus, JobStatus
 from .utils.json_serializer import CustomJsonEncoder
@@ -143,10 +149,188 @@ class Job(models.Model):
         abstract = True
 
 
+EVENT_PAYLOAD_COMPRESSION_LEVEL = 6
+EVENT_PAYLOAD_FILES_DIR = "event_payloads"
+
+
+class EventPayloadQueryset(models.QuerySet["EventPayload"]):
+    def create_with_payload(self, payload: str) -> "EventPayload":
+        return self.bulk_create_with_payloads([payload])[0]
+
+    def bulk_create_with_payloads(self, payloads: list[str]) -> list["EventPayload"]:
+        """Store compressed payloads, identical payloads are stored once.
+
+        Payloads are identified by the hash of their content. When a payload is
+        already stored, the existing row is returned and its `created_at` is bumped,
+        so the payload is not removed as outdated. Payloads that are larger than
+        `EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE` bytes after compression are moved to
+        the default storage once the transaction is committed, so no files are left
+        behind when it is rolled back.
+
+        The deliveries using the payloads should be created in the same transaction,
+        as the lock on the reused rows prevents removing them in the meantime.
+        """
+        if not payloads:
+            return []
+        data_by_hash: dict[str, bytes] = {}
+        payload_hashes = []
+        for payload in payloads:
+            # non-string payloads are converted the same way as by the text field
+            data = str(payload).encode("utf-8")
+            payload_hash = hashlib.sha256(data).hexdigest()
+            data_by_hash.setdefault(payload_hash, data)
+            payload_hashes.append(payload_hash)
+
+        compressed_by_hash = {
+            payload_hash: zlib.compress(data, EVENT_PAYLOAD_COMPRESSION_LEVEL)
+            for payload_hash, data in data_by_hash.items()
+        }
+        rows = self._upsert_payloads(compressed_by_hash)
+
+        offload_size = settings.EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE
+        payloads_by_hash = {}
+        payloads_to_offload = []
+        for payload_id, payload_hash, created_at, inserted in rows:
+            compressed = compressed_by_hash[payload_hash]
+            instance = self.model(
+                id=payload_id,
+                hash=payload_hash,
+                payload_compressed=compressed,
+                created_at=created_at,
+            )
+            instance._state.adding = False
+            instance._state.db = self.db
+            payloads_by_hash[payload_hash] = instance
+            if offload_size and inserted and len(compressed) >= offload_size:
+                payloads_to_offload.append(instance)
+
+        if payloads_to_offload:
+            transaction.on_commit(
+                lambda: self._offload_payloads(payloads_to_offload), using=self.db
+            )
+        return [payloads_by_hash[payload_hash] for payload_hash in payload_hashes]
+
+    def _upsert_payloads(self, compressed_by_hash: dict[str, bytes]) -> list[tuple]:
+        connection = connections[self.db]
+        opts = self.model._meta
+        compressed_field = opts.get_field("payload_compressed")
+        now = timezone.now()
+        params: list[Any] = []
+        # rows are locked in the order of hashes to avoid deadlocks between
+        # concurrent upserts of the same payloads
+        for payload_hash, compressed in sorted(compressed_by_hash.items()):
+            params.extend(
+                [
+                    payload_hash,
+                    "",
+                    compressed_field.get_db_prep_value(compressed, connection),
+                    now,
+                ]
+            )
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(compressed_by_hash))
+        # `xmax` is 0 for the inserted rows
+        sql = (
+            f"INSERT INTO {opts.db_table} "
+            '("hash", "payload", "payload_compressed", "created_at") '
+            f"VALUES {values} "
+            'ON CONFLICT ("hash") DO UPDATE SET "created_at" = EXCLUDED."created_at" '
+            'RETURNING "id", "hash", "created_at", (xmax = 0)'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _offload_payloads(self, payloads: list["EventPayload"]):
+        """Move the compressed payloads from the database to the default storage."""
+        for payload in payloads:
+            path = default_storage.save(
+                f"{EVENT_PAYLOAD_FILES_DIR}/{payload.hash}",
+                ContentFile(payload.payload_compressed),
+            )
+            updated = (
+                self.model.objects.using(self.db)
+                .filter(pk=payload.pk, payload_file__isnull=True)
+                .update(payload_file=path, payload_compressed=None)
+            )
+            if not updated:
+                # the payload was removed in the meantime
+                default_storage.delete(path)
+                continue
+            payload.payload_file = path
+            payload.payload_compressed = None
+
+    def delete_unused(self):
+        """Delete the payloads that are not used by any delivery.
+
+        Payloads are shared between deliveries, so the rows are locked first. This way
+        a delivery created in a concurrent transaction that reuses the payload is
+        taken into account.
+        """
+        with transaction.atomic(using=self.db):
+            locked_ids = list(
+                self.select_for_update().order_by("pk").values_list("pk", flat=True)
+            )
+            return (
+                self.model.objects.using(self.db)
+                .filter(pk__in=locked_ids, deliveries__isnull=True)
+                .delete()
+            )
+
+    def delete(self):
+        paths = list(
+            self.exclude(payload_file__isnull=True)
+            .exclude(payload_file="")
+            .values_list("payload_file", flat=True)
+        )
+        result = super().delete()
+        if paths:
+            delete_payload_files(paths, using=self.db)
+        return result
+
+
+def delete_payload_files(paths: list[str], using: str):
+    from .tasks import delete_files_from_storage_task
+
+    transaction.on_commit(
+        lambda: delete_files_from_storage_task.delay(paths), using=using
+    )
+
+
+EventPayloadManager = models.Manager.from_queryset(EventPayloadQueryset)
+
+
 class EventPayload(models.Model):
-    payload = models.TextField()
+    # Payloads stored with `create_with_payload` are compressed and kept in
+    # `payload_compressed` or in `payload_file`, other payloads are kept as text.
+    payload_text = models.TextField(blank=True, default="", db_column="payload")
+    hash = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    payload_compressed = models.BinaryField(null=True, blank=True)
+    payload_file = models.FileField(upload_to=EVENT_PAYLOAD_FILES_DIR, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = EventPayloadManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="core_eventpayload_created_idx"),
+        ]
+
+    @property
+    def payload(self) -> str:
+        if self.payload_file:
+            with self.payload_file.open("rb") as payload_file:
+                return zlib.decompress(payload_file.read()).decode("utf-8")
+        if self.payload_compressed is not None:
+            return zlib.decompress(self.payload_compressed).decode("utf-8")
+        return self.payload_text
+
+    @payload.setter
+    def payload(self, value: str):
+        self.payload_text = value
+        self.hash = None
+        self.payload_compressed = None
+        self.payload_file = None
+
 
 class EventDelivery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -163,6 +347,9 @@ class EventDelivery(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["created_at"], name="core_eventdelivery_created_idx"),
+        ]
 
 
 class EventDeliveryAttempt(models.Model):
@@ -1,3 +1,4 @@
+import json
 import logging
 from typing import Optional, Union
 
@@ -7,11 +8,27 @@ from django.contrib.postgres.search import (
     SearchVector,
     SearchVectorCombinable,
 )
-from django.db.models import Expression
+from django.db import connections
+from django.db.models import Expression, QuerySet
 
 logger = logging.getLogger(__name__)
 
 
+def estimate_count(queryset: QuerySet) -> int:
+    """Return the number of rows of the queryset estimated by the query planner.
+
+    The query is not executed, so the estimate is only as accurate as the table
+    statistics gathered by `ANALYZE`.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 class NoValidationSearchVectorCombinable(SearchVectorCombinable):
     def _combine(self, other, connector, reversed):
         if not isinstance(other, NoValidationSearchVectorCombinable):
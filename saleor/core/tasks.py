@@ -3,19 +3,16 @@ import logging
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from ..celeryconf import app
-from .models import EventDelivery, EventPayload
+from .utils.event_retention import (
+    delete_event_data_bucket,
+    iterate_event_data_buckets,
+)
 
 task_logger: logging.Logger = get_task_logger(__name__)
 
-# Batch size was tested on db with 1mln payloads and deliveries, each delivery
-# had multiple attempts. One task took less than 0,5 second, memory usage didn't raise
-# more than 100 MB.
-BATCH_SIZE = 1000
-
 
 @app.task
 def delete_from_storage_task(path):
@@ -23,22 +20,26 @@ def delete_from_storage_task(path):
 
 
 @app.task
-def delete_event_payloads_task(expiration_date=None):
+def delete_event_payloads_task(expiration_date=None, start=None):
     expiration_date = (
         expiration_date
         or timezone.now() + settings.EVENT_PAYLOAD_DELETE_TASK_TIME_LIMIT
     )
     delete_period = timezone.now() - settings.EVENT_PAYLOAD_DELETE_PERIOD
-    valid_deliveries = EventDelivery.objects.filter(created_at__gt=delete_period)
-    payloads_to_delete = EventPayload.objects.filter(
-        ~Exists(valid_deliveries.filter(payload_id=OuterRef("id")))
-    ).order_by("-pk")
-    ids = payloads_to_delete.values_list("pk", flat=True)[:BATCH_SIZE]
-    qs = EventPayload.objects.filter(pk__in=ids)
-    if ids:
+    bucket = next(iterate_event_data_buckets(delete_period, start), None)
+    if bucket:
         if expiration_date > timezone.now():
-            qs.delete()
-            delete_event_payloads_task.delay(expiration_date)
+            stats = delete_event_data_bucket(*bucket)
+            task_logger.info(
+                "Deleted %s event deliveries, %s attempts and %s payloads "
+                "created before %s in %.2fs.",
+                stats.deliveries,
+                stats.attempts,
+                stats.payloads,
+                bucket[1],
+                stats.duration,
+            )
+            delete_event_payloads_task.delay(expiration_date, bucket[1])
         else:
             task_logger.error("Task invocation time limit reached, aborting task")
 
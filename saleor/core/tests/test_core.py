@@ -1,3 +1,5 @@
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import Mock, patch
 from urllib.parse import urljoin
 
@@ -6,6 +8,7 @@ from django.core.management import CommandError, call_command
 from django.db.utils import DataError
 from django.templatetags.static import static
 from django.test import RequestFactory, override_settings
+from django.utils import timezone
 
 from ...account.models import Address, User
 from ...account.utils import create_superuser
@@ -24,6 +27,7 @@ from ...payment.models import TransactionItem
 from ...product import ProductTypeKind
 from ...product.models import ProductType
 from ...shipping.models import ShippingZone
+from ..models import EventDelivery, EventPayload
 from ..storages import S3MediaStorage
 from ..utils import (
     build_absolute_uri,
@@ -462,3 +466,35 @@ def test_prepare_unique_attribute_value_slug_non_existing_slug(color_attribute):
     result = prepare_unique_attribute_value_slug(color_attribute, non_existing_slug)
 
     assert result == non_existing_slug
+
+
+def test_delete_event_payloads_command(event_delivery, settings):
+    # given
+    outdated_time = timezone.now() - settings.EVENT_PAYLOAD_DELETE_PERIOD
+    EventPayload.objects.update(created_at=outdated_time - timedelta(hours=1))
+    EventDelivery.objects.update(created_at=outdated_time - timedelta(hours=1))
+    out = StringIO()
+
+    # when
+    call_command("delete_event_payloads", stdout=out)
+
+    # then
+    assert not EventDelivery.objects.exists()
+    assert not EventPayload.objects.exists()
+    assert "Deleted 1 deliveries, 0 attempts and 1 payloads in 1 buckets" in (
+        out.getvalue()
+    )
+
+
+def test_delete_event_payloads_command_time_limit(event_delivery, settings):
+    # given
+    outdated_time = timezone.now() - settings.EVENT_PAYLOAD_DELETE_PERIOD
+    EventDelivery.objects.update(created_at=outdated_time - timedelta(hours=1))
+    out = StringIO()
+
+    # when
+    call_command("delete_event_payloads", time_limit=0.000001, stdout=out)
+
+    # then
+    assert EventDelivery.objects.exists()
+    assert "Time limit reached" in out.getvalue()
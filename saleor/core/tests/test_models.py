@@ -0,0 +1,184 @@
+import hashlib
+import zlib
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ...webhook.event_types import WebhookEventAsyncType
+from ..models import EventDelivery, EventPayload
+
+PAYLOAD = '{"key": "value"}'
+OTHER_PAYLOAD = '{"key": "other value"}'
+
+
+def test_create_with_payload_stores_compressed_payload():
+    # when
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    event_payload = EventPayload.objects.get(pk=event_payload.pk)
+    assert event_payload.payload == PAYLOAD
+    assert event_payload.payload_text == ""
+    assert zlib.decompress(event_payload.payload_compressed) == PAYLOAD.encode()
+    assert not event_payload.payload_file
+
+
+def test_bulk_create_with_payloads_stores_identical_payloads_once():
+    # when
+    event_payloads = EventPayload.objects.bulk_create_with_payloads(
+        [PAYLOAD, OTHER_PAYLOAD, PAYLOAD]
+    )
+
+    # then
+    assert EventPayload.objects.count() == 2
+    assert [event_payload.payload for event_payload in event_payloads] == [
+        PAYLOAD,
+        OTHER_PAYLOAD,
+        PAYLOAD,
+    ]
+    assert event_payloads[0].pk == event_payloads[2].pk
+    assert event_payloads[0].pk != event_payloads[1].pk
+
+
+def test_create_with_payload_reuses_stored_payload():
+    # given
+    with freeze_time(timezone.now() - timedelta(days=1)):
+        event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # when
+    reused_event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    assert reused_event_payload.pk == event_payload.pk
+    assert EventPayload.objects.count() == 1
+    event_payload.refresh_from_db()
+    assert event_payload.created_at == reused_event_payload.created_at
+    assert event_payload.created_at > timezone.now() - timedelta(hours=1)
+
+
+@override_settings(EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE=1)
+def test_create_with_payload_offloads_large_payload(
+    media_root, django_capture_on_commit_callbacks
+):
+    # given
+    with django_capture_on_commit_callbacks(execute=True):
+        event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+    path = event_payload.payload_file.name
+    assert default_storage.exists(path)
+
+    # when
+    event_payload = EventPayload.objects.get(pk=event_payload.pk)
+
+    # then
+    assert event_payload.payload == PAYLOAD
+    assert event_payload.payload_compressed is None
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        EventPayload.objects.filter(pk=event_payload.pk).delete()
+
+    # then
+    assert not default_storage.exists(path)
+
+
+@override_settings(EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE=1)
+def test_create_with_payload_offloads_payload_after_commit(
+    media_root, django_capture_on_commit_callbacks
+):
+    # when
+    with django_capture_on_commit_callbacks() as callbacks:
+        event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    assert not default_storage.exists("event_payloads")
+    event_payload = EventPayload.objects.get(pk=event_payload.pk)
+    assert event_payload.payload == PAYLOAD
+    assert not event_payload.payload_file
+    assert len(callbacks) == 1
+
+
+@override_settings(EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE=1)
+def test_create_with_payload_does_not_offload_reused_payload(
+    media_root, django_capture_on_commit_callbacks
+):
+    # given
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # when
+    with django_capture_on_commit_callbacks() as callbacks:
+        reused_event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    assert reused_event_payload.pk == event_payload.pk
+    assert callbacks == []
+
+
+@override_settings(EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE=1)
+def test_create_with_payload_removes_offloaded_payload_of_deleted_row(
+    media_root, django_capture_on_commit_callbacks
+):
+    # given
+    with django_capture_on_commit_callbacks() as callbacks:
+        event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+    EventPayload.objects.filter(pk=event_payload.pk).delete()
+
+    # when
+    callbacks[0]()
+
+    # then
+    _, files = default_storage.listdir("event_payloads")
+    assert files == []
+    assert not event_payload.payload_file
+
+
+def test_bulk_create_with_payloads_upserts_rows_in_hash_order():
+    # given
+    payloads = [OTHER_PAYLOAD, PAYLOAD]
+    hashes = [hashlib.sha256(payload.encode()).hexdigest() for payload in payloads]
+
+    # when
+    with CaptureQueriesContext(connection) as ctx:
+        EventPayload.objects.bulk_create_with_payloads(payloads)
+
+    # then
+    sql = ctx.captured_queries[-1]["sql"]
+    first, second = sorted(hashes)
+    assert sql.index(first) < sql.index(second)
+
+
+def test_payload_stored_as_text():
+    # given
+    event_payload = EventPayload.objects.create(payload=PAYLOAD)
+
+    # when
+    event_payload = EventPayload.objects.get(pk=event_payload.pk)
+
+    # then
+    assert event_payload.payload == PAYLOAD
+    assert event_payload.hash is None
+    assert event_payload.payload_compressed is None
+
+
+def test_delete_unused(webhook):
+    # given
+    used_payload, unused_payload = EventPayload.objects.bulk_create_with_payloads(
+        [PAYLOAD, OTHER_PAYLOAD]
+    )
+    EventDelivery.objects.create(
+        event_type=WebhookEventAsyncType.ORDER_CREATED,
+        payload=used_payload,
+        webhook=webhook,
+    )
+
+    # when
+    EventPayload.objects.filter(
+        pk__in=[used_payload.pk, unused_payload.pk]
+    ).delete_unused()
+
+    # then
+    assert list(EventPayload.objects.values_list("pk", flat=True)) == [used_payload.pk]
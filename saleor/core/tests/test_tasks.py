@@ -86,3 +86,24 @@ def test_delete_files_from_storage_task_files_not_existing_files(media_root):
 
     # when
     delete_files_from_storage_task([path, path_2])
+
+
+def test_delete_event_payloads_task_payload_in_use(webhook, settings):
+    # given
+    start_time = timezone.now()
+    outdated_time = start_time - settings.EVENT_PAYLOAD_DELETE_PERIOD
+    with freeze_time(outdated_time - timedelta(days=1)):
+        payload = EventPayload.objects.create(payload='{"key": "data"}')
+    delivery = EventDelivery.objects.create(
+        event_type=WebhookEventAsyncType.ANY,
+        payload=payload,
+        webhook=webhook,
+    )
+
+    # when
+    with freeze_time(start_time):
+        delete_event_payloads_task()
+
+    # then
+    assert EventPayload.objects.get() == payload
+    assert EventDelivery.objects.get() == delivery
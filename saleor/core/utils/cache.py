@@ -1,20 +1,122 @@
-import collections
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator, MutableMapping
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
+_MISSING = object()
 
-class CacheDict(collections.OrderedDict):
-    def __init__(self, capacity: int):
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheDict(MutableMapping):
+    """Thread-safe in-process LRU cache.
+
+    The least recently used entries are evicted when the cache holds more than
+    `capacity` entries or, if `max_size` is set, when the total size of the values
+    computed with `get_size` exceeds `max_size` bytes. Entries older than `ttl`
+    seconds are treated as missing; the TTL can be overridden per entry with `set`.
+
+    Lookups are counted in `stats`, membership tests are not.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        *,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        get_size: Callable[[Any], int] = sys.getsizeof,
+    ):
         self.capacity = capacity
-        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.get_size = get_size
+        self.size = 0
+        self.stats = CacheStats()
+        # key -> (value, expires_at, size)
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _get_entry(self, key):
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return _MISSING
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            return _MISSING
+        return entry
+
+    def _remove(self, key):
+        _value, _expires_at, size = self._data.pop(key)
+        self.size -= size
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+            self.stats.hits += 1
+            self._data.move_to_end(key)
+            return entry[0]
 
     def __getitem__(self, key):
-        value = super().__getitem__(key)
-        super().move_to_end(key)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
         return value
 
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self.get_size(value) if self.max_size is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self.size += size
+            while self._data and (
+                len(self._data) > self.capacity
+                or (self.max_size is not None and self.size > self.max_size)
+            ):
+                self._remove(next(iter(self._data)))
+                self.stats.evictions += 1
+
     def __setitem__(self, key, value):
-        super().__setitem__(key, value)
-        super().move_to_end(key)
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._get_entry(key) is not _MISSING
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
 
-        while len(self) > self.capacity:
-            surplus = next(iter(self))
-            super().__delitem__(surplus)
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
@@ -0,0 +1,115 @@
+"""Removal of outdated event deliveries, delivery attempts and event payloads.
+
+The data is removed in time buckets of `EVENT_PAYLOAD_DELETE_BUCKET_PERIOD`, starting
+from the oldest one. A bucket contains the rows created within its period, found with
+the indexes on `created_at`, and it is removed with plain `DELETE` statements in a
+single transaction. This way the removal doesn't scan the whole tables, doesn't load
+the rows into memory and the dead tuples are grouped in the oldest pages of tables.
+"""
+
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from ..models import (
+    EventDelivery,
+    EventDeliveryAttempt,
+    EventPayload,
+    delete_payload_files,
+)
+
+
+@dataclass
+class EventDataDeletionStats:
+    buckets: int = 0
+    attempts: int = 0
+    deliveries: int = 0
+    payloads: int = 0
+    duration: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.attempts + self.deliveries + self.payloads
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration if self.duration else 0.0
+
+    def add(self, stats: "EventDataDeletionStats"):
+        self.buckets += stats.buckets
+        self.attempts += stats.attempts
+        self.deliveries += stats.deliveries
+        self.payloads += stats.payloads
+        self.duration += stats.duration
+
+
+def get_next_bucket_start(
+    delete_before: datetime, after: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Return the creation time of the oldest event data to delete.
+
+    Only the data created at or after `after` is taken into account, so the buckets
+    containing the payloads that are still in use are not processed again.
+    """
+    querysets = [
+        EventDelivery.objects.filter(created_at__lt=delete_before),
+        EventPayload.objects.filter(created_at__lt=delete_before),
+    ]
+    dates = []
+    for qs in querysets:
+        if after:
+            qs = qs.filter(created_at__gte=after)
+        created_at = qs.order_by("created_at").values_list("created_at", flat=True)
+        if oldest := created_at.first():
+            dates.append(oldest)
+    return min(dates, default=None)
+
+
+def iterate_event_data_buckets(
+    delete_before: datetime, start: Optional[datetime] = None
+) -> Iterator[tuple[datetime, datetime]]:
+    """Yield the periods of the buckets to delete, skipping the empty ones."""
+    while start := get_next_bucket_start(delete_before, start):
+        end = min(start + settings.EVENT_PAYLOAD_DELETE_BUCKET_PERIOD, delete_before)
+        yield start, end
+        start = end
+
+
+def delete_event_data_bucket(start: datetime, end: datetime) -> EventDataDeletionStats:
+    """Delete the deliveries with their attempts and the unused payloads.
+
+    Payloads reused in the meantime are kept, as their `created_at` is bumped.
+    """
+    started = time.monotonic()
+    deliveries = EventDelivery.objects.filter(created_at__gte=start, created_at__lt=end)
+    attempts = EventDeliveryAttempt.objects.filter(
+        Exists(deliveries.filter(id=OuterRef("delivery_id")))
+    )
+    payloads = EventPayload.objects.filter(
+        ~Exists(EventDelivery.objects.filter(payload_id=OuterRef("id"))),
+        created_at__gte=start,
+        created_at__lt=end,
+    )
+    stats = EventDataDeletionStats(buckets=1)
+    with transaction.atomic():
+        stats.attempts = attempts._raw_delete(attempts.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+        stats.deliveries = deliveries._raw_delete(deliveries.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+        # lock the payloads kept in the storage, so they can't be reused before
+        # the files are deleted
+        paths = list(
+            payloads.exclude(payload_file__isnull=True)
+            .exclude(payload_file="")
+            .select_for_update()
+            .values_list("payload_file", flat=True)
+        )
+        stats.payloads = payloads._raw_delete(payloads.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+        if paths:
+            delete_payload_files(paths, using=payloads.db)
+    stats.duration = time.monotonic() - started
+    return stats
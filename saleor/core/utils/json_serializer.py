@@ -1,11 +1,22 @@
+import json
+from collections.abc import Iterator
+
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.serializers.json import Serializer as JsonSerializer
+from django.http import StreamingHttpResponse
 from draftjs_sanitizer import SafeJSONEncoder
 from measurement.measures import Weight
 from prices import Money
 
 MONEY_TYPE = "Money"
 
+# Size of the chunks written to the client by `StreamingJsonResponse`.
+STREAMING_JSON_CHUNK_SIZE = 64 * 1024
+
+# Containers nested deeper than this are encoded in one go by the C accelerated
+# encoder; shallower ones are split so the output can be flushed incrementally.
+STREAMING_JSON_MAX_DEPTH = 6
+
 
 class Serializer(JsonSerializer):
     def _init_options(self):
@@ -29,3 +40,75 @@ class HTMLSafeJSON(SafeJSONEncoder, DjangoJSONEncoder):
     It is used for integrating JSON into HTML content in addition to
     serializing Django objects.
     """
+
+
+def _iter_json_parts(obj, encoder: json.JSONEncoder, depth: int) -> Iterator[str]:
+    if depth > 0 and isinstance(obj, dict) and all(isinstance(k, str) for k in obj):
+        yield "{"
+        for index, (key, value) in enumerate(obj.items()):
+            yield f",{encoder.encode(key)}:" if index else f"{encoder.encode(key)}:"
+            yield from _iter_json_parts(value, encoder, depth - 1)
+        yield "}"
+    elif depth > 0 and isinstance(obj, (list, tuple)):
+        yield "["
+        for index, value in enumerate(obj):
+            if index:
+                yield ","
+            yield from _iter_json_parts(value, encoder, depth - 1)
+        yield "]"
+    else:
+        yield encoder.encode(obj)
+
+
+def iter_json_chunks(
+    obj,
+    encoder_class: type[json.JSONEncoder] = CustomJsonEncoder,
+    chunk_size: int = STREAMING_JSON_CHUNK_SIZE,
+    max_depth: int = STREAMING_JSON_MAX_DEPTH,
+) -> Iterator[bytes]:
+    """Serialize the object to compact JSON, yielding UTF-8 encoded chunks.
+
+    Top-level containers are walked in Python, everything below `max_depth` is
+    encoded with the stdlib C encoder, so the whole document is never held in
+    memory as a single string.
+    """
+    encoder = encoder_class(separators=(",", ":"))
+    buffer: list[str] = []
+    buffer_size = 0
+    for part in _iter_json_parts(obj, encoder, max_depth):
+        buffer.append(part)
+        buffer_size += len(part)
+        if buffer_size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, buffer_size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    """JSON response written to the client in chunks.
+
+    The chunks are encoded lazily, while the response is sent, so the whole body is
+    never held in memory. The number of bytes sent so far is available as
+    `streamed_length`.
+    """
+
+    def __init__(
+        self,
+        data,
+        encoder: type[json.JSONEncoder] = CustomJsonEncoder,
+        chunk_size: int = STREAMING_JSON_CHUNK_SIZE,
+        **kwargs,
+    ):
+        kwargs.setdefault("content_type", "application/json")
+        self.streamed_length = 0
+        super().__init__(
+            streaming_content=self._iter_chunks(data, encoder, chunk_size), **kwargs
+        )
+
+    def _iter_chunks(
+        self, data, encoder: type[json.JSONEncoder], chunk_size: int
+    ) -> Iterator[bytes]:
+        for chunk in iter_json_chunks(data, encoder, chunk_size):
+            self.streamed_length += len(chunk)
+            yield chunk
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 from ..cache import CacheDict
 
 
@@ -42,3 +45,100 @@ def test_eviction_order():
     assert 1 in cache
     assert 2 not in cache
     assert 3 in cache
+
+
+def test_max_size_eviction():
+    # given
+    cache = CacheDict(10, max_size=10, get_size=len)
+    cache[1] = "aaaa"
+    cache[2] = "bbbb"
+
+    # when
+    cache[3] = "cccc"
+
+    # then
+    assert 1 not in cache
+    assert 2 in cache
+    assert 3 in cache
+    assert cache.size == 8
+    assert cache.stats.evictions == 1
+
+
+def test_value_larger_than_max_size_not_stored():
+    # given
+    cache = CacheDict(10, max_size=2, get_size=len)
+
+    # when
+    cache[1] = "aaaa"
+
+    # then
+    assert 1 not in cache
+    assert cache.size == 0
+
+
+def test_ttl_expiration():
+    # given
+    cache = CacheDict(2, ttl=10)
+    with patch("saleor.core.utils.cache.time.monotonic", return_value=100):
+        cache[1] = "a"
+        cache.set(2, "b", ttl=30)
+
+    # when
+    with patch("saleor.core.utils.cache.time.monotonic", return_value=115):
+        expired = cache.get(1)
+        not_expired = cache.get(2)
+
+    # then
+    assert expired is None
+    assert not_expired == "b"
+    assert len(cache) == 1
+    assert cache.stats.expirations == 1
+
+
+def test_stats():
+    # given
+    cache = CacheDict(2)
+    cache[1] = "a"
+
+    # when
+    cache.get(1)
+    cache.get(1)
+    cache.get(2)
+
+    # then
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_ratio == 2 / 3
+
+
+def test_contains_does_not_update_stats_nor_order():
+    # given
+    cache = CacheDict(2)
+    cache[1] = "a"
+    cache[2] = "b"
+
+    # when
+    assert 1 in cache
+    cache[3] = "c"
+
+    # then
+    assert 1 not in cache
+    assert cache.stats.hits == 0
+
+
+def test_concurrent_access():
+    # given
+    cache = CacheDict(50)
+
+    def worker(offset):
+        for i in range(1000):
+            cache[offset + i % 100] = i
+            cache.get(offset + (i + 1) % 100)
+
+    # when
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(worker, range(0, 400, 100)))
+
+    # then
+    assert len(cache) == 50
+    assert cache.stats.hits + cache.stats.misses == 4000
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ....webhook.event_types import WebhookEventAsyncType
+from ...models import EventDelivery, EventDeliveryAttempt, EventPayload
+from ..event_retention import (
+    delete_event_data_bucket,
+    get_next_bucket_start,
+    iterate_event_data_buckets,
+)
+
+
+def _create_delivery(webhook, payload, created_at):
+    with freeze_time(created_at):
+        delivery = EventDelivery.objects.create(
+            event_type=WebhookEventAsyncType.ANY,
+            payload=payload,
+            webhook=webhook,
+        )
+        EventDeliveryAttempt.objects.create(delivery=delivery)
+    return delivery
+
+
+def test_get_next_bucket_start(webhook):
+    # given
+    now = timezone.now()
+    with freeze_time(now - timedelta(days=3)):
+        payload = EventPayload.objects.create(payload='{"key": "data"}')
+    _create_delivery(webhook, payload, now - timedelta(days=2))
+
+    # when
+    oldest = get_next_bucket_start(now)
+    next_start = get_next_bucket_start(now, after=now - timedelta(days=2, hours=12))
+
+    # then
+    assert oldest == now - timedelta(days=3)
+    assert next_start == now - timedelta(days=2)
+    assert get_next_bucket_start(now - timedelta(days=4)) is None
+
+
+@override_settings(EVENT_PAYLOAD_DELETE_BUCKET_PERIOD=timedelta(hours=1))
+def test_iterate_event_data_buckets_skips_empty_periods(webhook):
+    # given
+    now = timezone.now().replace(minute=0, second=0, microsecond=0)
+    for created_at in [now - timedelta(days=2), now - timedelta(minutes=30)]:
+        _create_delivery(webhook, None, created_at)
+
+    # when
+    buckets = list(iterate_event_data_buckets(now))
+
+    # then
+    assert buckets == [
+        (now - timedelta(days=2), now - timedelta(days=2) + timedelta(hours=1)),
+        (now - timedelta(minutes=30), now),
+    ]
+
+
+def test_delete_event_data_bucket(webhook):
+    # given
+    now = timezone.now()
+    start = now - timedelta(hours=2)
+    end = now - timedelta(hours=1)
+    with freeze_time(start):
+        outdated_payload, used_payload = (
+            EventPayload.objects.create(payload='{"key": "data"}') for _ in range(2)
+        )
+    _create_delivery(webhook, outdated_payload, start)
+    _create_delivery(webhook, used_payload, start)
+    # the payload is used by a newer delivery
+    valid_delivery = _create_delivery(webhook, used_payload, now)
+
+    # when
+    stats = delete_event_data_bucket(start, end)
+
+    # then
+    assert stats.deliveries == 2
+    assert stats.attempts == 2
+    assert stats.payloads == 1
+    assert stats.rows == 5
+    assert list(EventDelivery.objects.all()) == [valid_delivery]
+    assert EventDeliveryAttempt.objects.get().delivery == valid_delivery
+    assert list(EventPayload.objects.all()) == [used_payload]
+
+
+@override_settings(EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE=1)
+def test_delete_event_data_bucket_deletes_payload_files(
+    media_root, django_capture_on_commit_callbacks
+):
+    # given
+    now = timezone.now()
+    with (
+        freeze_time(now - timedelta(hours=2)),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        payload = EventPayload.objects.create_with_payload('{"key": "data"}')
+    path = payload.payload_file.name
+    assert default_storage.exists(path)
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        stats = delete_event_data_bucket(now - timedelta(hours=3), now)
+
+    # then
+    assert stats.payloads == 1
+    assert not EventPayload.objects.exists()
+    assert not default_storage.exists(path)
@@ -1,9 +1,17 @@
+import datetime
 import json
+from decimal import Decimal
+from unittest import mock
 
+import pytz
 from measurement.measures import Weight
 
 from ...taxes import zero_money
-from ..json_serializer import CustomJsonEncoder
+from ..json_serializer import (
+    CustomJsonEncoder,
+    StreamingJsonResponse,
+    iter_json_chunks,
+)
 
 
 def test_custom_json_encoder_dumps_money_objects():
@@ -31,3 +39,66 @@ def test_custom_json_encoder_dumps_weight_objects():
     # then
     data = json.loads(serialized_data)
     assert data["weight"] == "5.0:kg"
+
+
+def test_iter_json_chunks_matches_json_dumps():
+    # given
+    input = {
+        "data": {
+            "orders": [
+                {
+                    "total": zero_money("usd"),
+                    "weight": Weight(kg=5),
+                    "created": datetime.datetime(2024, 1, 1, tzinfo=pytz.utc),
+                    "amount": Decimal("10.50"),
+                    "lines": [{"quantity": i} for i in range(3)],
+                }
+                for _ in range(10)
+            ]
+        },
+        "extensions": {"cost": {"requestedQueryCost": 10}},
+    }
+
+    # when
+    chunks = list(iter_json_chunks(input, chunk_size=128))
+
+    # then
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == json.loads(
+        json.dumps(input, cls=CustomJsonEncoder)
+    )
+
+
+def test_iter_json_chunks_encodes_unicode_and_scalars():
+    # given
+    input = [{"name": "Żółw ☕", "id": None, "active": True, 1: "non-str key"}]
+
+    # when
+    chunks = list(iter_json_chunks(input))
+
+    # then
+    assert b"".join(chunks).decode("utf-8") == json.dumps(
+        input, cls=CustomJsonEncoder, separators=(",", ":")
+    )
+
+
+def test_streaming_json_response_encodes_content_lazily():
+    # given
+    data = {"data": {"name": "x" * 100}}
+
+    # when
+    with mock.patch(
+        "saleor.core.utils.json_serializer.iter_json_chunks",
+        wraps=iter_json_chunks,
+    ) as iter_json_chunks_mock:
+        response = StreamingJsonResponse(data, chunk_size=16)
+        iter_json_chunks_mock.assert_not_called()
+        first_chunk = next(response.streaming_content)
+
+        # then
+        iter_json_chunks_mock.assert_called_once()
+    assert response.streamed_length == len(first_chunk)
+    content = first_chunk + b"".join(response.streaming_content)
+    assert json.loads(content) == data
+    assert response.streamed_length == len(content)
+    assert response["Content-Type"] == "application/json"
@@ -217,4 +217,16 @@ class SaleorGraphQLBackend(GraphQLCoreBackend):
         )
 
 
-backend = GraphQLCachedBackend(SaleorGraphQLBackend(), cache_map=CacheDict(1000))
+class SaleorGraphQLCachedBackend(GraphQLCachedBackend):
+    def document_from_string(self, schema, document_string):
+        # Single lookup, as the document can be evicted by another thread between
+        # the membership test and the read done by the base implementation.
+        key = self.get_key_for_schema_and_document_string(schema, document_string)
+        document = self.cache_map.get(key)
+        if document is None:
+            document = self.backend.document_from_string(schema, document_string)
+            self.cache_map[key] = document
+        return document
+
+
+backend = SaleorGraphQLCachedBackend(SaleorGraphQLBackend(), cache_map=CacheDict(1000))
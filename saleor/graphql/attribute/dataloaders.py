@@ -1,7 +1,7 @@
 from collections import defaultdict
 
 from ...attribute.models import Attribute, AttributeValue
-from ..core.dataloaders import DataLoader
+from ..core.dataloaders import DataLoader, SharedCacheDataLoader
 
 
 class AttributeValuesByAttributeIdLoader(DataLoader):
@@ -19,8 +19,9 @@ class AttributeValuesByAttributeIdLoader(DataLoader):
         return [attribute_to_attributevalues[attribute_id] for attribute_id in keys]
 
 
-class AttributesByAttributeId(DataLoader):
+class AttributesByAttributeId(SharedCacheDataLoader):
     context_key = "attributes_by_id"
+    shared_cache_models = (Attribute,)
 
     def batch_load(self, keys):
         attributes = Attribute.objects.using(self.database_connection_name).in_bulk(
@@ -33,6 +33,7 @@ from ...core.utils import (
 )
 from ...core.validators import validate_one_of_args_is_in_mutation
 from ...plugins.dataloaders import get_plugin_manager_promise
+from ..dataloaders import AttributesByAttributeId
 from ..enums import AttributeTypeEnum
 from ..types import Attribute
 from .attribute_bulk_create import DEPRECATED_ATTR_FIELDS, clean_values
@@ -573,6 +574,8 @@ class AttributeBulkUpdate(BaseMutation):
                 "external_reference",
             ],
         )
+        # `bulk_update` doesn't send the signals that invalidate the shared values
+        AttributesByAttributeId.invalidate_shared_cache()
 
         models.AttributeValue.objects.filter(
             id__in=[values_to_remove.id for values_to_remove in values_to_remove]
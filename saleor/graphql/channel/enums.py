@@ -1,4 +1,9 @@
-from ...channel import AllocationStrategy, MarkAsPaidStrategy, TransactionFlowStrategy
+from ...channel import (
+    AllocationStrategy,
+    MarkAsPaidStrategy,
+    ReservationStrategy,
+    TransactionFlowStrategy,
+)
 from ..core.doc_category import (
     DOC_CATEGORY_CHANNELS,
     DOC_CATEGORY_PAYMENTS,
@@ -13,6 +18,13 @@ AllocationStrategyEnum = to_enum(
 )
 AllocationStrategyEnum.doc_category = DOC_CATEGORY_PRODUCTS
 
+ReservationStrategyEnum = to_enum(
+    ReservationStrategy,
+    type_name="ReservationStrategyEnum",
+    description=ReservationStrategy.__doc__,
+)
+ReservationStrategyEnum.doc_category = DOC_CATEGORY_PRODUCTS
+
 MarkAsPaidStrategyEnum = to_enum(
     MarkAsPaidStrategy,
     type_name="MarkAsPaidStrategyEnum",
@@ -18,6 +18,7 @@ from ...core.descriptions import (
     ADDED_IN_315,
     ADDED_IN_316,
     ADDED_IN_318,
+    ADDED_IN_321,
     DEPRECATED_IN_3X_INPUT,
     PREVIEW_FEATURE,
 )
@@ -38,6 +39,7 @@ from ...plugins.dataloaders import get_plugin_manager_promise
 from ..enums import (
     AllocationStrategyEnum,
     MarkAsPaidStrategyEnum,
+    ReservationStrategyEnum,
     TransactionFlowStrategyEnum,
 )
 from ..types import Channel
@@ -45,6 +47,7 @@ from .utils import (
     clean_input_checkout_settings,
     clean_input_order_settings,
     clean_input_payment_settings,
+    clean_input_stock_settings,
 )
 
 
@@ -56,6 +59,13 @@ class StockSettingsInput(BaseInputObjectType):
         ),
         required=True,
     )
+    reservation_strategy = ReservationStrategyEnum(
+        description=(
+            "Reservation strategy options. Strategy defines how the stocks are "
+            "reserved for checkouts. By default set to `LOCK_STOCKS`." + ADDED_IN_321
+        ),
+        required=False,
+    )
 
     class Meta:
         doc_category = DOC_CATEGORY_PRODUCTS
@@ -259,7 +269,7 @@ class ChannelCreate(ModelMutation):
         if slug:
             cleaned_input["slug"] = slugify(slug)
         if stock_settings := cleaned_input.get("stock_settings"):
-            cleaned_input["allocation_strategy"] = stock_settings["allocation_strategy"]
+            clean_input_stock_settings(stock_settings, cleaned_input)
         if order_settings := cleaned_input.get("order_settings"):
             clean_input_order_settings(order_settings, cleaned_input, instance)
 
@@ -35,6 +35,7 @@ from .utils import (
     clean_input_checkout_settings,
     clean_input_order_settings,
     clean_input_payment_settings,
+    clean_input_stock_settings,
 )
 
 
@@ -127,7 +128,7 @@ class ChannelUpdate(ModelMutation):
         if slug:
             cleaned_input["slug"] = slugify(slug)
         if stock_settings := cleaned_input.get("stock_settings"):
-            cleaned_input["allocation_strategy"] = stock_settings["allocation_strategy"]
+            clean_input_stock_settings(stock_settings, cleaned_input)
         if order_settings := cleaned_input.get("order_settings"):
             clean_input_order_settings(order_settings, cleaned_input, instance)
 
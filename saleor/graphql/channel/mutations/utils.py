@@ -77,6 +77,12 @@ def clean_input_order_settings(
     )
 
 
+def clean_input_stock_settings(stock_settings: dict, cleaned_input: dict):
+    cleaned_input["allocation_strategy"] = stock_settings["allocation_strategy"]
+    if reservation_strategy := stock_settings.get("reservation_strategy"):
+        cleaned_input["reservation_strategy"] = reservation_strategy
+
+
 def clean_input_checkout_settings(checkout_settings: dict, cleaned_input: dict):
     if "use_legacy_error_flow" in checkout_settings:
         cleaned_input["use_legacy_error_flow_for_checkout"] = checkout_settings[
@@ -8,6 +8,7 @@ from django.utils.functional import SimpleLazyObject
 from django.utils.text import slugify
 from freezegun import freeze_time
 
+from .....channel import ReservationStrategy
 from .....channel.error_codes import ChannelErrorCode
 from .....core.utils.json_serializer import CustomJsonEncoder
 from .....webhook.event_types import WebhookEventAsyncType
@@ -16,6 +17,7 @@ from ....tests.utils import assert_no_permission, get_graphql_content
 from ...enums import (
     AllocationStrategyEnum,
     MarkAsPaidStrategyEnum,
+    ReservationStrategyEnum,
     TransactionFlowStrategyEnum,
 )
 
@@ -36,6 +38,7 @@ CHANNEL_UPDATE_MUTATION = """
                 }
                 stockSettings {
                     allocationStrategy
+                    reservationStrategy
                 }
                 orderSettings {
                     automaticallyConfirmAllNewOrders
@@ -119,6 +122,41 @@ def test_channel_update_mutation_as_staff_user(
     assert channel_data["orderSettings"]["allowUnpaidOrders"] is True
 
 
+def test_channel_update_mutation_reservation_strategy(
+    permission_manage_channels, staff_api_client, channel_USD
+):
+    # given
+    channel_id = graphene.Node.to_global_id("Channel", channel_USD.id)
+    allocation_strategy = AllocationStrategyEnum.PRIORITIZE_HIGH_STOCK.name
+    reservation_strategy = ReservationStrategyEnum.OPTIMISTIC.name
+    variables = {
+        "id": channel_id,
+        "input": {
+            "stockSettings": {
+                "allocationStrategy": allocation_strategy,
+                "reservationStrategy": reservation_strategy,
+            },
+        },
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        CHANNEL_UPDATE_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_channels,),
+    )
+    content = get_graphql_content(response)
+
+    # then
+    data = content["data"]["channelUpdate"]
+    assert not data["errors"]
+    stock_settings = data["channel"]["stockSettings"]
+    assert stock_settings["allocationStrategy"] == allocation_strategy
+    assert stock_settings["reservationStrategy"] == reservation_strategy
+    channel_USD.refresh_from_db()
+    assert channel_USD.reservation_strategy == ReservationStrategy.OPTIMISTIC
+
+
 def test_channel_update_mutation_as_app(
     permission_manage_channels, app_api_client, channel_USD
 ):
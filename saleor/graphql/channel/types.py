@@ -32,6 +32,7 @@ from ..core.descriptions import (
     ADDED_IN_316,
     ADDED_IN_318,
     ADDED_IN_320,
+    ADDED_IN_321,
     DEPRECATED_IN_3X_FIELD,
     PREVIEW_FEATURE,
 )
@@ -55,6 +56,7 @@ from .dataloaders import ChannelWithHasOrdersByIdLoader
 from .enums import (
     AllocationStrategyEnum,
     MarkAsPaidStrategyEnum,
+    ReservationStrategyEnum,
     TransactionFlowStrategyEnum,
 )
 
@@ -179,6 +181,13 @@ class StockSettings(BaseObjectType):
         ),
         required=True,
     )
+    reservation_strategy = ReservationStrategyEnum(
+        description=(
+            "Reservation strategy defines how the stocks are reserved for checkouts."
+            + ADDED_IN_321
+        ),
+        required=True,
+    )
 
     class Meta:
         description = "Represents the channel stock settings." + ADDED_IN_37
@@ -555,7 +564,10 @@ class Channel(ModelObjectType):
 
     @staticmethod
     def resolve_stock_settings(root: models.Channel, _info: ResolveInfo):
-        return StockSettings(allocation_strategy=root.allocation_strategy)
+        return StockSettings(
+            allocation_strategy=root.allocation_strategy,
+            reservation_strategy=root.reservation_strategy,
+        )
 
     @staticmethod
     def resolve_order_settings(root: models.Channel, _info):
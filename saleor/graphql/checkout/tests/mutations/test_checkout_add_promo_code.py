@@ -365,6 +365,7 @@ def test_checkout_add_specific_product_voucher_code_checkout_with_sale(
     # then
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -425,6 +426,7 @@ def test_checkout_add_products_voucher_code_checkout_with_sale(
 
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -486,6 +488,7 @@ def test_checkout_add_collection_voucher_code_checkout_with_sale(
 
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -546,6 +549,7 @@ def test_checkout_add_category_code_checkout_with_sale(
 
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -654,6 +658,7 @@ def test_checkout_add_specific_product_voucher_code_checkout_on_promotion(
 
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -721,6 +726,7 @@ def test_checkout_add_collection_voucher_code_checkout_on_promotion(
 
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -783,6 +789,7 @@ def test_checkout_add_category_code_checkout_on_promotion(
 
     checkout.refresh_from_db()
     lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, manager)
     subtotal_with_voucher = calculations.checkout_subtotal(
         manager=manager,
         checkout_info=checkout_info,
@@ -1016,6 +1016,12 @@ def test_checkout_with_insufficient_stock(
     transaction_events_generator,
 ):
     # given
+    checkout_line = checkout_with_item.lines.first()
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    quantity_available = get_available_quantity_for_stock(stock)
+    checkout_line.quantity = quantity_available + 1
+    checkout_line.save()
+
     checkout = prepare_checkout_for_test(
         checkout_with_item,
         address,
@@ -1024,11 +1030,6 @@ def test_checkout_with_insufficient_stock(
         transaction_item_generator,
         transaction_events_generator,
     )
-    checkout_line = checkout.lines.first()
-    stock = Stock.objects.get(product_variant=checkout_line.variant)
-    quantity_available = get_available_quantity_for_stock(stock)
-    checkout_line.quantity = quantity_available + 1
-    checkout_line.save()
 
     redirect_url = "https://www.example.com"
     variables = {"id": to_global_id_or_none(checkout), "redirectUrl": redirect_url}
@@ -2707,6 +2708,13 @@ def test_checkout_complete_own_reservation(
     transaction_item_generator,
 ):
     # given
+    checkout_line = checkout_with_item.lines.first()
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    quantity_available = get_available_quantity_for_stock(stock)
+
+    checkout_line.quantity = quantity_available
+    checkout_line.save()
+
     checkout = prepare_checkout_for_test(
         checkout_with_item,
         address,
@@ -2715,12 +2723,6 @@ def test_checkout_complete_own_reservation(
         transaction_item_generator,
         transaction_events_generator,
     )
-    checkout_line = checkout.lines.first()
-    stock = Stock.objects.get(product_variant=checkout_line.variant)
-    quantity_available = get_available_quantity_for_stock(stock)
-
-    checkout_line.quantity = quantity_available
-    checkout_line.save()
 
     reservation = Reservation.objects.create(
         checkout_line=checkout_line,
@@ -2961,6 +2963,12 @@ def test_complete_checkout_raises_error_for_local_stock(
     transaction_item_generator,
 ):
     # given
+    checkout_line = checkout_with_item_for_cc.lines.first()
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    quantity_available = get_available_quantity_for_stock(stock)
+    checkout_line.quantity = quantity_available + 1
+    checkout_line.save()
+
     checkout = prepare_checkout_for_test(
         checkout_with_item_for_cc,
         None,
@@ -2969,11 +2977,6 @@ def test_complete_checkout_raises_error_for_local_stock(
         transaction_item_generator,
         transaction_events_generator,
     )
-    checkout_line = checkout.lines.first()
-    stock = Stock.objects.get(product_variant=checkout_line.variant)
-    quantity_available = get_available_quantity_for_stock(stock)
-    checkout_line.quantity = quantity_available + 1
-    checkout_line.save()
 
     variables = {
         "id": to_global_id_or_none(checkout),
@@ -3006,6 +3009,14 @@ def test_comp_checkout_builds_order_for_all_warehouse_even_if_not_available_loca
     transaction_item_generator,
 ):
     # given
+    checkout_line = checkout_with_item_for_cc.lines.first()
+    stock = Stock.objects.get(
+        product_variant=checkout_line.variant, warehouse=warehouse_for_cc
+    )
+    quantity_available = get_available_quantity_for_stock(stock)
+    checkout_line.quantity = quantity_available + 1
+    checkout_line.save()
+
     checkout = prepare_checkout_for_test(
         checkout_with_item_for_cc,
         None,
@@ -3014,13 +3025,6 @@ def test_comp_checkout_builds_order_for_all_warehouse_even_if_not_available_loca
         transaction_item_generator,
         transaction_events_generator,
     )
-    checkout_line = checkout.lines.first()
-    stock = Stock.objects.get(
-        product_variant=checkout_line.variant, warehouse=warehouse_for_cc
-    )
-    quantity_available = get_available_quantity_for_stock(stock)
-    checkout_line.quantity = quantity_available + 1
-    checkout_line.save()
 
     warehouse_for_cc.click_and_collect_option = (
         WarehouseClickAndCollectOption.ALL_WAREHOUSES
@@ -3054,6 +3058,15 @@ def test_checkout_complete_raises_InsufficientStock_when_quantity_above_stock_su
     transaction_item_generator,
 ):
     # given
+    checkout_line = checkout_with_item_for_cc.lines.first()
+    overall_stock_quantity = (
+        Stock.objects.filter(product_variant=checkout_line.variant).aggregate(
+            Sum("quantity")
+        )
+    ).pop("quantity__sum")
+    checkout_line.quantity = overall_stock_quantity + 1
+    checkout_line.save()
+
     checkout = prepare_checkout_for_test(
         checkout_with_item_for_cc,
         None,
@@ -3062,14 +3075,6 @@ def test_checkout_complete_raises_InsufficientStock_when_quantity_above_stock_su
         transaction_item_generator,
         transaction_events_generator,
     )
-    checkout_line = checkout.lines.first()
-    overall_stock_quantity = (
-        Stock.objects.filter(product_variant=checkout_line.variant).aggregate(
-            Sum("quantity")
-        )
-    ).pop("quantity__sum")
-    checkout_line.quantity = overall_stock_quantity + 1
-    checkout_line.save()
     warehouse_for_cc.click_and_collect_option = (
         WarehouseClickAndCollectOption.ALL_WAREHOUSES
     )
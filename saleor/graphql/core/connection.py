@@ -11,8 +11,9 @@ from typing import (
 
 import graphene
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import BooleanField, F, Field, Func, Q, QuerySet, Value
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
 from graphene.relay import Connection
 from graphql import GraphQLError
 from graphql.language.ast import FragmentSpread
@@ -21,11 +22,14 @@ from graphql_relay.connection.connectiontypes import Edge, PageInfo
 from graphql_relay.utils import base64, unbase64
 
 from ...channel.exceptions import ChannelNotDefined, NoDefaultChannel
+from ...core.postgres import estimate_count
 from ..channel import ChannelContext, ChannelQsContext
 from ..channel.utils import get_default_channel_slug_or_graphql_error
+from ..core.descriptions import ADDED_IN_321
 from ..core.enums import OrderDirection
 from ..core.types import BaseConnection, NonNullList
 from ..utils.sorting import sort_queryset_for_connection
+from .select_related import prime_related_loaders, select_related_for_connection
 
 if TYPE_CHECKING:
     from ..core import ResolveInfo
@@ -38,6 +42,10 @@ FILTERSET_CLASS = "_FILTERSET_CLASS"
 WHERE_NAME = "_WHERE_NAME"
 WHERE_FILTERSET_CLASS = "_WHERE_FILTERSET_CLASS"
 
+# Approximate total counts below this value are replaced with the exact count, as
+# planner estimates of small result sets are often far off and cheap to count.
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
 
 def to_global_cursor(values):
     if not isinstance(values, Iterable):
@@ -147,6 +155,60 @@ def _prepare_filter(
     return filter_kwargs
 
 
+def _get_row_comparison_fields(
+    model: type[DjangoModel], cursor: list[str], sorting_fields: list[str]
+) -> Optional[list[Field]]:
+    """Return model fields to compare the cursor with as a single row value.
+
+    Return None when the row comparison can't be used: for fields of related models,
+    annotations, nullable columns and cursors containing nulls.
+    """
+    if None in cursor:
+        return None
+    fields = []
+    for field_name in sorting_fields:
+        if field_name == "pk":
+            field = model._meta.pk
+        else:
+            try:
+                field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                return None
+        if not field.concrete or field.is_relation or field.null:
+            return None
+        fields.append(field)
+    return fields
+
+
+def _prepare_row_comparison_filter(
+    cursor: list[str], fields: list[Field], sorting_direction: str
+) -> Q:
+    """Create a keyset filter comparing the sorting fields as a row value.
+
+    Unlike the filter created by `_prepare_filter`, the row comparison,
+    e.g. `(created_at, status, id) > (%s, %s, %s)`, is resolved with a single range
+    scan of the composite index on the sorting fields.
+    """
+    try:
+        values = [
+            Value(field.to_python(value), output_field=field)
+            for field, value in zip(fields, cursor)
+        ]
+    except ValidationError:
+        raise GraphQLError("Received cursor is invalid.")
+    operator = ">" if sorting_direction == "gt" else "<"
+    row_comparison = Func(
+        Func(
+            *[F(field.name) for field in fields], function="ROW", output_field=Field()
+        ),
+        Func(*values, function="ROW", output_field=Field()),
+        arg_joiner=f" {operator} ",
+        template="(%(expressions)s)",
+        output_field=BooleanField(),
+    )
+    return Q(row_comparison)
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -278,16 +340,22 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(
-            cursor,
-            sorting_fields,
-            sorting_direction,
-            _get_id_coercion(qs),
+    filter_kwargs = Q()
+    if cursor:
+        row_comparison_fields = _get_row_comparison_fields(
+            qs.model, cursor, sorting_fields
         )
-        if cursor
-        else Q()
-    )
+        if row_comparison_fields:
+            filter_kwargs = _prepare_row_comparison_filter(
+                cursor, row_comparison_fields, sorting_direction
+            )
+        else:
+            filter_kwargs = _prepare_filter(
+                cursor,
+                sorting_fields,
+                sorting_direction,
+                _get_id_coercion(qs),
+            )
     try:
         filtered_qs = qs.filter(filter_kwargs)
     except ValueError:
@@ -299,7 +367,11 @@ def connection_from_queryset_slice(
 
     if "total_count" in connection_type._meta.fields:
 
-        def get_total_count():
+        def get_total_count(approximate=False):
+            if approximate:
+                estimated_count = estimate_count(qs)
+                if estimated_count >= APPROXIMATE_COUNT_THRESHOLD:
+                    return estimated_count
             return qs.count()
 
         return connection_type(
@@ -339,6 +411,12 @@ def create_connection_slice(
     else:
         queryset = iterable
 
+    related_paths = {}
+    if related_fields := getattr(connection_type, "related_fields", None):
+        queryset, related_paths = select_related_for_connection(
+            queryset, info, related_fields
+        )
+
     allow_replica = getattr(info.context, "allow_replica", False)
     queryset, sort_by = sort_queryset_for_connection(
         iterable=queryset, args=args, allow_replica=allow_replica
@@ -356,6 +434,11 @@ def create_connection_slice(
             pageinfo_type or graphene.relay.PageInfo,
         )
 
+    if related_paths:
+        prime_related_loaders(
+            [edge.node for edge in slice.edges], related_paths, info.context
+        )
+
     if isinstance(iterable, ChannelQsContext):
         edges_with_context = []
         for edge in slice.edges:
@@ -681,10 +764,21 @@ class CountableConnection(NonNullConnection):
     class Meta:
         abstract = True
 
-    total_count = graphene.Int(description="A total count of items in the collection.")
+    total_count = graphene.Int(
+        description="A total count of items in the collection.",
+        approximate=graphene.Boolean(
+            default_value=False,
+            description=(
+                "Return the count estimated by the database instead of counting "
+                "all items, when there are more than "
+                f"{APPROXIMATE_COUNT_THRESHOLD} of them. Use for large "
+                "collections, where the exact count is slow." + ADDED_IN_321
+            ),
+        ),
+    )
 
     @staticmethod
-    def resolve_total_count(root, _info):
+    def resolve_total_count(root, _info, approximate=False):
         try:
             if isinstance(root, dict):
                 total_count = root["total_count"]
@@ -694,6 +788,6 @@ class CountableConnection(NonNullConnection):
             return None
 
         if callable(total_count):
-            return total_count()
+            return total_count(approximate=approximate)
 
         return total_count
@@ -9,7 +9,7 @@ from ...account.models import User
 from ...app.models import App
 
 if TYPE_CHECKING:
-    from .dataloaders import DataLoader
+    from .dataloaders import DataLoader, DataLoaderStats
 
 
 class SaleorContext(HttpRequest):
@@ -17,6 +17,7 @@ class SaleorContext(HttpRequest):
     decoded_auth_token: Optional[dict[str, Any]]
     allow_replica: bool = True
     dataloaders: dict[str, "DataLoader"]
+    dataloaders_stats: Optional[dict[str, "DataLoaderStats"]] = None
     app: Optional[App]
     user: Optional[User]  # type: ignore[assignment]
     requestor: Union[App, User, None]
@@ -1,13 +1,24 @@
+import hashlib
+import pickle
+import time
 from collections import defaultdict
 from collections.abc import Iterable
-from typing import Generic, Optional, TypeVar, Union
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, TypeVar, Union
 
 import opentracing
 import opentracing.tags
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
 from promise import Promise
 from promise.dataloader import DataLoader as BaseLoader
 
 from ...core.db.connection import allow_writer_in_context
+from ...core.utils.cache import CacheDict
 from ...thumbnail.models import Thumbnail
 from ...thumbnail.utils import get_thumbnail_format
 from . import SaleorContext
@@ -17,6 +28,44 @@ K = TypeVar("K")
 R = TypeVar("R")
 
 
+@dataclass
+class DataLoaderStats:
+    """Usage of a single data loader class within a request."""
+
+    batches: int = 0
+    keys: int = 0
+    loads: int = 0
+    sql_queries: int = 0
+    sql_time: float = 0.0
+
+    @property
+    def duplicate_keys(self) -> int:
+        # Loads that didn't add a new key to a batch, because the key was already
+        # loaded or requested earlier in the request.
+        return max(self.loads - self.keys, 0)
+
+    def as_dict(self) -> dict[str, Union[int, float]]:
+        return {
+            "batches": self.batches,
+            "keys": self.keys,
+            "duplicateKeys": self.duplicate_keys,
+            "sqlQueries": self.sql_queries,
+            "sqlTime": round(self.sql_time, 6),
+        }
+
+
+def _get_sql_timer(stats: DataLoaderStats):
+    def sql_timer(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats.sql_queries += 1
+            stats.sql_time += time.perf_counter() - start
+
+    return sql_timer
+
+
 class DataLoader(BaseLoader, Generic[K, R]):
     context_key: str
     context: SaleorContext
@@ -40,6 +89,21 @@ class DataLoader(BaseLoader, Generic[K, R]):
             self.database_connection_name = get_database_connection_name(context)
             super().__init__()
 
+    def get_stats(self) -> Optional[DataLoaderStats]:
+        """Return usage stats of the loader if they are collected for the request."""
+        dataloaders_stats = getattr(self.context, "dataloaders_stats", None)
+        if dataloaders_stats is None:
+            return None
+        name = self.__class__.__name__
+        if name not in dataloaders_stats:
+            dataloaders_stats[name] = DataLoaderStats()
+        return dataloaders_stats[name]
+
+    def load(self, key=None):
+        if stats := self.get_stats():
+            stats.loads += 1
+        return super().load(key)
+
     def batch_load_fn(  # pylint: disable=method-hidden
         self, keys: Iterable[K]
     ) -> Promise[list[R]]:
@@ -48,8 +112,18 @@ class DataLoader(BaseLoader, Generic[K, R]):
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
+            keys = list(keys)
+            span.set_tag("dataloader.batch_size", len(keys))
 
-            with allow_writer_in_context(self.context):
+            with ExitStack() as stack:
+                stack.enter_context(allow_writer_in_context(self.context))
+                if stats := self.get_stats():
+                    stats.batches += 1
+                    stats.keys += len(keys)
+                    connection = connections[self.database_connection_name]
+                    stack.enter_context(
+                        connection.execute_wrapper(_get_sql_timer(stats))
+                    )
                 results = self.batch_load(keys)
 
             if not isinstance(results, Promise):
@@ -60,6 +134,145 @@ class DataLoader(BaseLoader, Generic[K, R]):
         raise NotImplementedError()
 
 
+# Values of the shared cache data loaders kept in the process memory. Values are
+# stored pickled, so objects returned to the requests are never shared between them.
+SHARED_DATALOADER_CACHE_MAX_SIZE = 32 * 1024 * 1024
+shared_dataloader_cache = CacheDict(
+    10000, max_size=SHARED_DATALOADER_CACHE_MAX_SIZE, get_size=len
+)
+
+
+def _get_shared_cache_version_key(context_key: str) -> str:
+    return f"dataloader-version:{context_key}"
+
+
+def _get_shared_cache_key(context_key: str, version: Any, key: Any) -> str:
+    if not isinstance(key, (int, str)):
+        key = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return f"dataloader:{context_key}:{version}:{key}"
+
+
+def invalidate_shared_dataloader_cache(context_key: str):
+    """Drop all values shared between requests by the given data loader."""
+    cache.set(_get_shared_cache_version_key(context_key), time.time_ns(), None)
+
+
+class SharedCacheDataLoader(DataLoader[K, R]):
+    """Data loader that shares loaded values between requests.
+
+    Values are kept in a process-local LRU and in the Django cache for
+    `settings.DATALOADER_SHARED_CACHE_TIMEOUT` seconds; the shared cache is
+    disabled when it is set to 0. Saving or deleting an instance of any model from
+    `shared_cache_models` invalidates all values of the loader once the transaction
+    is committed. Changes that don't send model signals, like `QuerySet.update()`,
+    are only picked up after the timeout, unless `invalidate_shared_cache` is called,
+    so this should only be used for rarely changing reference data. Missing values
+    are not shared, so the newly created objects are visible right away. The setting has to be the same in all processes
+    that save the models, as the values are not invalidated when it is disabled.
+
+    Values are shared only for the contexts that are allowed to use the replica
+    database, mutations always read from the writer.
+    """
+
+    shared_cache_models: tuple[type[Model], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        def invalidate(using=None, **_kwargs):
+            cls.invalidate_shared_cache(using=using)
+
+        for model in cls.shared_cache_models:
+            dispatch_uid = f"invalidate_dataloader_{cls.context_key}"
+            post_save.connect(
+                invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid
+            )
+            post_delete.connect(
+                invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid
+            )
+
+    @classmethod
+    def invalidate_shared_cache(cls, using: Optional[str] = None):
+        """Drop the shared values of the loader once the transaction is committed.
+
+        Has to be called after changing the `shared_cache_models` without sending
+        model signals, like with `QuerySet.bulk_update()`.
+        """
+        if not settings.DATALOADER_SHARED_CACHE_TIMEOUT:
+            return
+        # the values read before the commit would be cached under the new version
+        transaction.on_commit(
+            lambda: invalidate_shared_dataloader_cache(cls.context_key),
+            using=using,
+        )
+
+    def use_shared_cache(self) -> bool:
+        return bool(settings.DATALOADER_SHARED_CACHE_TIMEOUT) and (
+            self.database_connection_name == settings.DATABASE_CONNECTION_REPLICA_NAME
+        )
+
+    def batch_load_fn(  # pylint: disable=method-hidden
+        self, keys: Iterable[K]
+    ) -> Promise[list[R]]:
+        if not self.use_shared_cache():
+            return super().batch_load_fn(keys)
+
+        keys = list(keys)
+        version = cache.get_or_set(
+            _get_shared_cache_version_key(self.context_key), time.time_ns, None
+        )
+        cache_keys = [
+            _get_shared_cache_key(self.context_key, version, key) for key in keys
+        ]
+        values = self._get_local_values(cache_keys)
+        missing_cache_keys = [key for key in cache_keys if key not in values]
+        if missing_cache_keys:
+            shared_values = cache.get_many(missing_cache_keys)
+            self._set_local_values(shared_values)
+            values.update(shared_values)
+
+        missing_keys = [
+            key for key, cache_key in zip(keys, cache_keys) if cache_key not in values
+        ]
+        if not missing_keys:
+            return Promise.resolve([values[cache_key] for cache_key in cache_keys])
+
+        def with_loaded_values(loaded_values):
+            loaded = {
+                _get_shared_cache_key(self.context_key, version, key): value
+                for key, value in zip(missing_keys, loaded_values)
+            }
+            found = {
+                cache_key: value
+                for cache_key, value in loaded.items()
+                if value is not None
+            }
+            cache.set_many(found, settings.DATALOADER_SHARED_CACHE_TIMEOUT)
+            self._set_local_values(found)
+            values.update(loaded)
+            return [values[cache_key] for cache_key in cache_keys]
+
+        return super().batch_load_fn(missing_keys).then(with_loaded_values)
+
+    @staticmethod
+    def _get_local_values(cache_keys: list[str]) -> dict[str, Any]:
+        values = {}
+        for cache_key in cache_keys:
+            pickled_value = shared_dataloader_cache.get(cache_key)
+            if pickled_value is not None:
+                values[cache_key] = pickle.loads(pickled_value)
+        return values
+
+    @staticmethod
+    def _set_local_values(values: dict[str, Any]):
+        for cache_key, value in values.items():
+            shared_dataloader_cache.set(
+                cache_key,
+                pickle.dumps(value),
+                ttl=settings.DATALOADER_SHARED_CACHE_TIMEOUT,
+            )
+
+
 class BaseThumbnailBySizeAndFormatLoader(
     DataLoader[tuple[int, int, Optional[str]], Thumbnail]
 ):
@@ -0,0 +1,134 @@
+"""Join the relations requested for the nodes of a root connection.
+
+Node fields are usually resolved with data loaders, which costs one query per
+loader for each list. For foreign keys that are always loaded the same way, the
+connection can declare them in `related_fields`; when such a field is requested,
+the relation is fetched with `select_related` together with the nodes and the
+fetched objects are primed in the data loader used by the field resolver.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from django.db.models import Model, QuerySet
+from graphql.language.ast import FragmentSpread, InlineFragment
+
+if TYPE_CHECKING:
+    from . import ResolveInfo, SaleorContext
+    from .dataloaders import DataLoader
+
+
+@dataclass
+class RelatedField:
+    """Foreign key of the node resolved with the given data loader.
+
+    The loader has to load the related objects by their primary keys, without any
+    additional filtering, as the joined objects are primed in it as they are.
+    """
+
+    relation: str
+    loader: type["DataLoader"]
+    related_fields: dict[str, "RelatedField"] = field(default_factory=dict)
+
+
+RelatedFields = dict[str, RelatedField]
+
+
+def _get_selected_fields(selection_set, fragments) -> dict[str, list]:
+    selected_fields: dict[str, list] = {}
+    if not selection_set:
+        return selected_fields
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpread):
+            fragment = fragments.get(selection.name.value)
+            nested_selection_set = fragment.selection_set if fragment else None
+        elif isinstance(selection, InlineFragment):
+            nested_selection_set = selection.selection_set
+        else:
+            selected_fields.setdefault(selection.name.value, []).append(selection)
+            continue
+        for name, field_asts in _get_selected_fields(
+            nested_selection_set, fragments
+        ).items():
+            selected_fields.setdefault(name, []).extend(field_asts)
+    return selected_fields
+
+
+def _get_node_selection_sets(info: "ResolveInfo") -> list:
+    selection_sets = []
+    for connection_ast in info.field_asts:
+        edges = _get_selected_fields(connection_ast.selection_set, info.fragments)
+        for edge_ast in edges.get("edges", []):
+            nodes = _get_selected_fields(edge_ast.selection_set, info.fragments)
+            selection_sets.extend(
+                node_ast.selection_set for node_ast in nodes.get("node", [])
+            )
+    return selection_sets
+
+
+def _get_related_paths(
+    selection_sets: list, related_fields: RelatedFields, fragments, prefix: str = ""
+) -> dict[str, RelatedField]:
+    selected_fields: dict[str, list] = {}
+    for selection_set in selection_sets:
+        for name, field_asts in _get_selected_fields(selection_set, fragments).items():
+            selected_fields.setdefault(name, []).extend(field_asts)
+
+    related_paths = {}
+    for name, related_field in related_fields.items():
+        if name not in selected_fields:
+            continue
+        path = f"{prefix}{related_field.relation}"
+        related_paths[path] = related_field
+        if related_field.related_fields:
+            related_paths.update(
+                _get_related_paths(
+                    [field_ast.selection_set for field_ast in selected_fields[name]],
+                    related_field.related_fields,
+                    fragments,
+                    prefix=f"{path}__",
+                )
+            )
+    return related_paths
+
+
+def select_related_for_connection(
+    queryset: QuerySet, info: "ResolveInfo", related_fields: RelatedFields
+) -> tuple[QuerySet, dict[str, RelatedField]]:
+    """Join the declared relations requested in the selection of the nodes.
+
+    Return the queryset and the joined relation paths, to be passed to
+    `prime_related_loaders` once the nodes are fetched.
+    """
+    related_paths = _get_related_paths(
+        _get_node_selection_sets(info), related_fields, info.fragments
+    )
+    if not related_paths:
+        return queryset, {}
+    return queryset.select_related(*related_paths), related_paths
+
+
+def _get_joined_object(instance: Model, path: str) -> Any:
+    related: Any = instance
+    for name in path.split("__"):
+        model_field = related._meta.get_field(name)
+        if not model_field.is_cached(related):
+            return None
+        related = getattr(related, name)
+        if related is None:
+            return None
+    return related
+
+
+def prime_related_loaders(
+    instances: Iterable[Model],
+    related_paths: dict[str, RelatedField],
+    context: "SaleorContext",
+):
+    for path, related_field in related_paths.items():
+        loader = related_field.loader(context)
+        for instance in instances:
+            related = _get_joined_object(instance, path)
+            if related is not None:
+                loader.prime(related.pk, related)
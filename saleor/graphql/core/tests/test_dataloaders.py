@@ -0,0 +1,264 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from ....attribute.models import Attribute
+from ....channel.models import Channel
+from ....tests.utils import flush_post_commit_hooks
+from ...attribute.dataloaders import AttributesByAttributeId
+from ...channel.dataloaders import ChannelBySlugLoader
+from ...tests.utils import get_graphql_content
+from .. import SaleorContext
+from ..dataloaders import shared_dataloader_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_dataloader_cache():
+    shared_dataloader_cache.clear()
+    cache.clear()
+    yield
+    shared_dataloader_cache.clear()
+    cache.clear()
+
+
+def _get_context(allow_replica=True):
+    context = SaleorContext()
+    context.dataloaders = {}
+    context.allow_replica = allow_replica
+    return context
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_reuses_values_between_requests(
+    channel_USD, django_assert_num_queries
+):
+    # given
+    ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # when
+    with django_assert_num_queries(0):
+        channel = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # then
+    assert channel == channel_USD
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_uses_shared_cache_when_local_is_empty(
+    channel_USD, django_assert_num_queries
+):
+    # given
+    ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+    shared_dataloader_cache.clear()
+
+    # when
+    with django_assert_num_queries(0):
+        channel = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # then
+    assert channel == channel_USD
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_returns_separate_instances(channel_USD):
+    # given
+    first = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # when
+    second = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # then
+    assert first == second
+    assert first is not second
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_invalidated_on_save(channel_USD):
+    # given
+    ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+    channel_USD.name = "New name"
+
+    # when
+    channel_USD.save(update_fields=["name"])
+    flush_post_commit_hooks()
+
+    # then
+    channel = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+    assert channel.name == "New name"
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_invalidated_after_commit(channel_USD):
+    # given
+    ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+    channel_USD.name = "New name"
+    channel_USD.save(update_fields=["name"])
+    # read before the commit, cached under the version from before the save
+    ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # when
+    flush_post_commit_hooks()
+
+    # then
+    channel = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+    assert channel.name == "New name"
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_invalidated_explicitly(color_attribute):
+    # given
+    AttributesByAttributeId(_get_context()).load(color_attribute.pk).get()
+    color_attribute.name = "New name"
+    Attribute.objects.bulk_update([color_attribute], ["name"])
+
+    # when
+    AttributesByAttributeId.invalidate_shared_cache()
+    flush_post_commit_hooks()
+
+    # then
+    attribute = AttributesByAttributeId(_get_context()).load(color_attribute.pk).get()
+    assert attribute.name == "New name"
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_doesnt_cache_missing_values(
+    channel_USD, django_assert_num_queries
+):
+    # given
+    assert ChannelBySlugLoader(_get_context()).load("new-channel").get() is None
+    channel_USD.pk = None
+    channel_USD.slug = "new-channel"
+    channel_USD.name = "New channel"
+    # the bulk create doesn't send signals, so the loader is not invalidated
+    Channel.objects.bulk_create([channel_USD])
+
+    # when
+    with django_assert_num_queries(1):
+        channel = ChannelBySlugLoader(_get_context()).load("new-channel").get()
+
+    # then
+    assert channel.name == "New channel"
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=60)
+def test_shared_cache_dataloader_not_used_without_replica(
+    channel_USD, django_assert_num_queries
+):
+    # given
+    ChannelBySlugLoader(_get_context(allow_replica=False)).load(channel_USD.slug).get()
+
+    # when
+    with django_assert_num_queries(1):
+        channel = (
+            ChannelBySlugLoader(_get_context(allow_replica=False))
+            .load(channel_USD.slug)
+            .get()
+        )
+
+    # then
+    assert channel == channel_USD
+
+
+@override_settings(DATALOADER_SHARED_CACHE_TIMEOUT=0)
+def test_shared_cache_dataloader_disabled(channel_USD, django_assert_num_queries):
+    # given
+    ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # when
+    with django_assert_num_queries(1):
+        channel = ChannelBySlugLoader(_get_context()).load(channel_USD.slug).get()
+
+    # then
+    assert channel == channel_USD
+
+
+QUERY_PRODUCTS_WITH_TYPES = """
+    query ($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                    variants {
+                        product {
+                            productType {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@override_settings(GRAPHQL_DATALOADER_STATS_ENABLED=True)
+def test_dataloaders_stats_in_extensions(staff_api_client, product_list, channel_USD):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_TYPES,
+        variables,
+        HTTP_X_SALEOR_DEBUG_DATALOADERS="1",
+    )
+
+    # then
+    content = get_graphql_content(response)
+    stats = content["extensions"]["dataloaders"]["ProductTypeByIdLoader"]
+    assert stats["batches"] == 1
+    assert stats["keys"] == len({product.product_type_id for product in product_list})
+    assert stats["duplicateKeys"] == len(product_list) - stats["keys"]
+    assert stats["sqlQueries"] == 1
+    assert stats["sqlTime"] >= 0
+
+
+@override_settings(GRAPHQL_DATALOADER_STATS_ENABLED=True)
+def test_dataloaders_stats_not_collected_without_header(
+    staff_api_client, product_list, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS_WITH_TYPES, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert "dataloaders" not in content.get("extensions", {})
+
+
+@override_settings(GRAPHQL_DATALOADER_STATS_ENABLED=False)
+def test_dataloaders_stats_disabled(staff_api_client, product_list, channel_USD):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_TYPES,
+        variables,
+        HTTP_X_SALEOR_DEBUG_DATALOADERS="1",
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert "dataloaders" not in content.get("extensions", {})
+
+
+def test_dataloader_stats_count_duplicate_loads(channel_USD):
+    # given
+    context = _get_context()
+    context.dataloaders_stats = {}
+    loader = ChannelBySlugLoader(context)
+
+    # when
+    loader.load_many([channel_USD.slug, channel_USD.slug]).get()
+
+    # then
+    stats = context.dataloaders_stats["ChannelBySlugLoader"]
+    assert stats.batches == 1
+    assert stats.keys == 1
+    assert stats.loads == 2
+    assert stats.duplicate_keys == 1
+    assert stats.sql_queries == 1
@@ -1,11 +1,20 @@
 import base64
+import json
 import math
+from unittest.mock import patch
 
 import graphene
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+from ....core.postgres import estimate_count
 from ....tests.models import Book
-from ..connection import CountableConnection, create_connection_slice
+from ..connection import (
+    APPROXIMATE_COUNT_THRESHOLD,
+    CountableConnection,
+    create_connection_slice,
+)
 from ..fields import ConnectionField
 
 
@@ -310,3 +319,90 @@ def test_query_with_pagination_and_fragments_no_first_or_last_raises_an_error(bo
         "the `books` connection."
     )
     assert str(result.errors[0]) == expected_err_msg
+
+
+def test_pagination_uses_row_comparison_for_model_fields(books):
+    # given
+    variables = {"first": 5, "after": None}
+    result = schema.execute(QUERY_PAGINATION_TEST, variables=variables)
+    end_cursor = result.data["books"]["pageInfo"]["endCursor"]
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        result = schema.execute(
+            QUERY_PAGINATION_TEST, variables={"first": 5, "after": end_cursor}
+        )
+
+    # then
+    assert not result.errors
+    assert [edge["node"]["name"] for edge in result.data["books"]["edges"]] == [
+        book.name for book in books[5:10]
+    ]
+    assert "(ROW(" in queries[0]["sql"]
+
+
+def test_pagination_row_comparison_invalid_cursor(books):
+    # given
+    cursor = base64.b64encode(json.dumps(["invalid"]).encode("utf-8")).decode("utf-8")
+    variables = {"first": 5, "after": cursor}
+
+    # when
+    result = schema.execute(QUERY_PAGINATION_TEST, variables=variables)
+
+    # then
+    assert len(result.errors) == 1
+    assert str(result.errors[0]) == "Received cursor is invalid."
+
+
+QUERY_TOTAL_COUNT = """
+    query BooksTotalCount($approximate: Boolean) {
+        books(first: 1) {
+            totalCount(approximate: $approximate)
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.core.connection.estimate_count")
+def test_total_count_exact_by_default(mocked_estimate_count, books):
+    # when
+    result = schema.execute(QUERY_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+    mocked_estimate_count.assert_not_called()
+
+
+@patch("saleor.graphql.core.connection.estimate_count")
+def test_total_count_approximate(mocked_estimate_count, books):
+    # given
+    mocked_estimate_count.return_value = APPROXIMATE_COUNT_THRESHOLD + 1
+
+    # when
+    result = schema.execute(QUERY_TOTAL_COUNT, variables={"approximate": True})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == APPROXIMATE_COUNT_THRESHOLD + 1
+
+
+@patch("saleor.graphql.core.connection.estimate_count")
+def test_total_count_approximate_below_threshold(mocked_estimate_count, books):
+    # given
+    mocked_estimate_count.return_value = 10
+
+    # when
+    result = schema.execute(QUERY_TOTAL_COUNT, variables={"approximate": True})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+def test_estimate_count(books):
+    # when
+    count = estimate_count(Book.objects.all())
+
+    # then
+    assert count >= 0
@@ -0,0 +1,142 @@
+import hashlib
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from ...persisted_queries import (
+    generate_persisted_query_cache_key,
+    local_persisted_queries,
+)
+from ...tests.utils import get_graphql_content_from_response
+
+QUERY_SHOP = """
+    query {
+        shop {
+            name
+        }
+    }
+"""
+QUERY_SHOP_HASH = hashlib.sha256(QUERY_SHOP.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def _clear_persisted_queries():
+    local_persisted_queries.clear()
+    cache.delete(generate_persisted_query_cache_key(QUERY_SHOP_HASH))
+    yield
+    local_persisted_queries.clear()
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=True)
+def test_persisted_query_not_found(api_client, site_settings):
+    # when
+    response = api_client.post(
+        {"extensions": _persisted_query_extensions(QUERY_SHOP_HASH)}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+    assert (
+        content["errors"][0]["extensions"]["exception"]["code"]
+        == "PersistedQueryNotFound"
+    )
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=True)
+def test_persisted_query_registered_and_reused(api_client, site_settings):
+    # given
+    response = api_client.post(
+        {
+            "query": QUERY_SHOP,
+            "extensions": _persisted_query_extensions(QUERY_SHOP_HASH),
+        }
+    )
+    content = get_graphql_content_from_response(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    local_persisted_queries.clear()
+
+    # when
+    response = api_client.post(
+        {"extensions": _persisted_query_extensions(QUERY_SHOP_HASH)}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 200
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    assert cache.get(generate_persisted_query_cache_key(QUERY_SHOP_HASH)) == QUERY_SHOP
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=True)
+def test_persisted_query_hash_mismatch(api_client, site_settings):
+    # when
+    response = api_client.post(
+        {
+            "query": QUERY_SHOP,
+            "extensions": _persisted_query_extensions("0" * 64),
+        }
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert (
+        content["errors"][0]["message"]
+        == "Provided sha256Hash does not match the query."
+    )
+    assert cache.get(generate_persisted_query_cache_key("0" * 64)) is None
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=True)
+def test_persisted_query_unsupported_version(api_client, site_settings):
+    # when
+    response = api_client.post(
+        {
+            "query": QUERY_SHOP,
+            "extensions": {
+                "persistedQuery": {"version": 2, "sha256Hash": QUERY_SHOP_HASH}
+            },
+        }
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == "Unsupported persisted query version."
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=False)
+def test_persisted_query_disabled(api_client, site_settings):
+    # when
+    response = api_client.post(
+        {"extensions": _persisted_query_extensions(QUERY_SHOP_HASH)}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=False)
+def test_persisted_query_disabled_with_full_query(api_client, site_settings):
+    # when
+    response = api_client.post(
+        {
+            "query": QUERY_SHOP,
+            "extensions": _persisted_query_extensions(QUERY_SHOP_HASH),
+        }
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 200
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    assert cache.get(generate_persisted_query_cache_key(QUERY_SHOP_HASH)) is None
@@ -1,7 +1,19 @@
+from unittest.mock import patch
+
 import graphene
 import pytest
 from django.test import override_settings
 
+from ...api import backend, schema
+from ...query_cost_map import COST_MAP
+from ..validators import query_cost as query_cost_module
+from ..validators.query_cost import (
+    QueryCostError,
+    get_cost_variable_names,
+    query_cost_cache,
+    validate_query_cost,
+)
+
 
 @override_settings(GRAPHQL_QUERY_MAX_COMPLEXITY=1)
 def test_query_exceeding_cost_limit_fails_validation(
@@ -235,3 +247,63 @@ def test_query_with_fragments_have_same_multiplied_complexity_cost(
     assert json_response["data"] == expected_data
     query_cost = json_response["extensions"]["cost"]["requestedQueryCost"]
     assert query_cost == 120
+
+
+def test_get_cost_variable_names_returns_only_multiplier_variables():
+    # given
+    document = backend.document_from_string(schema, VARIANTS_QUERY)
+
+    # when
+    variable_names = get_cost_variable_names(document.document_ast, COST_MAP)
+
+    # then
+    assert variable_names == ("first",)
+
+
+@patch(
+    "saleor.graphql.core.validators.query_cost.validate",
+    wraps=query_cost_module.validate,
+)
+def test_validate_query_cost_reuses_cost_for_same_multiplier_variables(
+    mocked_validate,
+):
+    # given
+    query_cost_cache.clear()
+    document = backend.document_from_string(schema, VARIANTS_QUERY)
+    variables = {"ids": ["abc"], "channel": "channel-usd", "first": 5}
+    first_cost, first_errors = validate_query_cost(
+        schema, document, variables, COST_MAP, 10
+    )
+
+    # when
+    variables = {"ids": ["def", "ghi"], "channel": "channel-pln", "first": 5}
+    cost, errors = validate_query_cost(schema, document, variables, COST_MAP, 10)
+
+    # then
+    assert mocked_validate.call_count == 1
+    assert cost == first_cost == 5
+    assert errors is first_errors is None
+
+
+@patch(
+    "saleor.graphql.core.validators.query_cost.validate",
+    wraps=query_cost_module.validate,
+)
+def test_validate_query_cost_recomputes_cost_for_different_multiplier_variables(
+    mocked_validate,
+):
+    # given
+    query_cost_cache.clear()
+    document = backend.document_from_string(schema, VARIANTS_QUERY)
+    variables = {"channel": "channel-usd", "first": 5}
+    validate_query_cost(schema, document, variables, COST_MAP, 10)
+
+    # when
+    variables = {"channel": "channel-usd", "first": 100}
+    cost, errors = validate_query_cost(schema, document, variables, COST_MAP, 10)
+
+    # then
+    assert mocked_validate.call_count == 2
+    assert cost == 100
+    assert len(errors) == 1
+    assert isinstance(errors[0], QueryCostError)
@@ -0,0 +1,153 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCTS = """
+    query ($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                    productType {
+                        name
+                    }
+                    category {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@override_settings(GRAPHQL_DATALOADER_STATS_ENABLED=True)
+def test_products_related_fields_joined(staff_api_client, product_list, channel_USD):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCTS, variables, HTTP_X_SALEOR_DEBUG_DATALOADERS="1"
+    )
+
+    # then
+    content = get_graphql_content(response)
+    nodes = [edge["node"] for edge in content["data"]["products"]["edges"]]
+    assert len(nodes) == len(product_list)
+    for node in nodes:
+        assert node["productType"]["name"] == product_list[0].product_type.name
+        assert node["category"]["name"] == product_list[0].category.name
+    stats = content["extensions"]["dataloaders"]
+    assert stats["ProductTypeByIdLoader"]["batches"] == 0
+    assert stats["CategoryByIdLoader"]["batches"] == 0
+
+
+QUERY_PRODUCTS_WITH_FRAGMENT = """
+    fragment ProductFragment on Product {
+        productType {
+            name
+        }
+    }
+
+    query ($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    ...ProductFragment
+                }
+            }
+        }
+    }
+"""
+
+
+@override_settings(GRAPHQL_DATALOADER_STATS_ENABLED=True)
+def test_products_related_fields_joined_with_fragment(
+    staff_api_client, product_list, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_FRAGMENT, variables, HTTP_X_SALEOR_DEBUG_DATALOADERS="1"
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert len(content["data"]["products"]["edges"]) == len(product_list)
+    stats = content["extensions"]["dataloaders"]
+    assert stats["ProductTypeByIdLoader"]["batches"] == 0
+
+
+QUERY_VARIANTS = """
+    query ($channel: String) {
+        productVariants(first: 10, channel: $channel) {
+            edges {
+                node {
+                    product {
+                        name
+                        productType {
+                            name
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@override_settings(GRAPHQL_DATALOADER_STATS_ENABLED=True)
+def test_variants_nested_related_fields_joined(
+    staff_api_client, product_list, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_VARIANTS, variables, HTTP_X_SALEOR_DEBUG_DATALOADERS="1"
+    )
+
+    # then
+    content = get_graphql_content(response)
+    names = {
+        edge["node"]["product"]["name"]
+        for edge in content["data"]["productVariants"]["edges"]
+    }
+    assert names == {product.name for product in product_list}
+    stats = content["extensions"]["dataloaders"]
+    assert stats["ProductByIdLoader"]["batches"] == 0
+    assert stats["ProductTypeByIdLoader"]["batches"] == 0
+
+
+def test_products_related_fields_not_requested(
+    staff_api_client, product_list, channel_USD
+):
+    # given
+    query = """
+        query ($channel: String) {
+            products(first: 10, channel: $channel) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        response = staff_api_client.post_graphql(query, variables)
+
+    # then
+    get_graphql_content(response)
+    assert not any(
+        "product_producttype" in query["sql"] for query in queries.captured_queries
+    )
@@ -3,6 +3,7 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.conf import settings
 from django.test import override_settings
 from graphql.execution.base import ExecutionResult
 
@@ -350,3 +351,199 @@ def test_graphql_view_clears_context(rf, staff_user, product, channel_USD):
     assert json_data["data"]["product"]["category"]["name"] == product.category.name
     assert response.status_code == 200
     assert request.dataloaders == {}
+
+
+@override_settings(GRAPHQL_BATCH_PARALLEL_EXECUTION=True)
+def test_batch_queries_executed_concurrently(api_client):
+    # given
+    data = [
+        {"query": "query First { __typename }"},
+        {"query": "query Second { __typename }"},
+    ]
+
+    # when
+    with mock.patch.object(
+        GraphQLView,
+        "get_response_in_thread",
+        autospec=True,
+        side_effect=GraphQLView.get_response_in_thread,
+    ) as get_response_in_thread_mock:
+        response = api_client.post(data)
+
+    # then
+    content = get_graphql_content(response)
+    assert [entry["data"] for entry in content] == [
+        {"__typename": "Query"},
+        {"__typename": "Query"},
+    ]
+    assert get_response_in_thread_mock.call_count == 2
+
+
+# the test mirror of the replica database is set up only for the connections of the
+# main thread, so the pool threads read from the default database
+@pytest.mark.django_db(transaction=True)
+@override_settings(
+    GRAPHQL_BATCH_PARALLEL_EXECUTION=True,
+    DATABASE_CONNECTION_REPLICA_NAME=settings.DATABASE_CONNECTION_DEFAULT_NAME,
+)
+def test_batch_queries_executed_concurrently_with_separate_contexts(
+    user_api_client, category, customer_user
+):
+    # given
+    data = [
+        {"query": "query Me { me { email } }"},
+        {
+            "query": "query Category($id: ID!) { category(id: $id) { name } }",
+            "variables": {"id": graphene.Node.to_global_id("Category", category.pk)},
+        },
+        {"query": "query MeAgain { me { email } }"},
+    ]
+
+    # when
+    with mock.patch.object(
+        GraphQLView,
+        "get_response_in_thread",
+        autospec=True,
+        side_effect=GraphQLView.get_response_in_thread,
+    ) as get_response_in_thread_mock:
+        response = user_api_client.post(data)
+
+    # then
+    content = get_graphql_content(response)
+    assert [entry["data"] for entry in content] == [
+        {"me": {"email": customer_user.email}},
+        {"category": {"name": category.name}},
+        {"me": {"email": customer_user.email}},
+    ]
+    contexts = [call.args[1] for call in get_response_in_thread_mock.call_args_list]
+    assert len(contexts) == 3
+    assert len({id(context) for context in contexts}) == 3
+    assert len({id(context.dataloaders) for context in contexts}) == 3
+    assert len({id(context._cached_user) for context in contexts}) == 3
+
+
+def test_copy_request_creates_separate_context(rf, staff_user, app):
+    # given
+    request = rf.post(path="/", data={}, content_type="application/json")
+    request.dataloaders = {"loader": mock.Mock()}
+    request.allow_replica = False
+    request.request_time = mock.sentinel.request_time
+    request.app = app
+    request._cached_user = staff_user
+    request.decoded_auth_token = {"token": "value"}
+
+    # when
+    request_copy = GraphQLView.copy_request(request)
+
+    # then
+    assert request_copy.dataloaders == {}
+    assert request_copy.allow_replica is True
+    assert request_copy.request_time is not request.request_time
+    assert request_copy.app == app
+    assert request_copy.app is not app
+    assert request_copy._cached_user == staff_user
+    assert request_copy._cached_user is not staff_user
+    assert request_copy.decoded_auth_token == request.decoded_auth_token
+    assert request_copy.decoded_auth_token is not request.decoded_auth_token
+    assert request.dataloaders
+
+
+@override_settings(GRAPHQL_BATCH_PARALLEL_EXECUTION=True)
+def test_batch_queries_mutations_keep_order(rf):
+    # given
+    data = [
+        {"query": "query First { __typename }"},
+        {"query": "query Second { __typename }"},
+        {"query": 'mutation { tokenVerify(token: "abc") { isValid } }'},
+        {"query": "query Third { __typename }"},
+    ]
+    request = rf.post(path="/", data=data, content_type="application/json")
+    view = GraphQLView(backend=backend, schema=schema)
+    calls = []
+
+    def get_concurrent_responses(request, entries):
+        calls.append([entry["query"] for entry in entries])
+        return [(entry["query"], 200) for entry in entries]
+
+    def get_response(request, entry):
+        calls.append(entry["query"])
+        return entry["query"], 200
+
+    # when
+    with (
+        mock.patch.object(
+            view, "get_concurrent_responses", side_effect=get_concurrent_responses
+        ),
+        mock.patch.object(view, "get_response", side_effect=get_response),
+    ):
+        responses = view.get_batch_responses(request, data)
+
+    # then
+    assert [response for response, _ in responses] == [entry["query"] for entry in data]
+    assert calls == [
+        [data[0]["query"], data[1]["query"]],
+        data[2]["query"],
+        [data[3]["query"]],
+    ]
+
+
+@pytest.mark.parametrize(
+    ("query", "operation_name", "expected"),
+    [
+        ("query First { __typename }", None, True),
+        ("{ __typename }", None, True),
+        ('mutation { tokenVerify(token: "abc") { isValid } }', None, False),
+        (
+            "query First { __typename } "
+            'mutation Second { tokenVerify(token: "abc") { isValid } }',
+            "First",
+            True,
+        ),
+        (
+            "query First { __typename } "
+            'mutation Second { tokenVerify(token: "abc") { isValid } }',
+            "Second",
+            False,
+        ),
+        ("query First {", None, False),
+        (None, None, False),
+    ],
+)
+def test_is_read_only_operation(query, operation_name, expected, rf):
+    # given
+    request = rf.post(path="/", data={}, content_type="application/json")
+    view = GraphQLView(backend=backend, schema=schema)
+    data = {"query": query, "operationName": operation_name}
+
+    # when
+    result = view.is_read_only_operation(request, data)
+
+    # then
+    assert result is expected
+
+
+@override_settings(GRAPHQL_STREAMING_RESPONSE_ENABLED=True)
+def test_streaming_response(api_client, product_list, channel_USD):
+    # given
+    query = """
+        query ($channel: String) {
+            products(first: 10, channel: $channel) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+
+    # when
+    response = api_client.post_graphql(query, {"channel": channel_USD.slug})
+
+    # then
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    content = get_graphql_content(response)
+    assert {edge["node"]["name"] for edge in content["data"]["products"]["edges"]} == {
+        product.name for product in product_list
+    }
@@ -1,3 +1,4 @@
+import json
 from functools import reduce
 from operator import add, mul
 from typing import Any, Optional, Union, cast
@@ -11,17 +12,23 @@ from graphql import (
 )
 from graphql.execution.values import get_argument_values
 from graphql.language.ast import (
+    Document,
     Field,
     FragmentDefinition,
     FragmentSpread,
     InlineFragment,
+    ListValue,
+    ObjectValue,
     OperationDefinition,
+    Variable,
 )
 from graphql.type import GraphQLField
 from graphql.validation import validate
 from graphql.validation.rules.base import ValidationRule
 from graphql.validation.validation import ValidationContext
 
+from ....core.utils.cache import CacheDict
+
 CostAwareNode = Union[
     Field,
     FragmentDefinition,
@@ -32,6 +39,15 @@ CostAwareNode = Union[
 
 GraphQLFieldMap = dict[str, GraphQLField]
 
+QUERY_COST_CACHE_SIZE = 1000
+
+# Computed query costs keyed by the query and the values of the variables that
+# can change the cost.
+query_cost_cache = CacheDict(QUERY_COST_CACHE_SIZE)
+
+# Names of the variables that can change the cost, keyed by the query.
+cost_variables_cache = CacheDict(QUERY_COST_CACHE_SIZE)
+
 
 class CostValidator(ValidationRule):
     maximum_cost: int
@@ -283,6 +299,71 @@ def cost_validator(
     )
 
 
+def get_multiplier_argument_names(cost_map: dict[str, dict[str, Any]]) -> set[str]:
+    return {
+        multiplier.split(".")[0]
+        for type_fields in cost_map.values()
+        for field_cost in type_fields.values()
+        for multiplier in field_cost.get("multipliers", [])
+    }
+
+
+def _collect_variable_names(value_node, names: set[str]):
+    if isinstance(value_node, Variable):
+        names.add(value_node.name.value)
+    elif isinstance(value_node, ListValue):
+        for item in value_node.values:
+            _collect_variable_names(item, names)
+    elif isinstance(value_node, ObjectValue):
+        for object_field in value_node.fields:
+            _collect_variable_names(object_field.value, names)
+
+
+def get_cost_variable_names(
+    document_ast: Document, cost_map: dict[str, dict[str, Any]]
+) -> tuple[str, ...]:
+    """Return names of the variables that can change the query cost.
+
+    Only arguments used as cost multipliers affect the cost, so the variables
+    passed to them are the only ones that the computed cost depends on.
+    Arguments are matched by name, regardless of the type they are defined on.
+    """
+    argument_names = get_multiplier_argument_names(cost_map)
+    names: set[str] = set()
+    nodes: list[Any] = list(document_ast.definitions)
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, Field):
+            for argument in node.arguments or []:
+                if argument.name.value in argument_names:
+                    _collect_variable_names(argument.value, names)
+        selection_set = getattr(node, "selection_set", None)
+        if selection_set:
+            nodes.extend(selection_set.selections)
+    return tuple(sorted(names))
+
+
+def get_query_cost_cache_key(query, variables, cost_map, maximum_cost):
+    document_string = query.document_string
+    variable_names = cost_variables_cache.get(document_string)
+    if variable_names is None:
+        variable_names = get_cost_variable_names(query.document_ast, cost_map)
+        cost_variables_cache[document_string] = variable_names
+    variables = variables if isinstance(variables, dict) else {}
+    cost_variables = json.dumps(
+        {name: variables[name] for name in variable_names if name in variables},
+        default=str,
+        sort_keys=True,
+    )
+    return document_string, cost_variables, maximum_cost, id(cost_map)
+
+
+def _is_cacheable(errors) -> bool:
+    # Errors other than the exceeded cost can depend on the variables that are not
+    # part of the cache key, so such results are always recomputed.
+    return not errors or all(isinstance(error, QueryCostError) for error in errors)
+
+
 def validate_query_cost(
     schema,
     query,
@@ -290,6 +371,11 @@ def validate_query_cost(
     cost_map,
     maximum_cost,
 ):
+    key = get_query_cost_cache_key(query, variables, cost_map, maximum_cost)
+    cached_result = query_cost_cache.get(key)
+    if cached_result is not None:
+        return cached_result
+
     validator = cost_validator(
         maximum_cost,
         variables=variables,
@@ -300,6 +386,7 @@ def validate_query_cost(
         query.document_ast,
         [validator],  # type: ignore[list-item] # cost validator is an instance that pretends to be a class # noqa: E501
     )
-    if error:
-        return validator.cost, error
-    return validator.cost, None
+    result = (validator.cost, error or None)
+    if _is_cacheable(error):
+        query_cost_cache[key] = result
+    return result
@@ -88,6 +88,7 @@ from ..core.enums import LanguageCodeEnum
 from ..core.fields import PermissionsField
 from ..core.mutations import validation_error_to_error_type
 from ..core.scalars import DateTime, PositiveDecimal
+from ..core.select_related import RelatedField
 from ..core.tracing import traced_resolver
 from ..core.types import (
     BaseObjectType,
@@ -2497,6 +2498,8 @@ class Order(ModelObjectType[models.Order]):
 
 
 class OrderCountableConnection(CountableConnection):
+    related_fields = {"user": RelatedField("user", UserByUserIdLoader)}
+
     class Meta:
         doc_category = DOC_CATEGORY_ORDERS
         node = Order
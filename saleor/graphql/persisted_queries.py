@@ -0,0 +1,96 @@
+"""Support for automatic persisted queries (APQ).
+
+Clients may send only the SHA-256 hash of a query in
+`extensions.persistedQuery.sha256Hash`. If the server knows the hash, the stored
+query text is used; otherwise `PersistedQueryNotFound` is returned and the client
+retries with both the hash and the full query, which registers the query for the
+following requests.
+
+The hash to query mapping is kept in the shared Django cache so it is reused
+across processes, with a small in-process layer in front of it for the hottest
+operations. The parsed and validated document is served from the in-process
+document cache of the GraphQL backend.
+"""
+
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql.error import GraphQLError
+
+from .. import __version__ as saleor_version
+from ..core.utils.cache import CacheDict
+
+PERSISTED_QUERY_VERSION = 1
+
+local_persisted_queries = CacheDict(1000, max_size=10 * 1024 * 1024, get_size=len)
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class PersistedQueryError(GraphQLError):
+    pass
+
+
+def generate_persisted_query_cache_key(query_hash: str) -> str:
+    return f"apq-{saleor_version}-{query_hash}"
+
+
+def get_persisted_query_hash(extensions: Optional[dict]) -> Optional[str]:
+    """Return the query hash from request extensions or None if not provided.
+
+    Raise PersistedQueryError when the extension is malformed.
+    """
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if persisted_query is None:
+        return None
+    if not isinstance(persisted_query, dict):
+        raise PersistedQueryError("Invalid persisted query extension.")
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryError("Must provide a persisted query hash.")
+    return query_hash.lower()
+
+
+def resolve_persisted_query(query: Optional[str], query_hash: str) -> str:
+    """Return the query text matching the given hash.
+
+    When the query text is provided, it is verified against the hash and stored
+    for the following requests. Otherwise, the query is looked up in the cache.
+    """
+    if not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+        if query:
+            return query
+        raise PersistedQueryNotSupported()
+
+    key = generate_persisted_query_cache_key(query_hash)
+    if not query:
+        stored_query = local_persisted_queries.get(key)
+        if stored_query is None:
+            stored_query = cache.get(key)
+            if stored_query is None:
+                raise PersistedQueryNotFound()
+            local_persisted_queries[key] = stored_query
+        return stored_query
+
+    if not isinstance(query, str):
+        raise PersistedQueryError("Must provide a query string.")
+    if hashlib.sha256(query.encode("utf-8")).hexdigest() != query_hash:
+        raise PersistedQueryError("Provided sha256Hash does not match the query.")
+    if key not in local_persisted_queries:
+        cache.set(key, query, timeout=settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT)
+        local_persisted_queries[key] = query
+    return query
@@ -21,7 +21,11 @@ from ....product.models import (
     VariantMedia,
 )
 from ...channel.dataloaders import ChannelBySlugLoader
-from ...core.dataloaders import BaseThumbnailBySizeAndFormatLoader, DataLoader
+from ...core.dataloaders import (
+    BaseThumbnailBySizeAndFormatLoader,
+    DataLoader,
+    SharedCacheDataLoader,
+)
 
 ProductIdAndChannelSlug = tuple[int, str]
 VariantIdAndChannelSlug = tuple[int, str]
@@ -144,8 +148,9 @@ class ProductChannelListingByProductIdAndChannelSlugLoader(
         ]
 
 
-class ProductTypeByIdLoader(DataLoader[int, ProductType]):
+class ProductTypeByIdLoader(SharedCacheDataLoader[int, ProductType]):
     context_key = "product_type_by_id"
+    shared_cache_models = (ProductType,)
 
     def batch_load(self, keys):
         product_types = ProductType.objects.using(
@@ -75,6 +75,7 @@ from ...core.fields import (
     PermissionsField,
 )
 from ...core.scalars import Date, DateTime
+from ...core.select_related import RelatedField
 from ...core.tracing import traced_resolver
 from ...core.types import (
     BaseObjectType,
@@ -838,7 +839,17 @@ class ProductVariant(ChannelContextTypeWithMetadata[models.ProductVariant]):
         return [variants.get(root_id) for root_id in roots_ids]
 
 
+PRODUCT_RELATED_FIELDS = {
+    "category": RelatedField("category", CategoryByIdLoader),
+    "productType": RelatedField("product_type", ProductTypeByIdLoader),
+}
+
+
 class ProductVariantCountableConnection(CountableConnection):
+    related_fields = {
+        "product": RelatedField("product", ProductByIdLoader, PRODUCT_RELATED_FIELDS),
+    }
+
     class Meta:
         doc_category = DOC_CATEGORY_PRODUCTS
         node = ProductVariant
@@ -1633,6 +1644,8 @@ class Product(ChannelContextTypeWithMetadata[models.Product]):
 
 
 class ProductCountableConnection(CountableConnection):
+    related_fields = PRODUCT_RELATED_FIELDS
+
     class Meta:
         doc_category = DOC_CATEGORY_PRODUCTS
         node = Product
@@ -10,7 +10,7 @@ from ...tax.models import (
     TaxConfiguration,
     TaxConfigurationPerCountry,
 )
-from ..core.dataloaders import DataLoader
+from ..core.dataloaders import DataLoader, SharedCacheDataLoader
 from ..product.dataloaders import (
     ProductByIdLoader,
     ProductByVariantIdLoader,
@@ -70,8 +70,9 @@ class TaxClassDefaultRateByCountryLoader(DataLoader):
         return [tax_rates_map.get(key) for key in keys]
 
 
-class TaxClassByIdLoader(DataLoader):
+class TaxClassByIdLoader(SharedCacheDataLoader):
     context_key = "tax_class_by_id"
+    shared_cache_models = (TaxClass,)
 
     def batch_load(self, keys):
         tax_class_map = TaxClass.objects.using(self.database_connection_name).in_bulk(
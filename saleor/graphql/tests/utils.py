@@ -4,6 +4,8 @@ from django.core.serializers.json import DjangoJSONEncoder
 
 
 def get_graphql_content_from_response(response):
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content).decode("utf8"))
     return json.loads(response.content.decode("utf8"))
 
 
@@ -1,37 +1,70 @@
+import copy
 import hashlib
 import importlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from inspect import isclass
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 
 import opentracing
 import opentracing.tags
 from django.conf import settings
 from django.core.cache import cache
-from django.db import connection
+from django.db import close_old_connections, connection
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
+from django.utils import timezone
 from django.views.generic import View
 from graphql import GraphQLBackend, GraphQLDocument, GraphQLSchema
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.execution import ExecutionResult
+from graphql.language.ast import OperationDefinition
 from jwt.exceptions import PyJWTError
 from requests_hardened.ip_filter import InvalidIPAddress
 
 from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from ..core.utils.json_serializer import CustomJsonEncoder, StreamingJsonResponse
 from ..webhook import observability
 from .api import API_PATH, schema
-from .context import clear_context, get_context_value
+from .context import (
+    clear_context,
+    get_context_value,
+    get_user,
+    set_auth_on_context,
+)
+from .core import SaleorContext
 from .core.validators.query_cost import validate_query_cost
+from .persisted_queries import get_persisted_query_hash, resolve_persisted_query
 from .query_cost_map import COST_MAP
 from .utils import format_error, query_fingerprint, query_identifier
 from .utils.validators import check_if_query_contains_only_schema
 
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 
+# Header that enables reporting data loader usage in the response extensions.
+DATALOADER_STATS_HEADER = "HTTP_X_SALEOR_DEBUG_DATALOADERS"
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ThreadPoolExecutor(
+            max_workers=settings.GRAPHQL_BATCH_MAX_WORKERS,
+            thread_name_prefix="graphql-batch",
+        )
+    return _batch_executor
+
 
 def tracing_wrapper(execute, sql, params, many, context):
     conn: DatabaseWrapper = context["connection"]
@@ -61,6 +94,7 @@ class GraphQLView(View):
     middleware = None
     root_value = None
     backend: GraphQLBackend = None  # type: ignore[assignment]
+    json_encoder: type[json.JSONEncoder] = CustomJsonEncoder
 
     HANDLED_EXCEPTIONS = (
         GraphQLError,
@@ -127,7 +161,9 @@ class GraphQLView(View):
             },
         )
 
-    def _handle_query(self, request: HttpRequest) -> JsonResponse:
+    def _handle_query(
+        self, request: HttpRequest
+    ) -> Union[JsonResponse, StreamingHttpResponse]:
         try:
             data = self.parse_body(request)
         except ValueError:
@@ -137,16 +173,25 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            if settings.GRAPHQL_BATCH_PARALLEL_EXECUTION and len(data) > 1:
+                responses = self.get_batch_responses(request, data)
+            else:
+                responses = [self.get_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
             status_code = max((code for response, code in responses), default=200)
         else:
             result, status_code = self.get_response(request, data)
-        return JsonResponse(data=result, status=status_code, safe=False)
+        if settings.GRAPHQL_STREAMING_RESPONSE_ENABLED:
+            return StreamingJsonResponse(
+                data=result, encoder=self.json_encoder, status=status_code
+            )
+        return JsonResponse(
+            data=result, encoder=self.json_encoder, status=status_code, safe=False
+        )
 
-    def handle_query(self, request: HttpRequest) -> JsonResponse:
+    def handle_query(self, request: HttpRequest) -> HttpResponse:
         tracer = opentracing.global_tracer()
 
         # Disable extending spans from header due to:
@@ -194,8 +239,10 @@ class GraphQLView(View):
 
             # RFC2616: Content-Length is defined in bytes,
             # we can calculate the RAW UTF-8 size using the length of
-            # response.content of type 'bytes'
-            span.set_tag("http.content_length", len(response.content))
+            # response.content of type 'bytes'; the size of the streamed responses
+            # is not known until they are sent
+            if not response.streaming:
+                span.set_tag("http.content_length", len(response.content))
             with observability.report_api_call(request) as api_call:
                 api_call.response = response
                 api_call.report()
@@ -226,6 +273,103 @@ class GraphQLView(View):
             operation.result_invalid = execution_result.invalid
         return result, status_code
 
+    def get_batch_responses(
+        self, request: HttpRequest, data: list
+    ) -> list[tuple[Optional[dict[str, list[Any]]], int]]:
+        """Execute batched operations running consecutive queries concurrently.
+
+        Mutations and operations that can't be parsed are executed one by one in
+        the request thread, which keeps their order relative to the other
+        operations. Each concurrently executed query gets its own copy of the
+        request context and its own database connection.
+        """
+        responses: list[tuple[Optional[dict[str, list[Any]]], int]] = []
+        read_only_entries: list[dict] = []
+        for entry in data:
+            if self.is_read_only_operation(request, entry):
+                read_only_entries.append(entry)
+                continue
+            responses.extend(self.get_concurrent_responses(request, read_only_entries))
+            read_only_entries = []
+            responses.append(self.get_response(request, entry))
+        responses.extend(self.get_concurrent_responses(request, read_only_entries))
+        return responses
+
+    def get_concurrent_responses(self, request: HttpRequest, entries: list[dict]):
+        if len(entries) < 2:
+            return [self.get_response(request, entry) for entry in entries]
+
+        # Resolve the requestor once, before the request is copied for each thread.
+        context = get_context_value(request)
+        if not getattr(context, "app", None):
+            get_user(context)
+        futures = [
+            get_batch_executor().submit(
+                self.get_response_in_thread, self.copy_request(request), entry
+            )
+            for entry in entries
+        ]
+        responses = []
+        for future in futures:
+            response, gql_operation = future.result()
+            with observability.report_api_call(request) as api_call:
+                api_call.gql_operations.append(gql_operation)
+            responses.append(response)
+        return responses
+
+    def get_response_in_thread(self, request: HttpRequest, data: dict):
+        try:
+            with observability.report_gql_operation() as operation:
+                response = self.get_response(request, data)
+            return response, operation
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def copy_request(request: HttpRequest) -> HttpRequest:
+        """Return a copy of the request with its own context for a pool thread.
+
+        The data loaders, which also hold the plugins manager, and the requestor
+        instances are not shared with the other threads, as they are not thread-safe.
+        The requestor resolved for the request is copied, so it is not looked up again.
+        """
+        context = cast(SaleorContext, request)
+        context_copy = cast(SaleorContext, copy.copy(request))
+        context_copy.dataloaders = {}
+        context_copy.dataloaders_stats = None
+        context_copy.allow_replica = True
+        context_copy.request_time = timezone.now()
+        if getattr(context, "app", None):
+            context_copy.app = copy.copy(context.app)
+        if getattr(context, "_cached_user", None):
+            context_copy._cached_user = copy.copy(context._cached_user)
+        if getattr(context, "decoded_auth_token", None):
+            context_copy.decoded_auth_token = dict(context.decoded_auth_token)
+        set_auth_on_context(context_copy)
+        return context_copy
+
+    def is_read_only_operation(self, request: HttpRequest, data: dict) -> bool:
+        if not isinstance(data, dict):
+            return False
+        query, _, operation_name = self.get_graphql_params(request, data)
+        document, error = self.parse_query(query)
+        if error or document is None:
+            return False
+        operations = [
+            definition
+            for definition in document.document_ast.definitions
+            if isinstance(definition, OperationDefinition)
+        ]
+        if operation_name:
+            operations = [
+                operation
+                for operation in operations
+                if operation.name and operation.name.value == operation_name
+            ]
+        return bool(operations) and all(
+            operation.operation == "query" for operation in operations
+        )
+
     def get_root_value(self):
         return self.root_value
 
@@ -266,6 +410,13 @@ class GraphQLView(View):
 
             query, variables, operation_name = self.get_graphql_params(request, data)
 
+            try:
+                query_hash = get_persisted_query_hash(data.get("extensions"))
+                if query_hash:
+                    query = resolve_persisted_query(query, query_hash)
+            except GraphQLError as e:
+                return ExecutionResult(errors=[e], invalid=True)
+
             document, error = self.parse_query(query)
             with observability.report_gql_operation() as operation:
                 operation.query = document
@@ -303,6 +454,9 @@ class GraphQLView(View):
                 extra_options["executor"] = self.executor
 
             context = get_context_value(request)
+            context.dataloaders_stats = (
+                {} if self.should_collect_dataloaders_stats(request) else None
+            )
             if app := getattr(request, "app", None):
                 span.set_tag("app.id", app.id)
                 span.set_tag("app.name", app.name)
@@ -329,6 +483,10 @@ class GraphQLView(View):
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
 
+                    if context.dataloaders_stats is not None:
+                        set_dataloaders_stats_on_result(
+                            response, context.dataloaders_stats
+                        )
                     return set_query_cost_on_result(response, query_cost)
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
@@ -340,8 +498,15 @@ class GraphQLView(View):
                     e = GraphQLError(str(e))
                 return ExecutionResult(errors=[e], invalid=True)
             finally:
+                context.dataloaders_stats = None
                 clear_context(context)
 
+    @staticmethod
+    def should_collect_dataloaders_stats(request: HttpRequest) -> bool:
+        return settings.GRAPHQL_DATALOADER_STATS_ENABLED and bool(
+            request.META.get(DATALOADER_STATS_HEADER)
+        )
+
     @staticmethod
     def parse_body(request: HttpRequest):
         content_type = request.content_type
@@ -448,3 +613,13 @@ def set_query_cost_on_result(execution_result: ExecutionResult, query_cost):
             }
         )
     return execution_result
+
+
+def set_dataloaders_stats_on_result(execution_result: ExecutionResult, stats: dict):
+    execution_result.extensions = {
+        **(execution_result.extensions or {}),
+        "dataloaders": {
+            name: loader_stats.as_dict() for name, loader_stats in sorted(stats.items())
+        },
+    }
+    return execution_result
@@ -30,7 +30,7 @@ from ...warehouse.models import (
 )
 from ...warehouse.reservations import is_reservation_enabled
 from ..channel.dataloaders import ChannelBySlugLoader
-from ..core.dataloaders import DataLoader
+from ..core.dataloaders import DataLoader, SharedCacheDataLoader
 from ..shipping.dataloaders import (
     ShippingZonesByChannelIdLoader,
     ShippingZonesByCountryLoader,
@@ -654,8 +654,9 @@ class PreorderQuantityReservedByVariantChannelListingIdLoader(DataLoader[int, in
         return [reservations_by_listing_id[key] for key in keys]
 
 
-class WarehouseByIdLoader(DataLoader):
+class WarehouseByIdLoader(SharedCacheDataLoader):
     context_key = "warehouse_by_id"
+    shared_cache_models = (Warehouse,)
 
     def batch_load(self, keys: Iterable[UUID]) -> list[Optional[Warehouse]]:
         warehouses = (
@@ -7,6 +7,7 @@ from ....permission.auth_filters import AuthorizationFilters
 from ....permission.enums import AppPermission
 from ....webhook import models
 from ....webhook.error_codes import WebhookErrorCode
+from ....webhook.routing import invalidate_webhook_routing_table
 from ....webhook.validators import (
     HEADERS_LENGTH_LIMIT,
     HEADERS_NUMBER_LIMIT,
@@ -187,3 +188,4 @@ class WebhookCreate(ModelMutation, NotifyUserEventValidationMixin):
                 for event in events
             ]
         )
+        invalidate_webhook_routing_table()
@@ -1,3 +1,4 @@
+import hashlib
 from collections.abc import Iterable
 from datetime import datetime
 from typing import Any, Optional, Union
@@ -7,7 +8,7 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
-from graphql import get_default_backend, parse
+from graphql import GraphQLDocument
 from graphql.error import GraphQLError
 from promise import Promise
 
@@ -15,6 +16,7 @@ from ...account.models import User
 from ...app.models import App
 from ...core.exceptions import PermissionDenied
 from ...core.utils import get_domain
+from ...core.utils.cache import CacheDict
 from ...webhook.models import Webhook
 from ..core import SaleorContext
 from ..core.dataloaders import DataLoader
@@ -22,6 +24,11 @@ from ..utils import format_error
 
 logger = get_task_logger(__name__)
 
+# Parsed and validated subscription documents by the hash of the query. A changed
+# subscription query has a different hash, so outdated documents are never used and
+# are eventually evicted.
+subscription_documents = CacheDict(1000)
+
 
 def initialize_request(
     requestor=None,
@@ -65,6 +72,19 @@ def get_event_payload(event):
     return event
 
 
+def get_subscription_document(subscription_query: str) -> GraphQLDocument:
+    from ..api import SaleorGraphQLBackend, schema
+
+    key = hashlib.sha256(subscription_query.encode("utf-8")).hexdigest()
+    document = subscription_documents.get(key)
+    if document is None:
+        document = SaleorGraphQLBackend().document_from_string(
+            schema, subscription_query
+        )
+        subscription_documents[key] = document
+    return document
+
+
 def generate_payload_from_subscription(
     event_type: str,
     subscribable_object,
@@ -88,15 +108,9 @@ def generate_payload_from_subscription(
     return: A payload ready to send via webhook. None if the function was not able to
     generate a payload
     """
-    from ..api import schema
     from ..context import get_context_value
 
-    graphql_backend = get_default_backend()
-    ast = parse(subscription_query)
-    document = graphql_backend.document_from_string(
-        schema,
-        ast,
-    )
+    document = get_subscription_document(subscription_query)
     app_id = app.pk if app else None
     request.app = app
     results = document.execute(
@@ -164,19 +178,24 @@ def generate_pre_save_payloads(
         dataloaders=dataloaders,
     )
 
+    # Webhooks of the same app with identical queries get the same payloads.
+    payloads_by_query: dict[tuple[str, Optional[int], Any], Optional[dict]] = {}
+
     for webhook in webhooks:
         if not webhook.subscription_query:
             continue
 
         for instance in instances:
-            instance_payload = generate_payload_from_subscription(
-                event_type=event_type,
-                subscribable_object=instance,
-                subscription_query=webhook.subscription_query,
-                request=request,
-                app=webhook.app,
-            )
+            query_key = (webhook.subscription_query, webhook.app_id, instance.pk)
+            if query_key not in payloads_by_query:
+                payloads_by_query[query_key] = generate_payload_from_subscription(
+                    event_type=event_type,
+                    subscribable_object=instance,
+                    subscription_query=webhook.subscription_query,
+                    request=request,
+                    app=webhook.app,
+                )
             key = get_pre_save_payload_key(webhook, instance)
-            pre_save_payloads[key] = instance_payload
+            pre_save_payloads[key] = payloads_by_query[query_key]
 
     return pre_save_payloads
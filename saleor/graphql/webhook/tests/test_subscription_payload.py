@@ -6,7 +6,9 @@ from ....webhook.models import Webhook
 from ..subscription_payload import (
     generate_pre_save_payloads,
     get_pre_save_payload_key,
+    get_subscription_document,
     initialize_request,
+    subscription_documents,
 )
 
 
@@ -117,3 +119,47 @@ def test_generate_pre_save_payloads(webhook_app, variant):
     key = get_pre_save_payload_key(webhook, variant)
     assert key in pre_save_payloads
     assert pre_save_payloads[key]
+
+
+def test_get_subscription_document_cached():
+    # given
+    subscription_documents.clear()
+
+    document = get_subscription_document(SUBSCRIPTION_QUERY)
+    hits = subscription_documents.stats.hits
+
+    # when
+    cached_document = get_subscription_document(SUBSCRIPTION_QUERY)
+
+    # then
+    assert document is cached_document
+    assert subscription_documents.stats.hits == hits + 1
+    assert len(subscription_documents) == 1
+
+
+def test_get_subscription_document_for_changed_query():
+    # given
+    subscription_documents.clear()
+    document = get_subscription_document(SUBSCRIPTION_QUERY)
+    changed_query = SUBSCRIPTION_QUERY.replace("name", "id")
+
+    # when
+    changed_document = get_subscription_document(changed_query)
+
+    # then
+    assert changed_document is not document
+    assert changed_document.document_string == changed_query
+
+
+def test_get_subscription_document_invalid_query():
+    # given
+    subscription_documents.clear()
+    query = SUBSCRIPTION_QUERY.replace("name", "invalidField")
+
+    # when
+    document = get_subscription_document(query)
+
+    # then
+    result = document.execute(allow_subscriptions=True)
+    assert result.invalid
+    assert result.errors
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2024-07-01 10:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("order", "0188_merge_20240624_1308"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="order",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["created_at", "status", "id"],
+                name="order_created_at_keyset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="order",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["updated_at", "status", "id"],
+                name="order_updated_at_keyset_idx",
+            ),
+        ),
+    ]
@@ -376,6 +376,15 @@ class Order(ModelWithMetadata, ModelWithExternalReference):
                 fields=["user_email", "user_id"],
                 name="order_user_email_user_id_idx",
             ),
+            # Keyset pagination indexes for the `created_at` and `updated_at` sorting
+            BTreeIndex(
+                fields=["created_at", "status", "id"],
+                name="order_created_at_keyset_idx",
+            ),
+            BTreeIndex(
+                fields=["updated_at", "status", "id"],
+                name="order_updated_at_keyset_idx",
+            ),
         ]
 
     def is_fully_paid(self):
@@ -107,6 +107,7 @@ from ...webhook.transport.synchronous.transport import (
     trigger_all_webhooks_sync,
     trigger_webhook_sync,
     trigger_webhook_sync_if_not_cached,
+    trigger_webhooks_sync,
 )
 from ...webhook.transport.utils import (
     DEFAULT_TAX_CODE,
@@ -2914,19 +2915,18 @@ class WebhookPlugin(BasePlugin):
         if checkout_info:
             checkout = checkout_info.checkout
         event_type = WebhookEventSyncType.PAYMENT_LIST_GATEWAYS
-        webhooks = get_webhooks_for_event(event_type)
-        for webhook in webhooks:
-            if not webhook:
-                raise PaymentError(f"No payment webhook found for event: {event_type}.")
-
-            response_data = trigger_webhook_sync(
+        webhooks = list(get_webhooks_for_event(event_type))
+        responses = []
+        if webhooks:
+            responses = trigger_webhooks_sync(
                 event_type=event_type,
                 payload=generate_list_gateways_payload(currency, checkout),
-                webhook=webhook,
+                webhooks=webhooks,
                 allow_replica=False,
                 subscribable_object=checkout,
                 requestor=self.requestor,
             )
+        for webhook, response_data in zip(webhooks, responses):
             if response_data:
                 app_gateways = parse_list_payment_gateways_response(
                     response_data, webhook.app
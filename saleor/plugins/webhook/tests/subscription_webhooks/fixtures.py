@@ -381,6 +381,13 @@ def subscription_product_created_webhook(subscription_webhook):
     )
 
 
+@pytest.fixture
+def subscription_product_updated_with_details_webhook(subscription_webhook):
+    return subscription_webhook(
+        queries.PRODUCT_UPDATED_WITH_DETAILS, WebhookEventAsyncType.PRODUCT_UPDATED
+    )
+
+
 @pytest.fixture
 def subscription_product_deleted_webhook(subscription_webhook):
     return subscription_webhook(
@@ -494,6 +501,13 @@ def subscription_order_updated_webhook(subscription_webhook):
     )
 
 
+@pytest.fixture
+def subscription_order_created_with_details_webhook(subscription_webhook):
+    return subscription_webhook(
+        queries.ORDER_CREATED_WITH_DETAILS, WebhookEventAsyncType.ORDER_CREATED
+    )
+
+
 @pytest.fixture
 def subscription_order_confirmed_webhook(subscription_webhook):
     return subscription_webhook(
@@ -4,6 +4,7 @@ from graphene.utils.str_converters import to_snake_case
 
 from .....graphql.tests.queries import fragments
 from .....graphql.webhook.subscription_types import TRANSLATIONS_TYPES_MAP
+from .....webhook import subscription_queries as representative_queries
 
 ACCOUNT_CONFIRMATION_REQUESTED = (
     fragments.CUSTOMER_DETAILS
@@ -950,6 +951,10 @@ PRODUCT_CREATED = """
     }
 """
 
+PRODUCT_CREATED_WITH_DETAILS = representative_queries.PRODUCT_CREATED
+
+PRODUCT_UPDATED_WITH_DETAILS = representative_queries.PRODUCT_UPDATED
+
 PRODUCT_DELETED = """
     subscription{
       event{
@@ -1143,6 +1148,10 @@ ORDER_UPDATED = """
     }
 """
 
+ORDER_CREATED_WITH_DETAILS = representative_queries.ORDER_CREATED
+
+ORDER_UPDATED_WITH_DETAILS = representative_queries.ORDER_UPDATED
+
 ORDER_CONFIRMED = """
     subscription{
       event{
@@ -1214,6 +1214,27 @@ def test_product_updated(product, subscription_product_updated_webhook):
     assert deliveries[0].webhook == webhooks[0]
 
 
+def test_product_updated_with_details(
+    product, subscription_product_updated_with_details_webhook
+):
+    # given
+    webhooks = [subscription_product_updated_with_details_webhook]
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    variant = product.variants.get()
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    payload = json.loads(deliveries[0].payload.payload)["product"]
+    assert payload["id"] == graphene.Node.to_global_id("Product", product.id)
+    assert payload["name"] == product.name
+    assert payload["category"]["name"] == product.category.name
+    assert payload["variants"][0]["sku"] == variant.sku
+    assert payload["variants"][0]["channelListings"]
+    assert payload["channelListings"]
+
+
 def test_product_deleted(product, subscription_product_deleted_webhook):
     webhooks = [subscription_product_deleted_webhook]
     event_type = WebhookEventAsyncType.PRODUCT_DELETED
@@ -1445,6 +1466,26 @@ def test_order_created(order, subscription_order_created_webhook):
     assert deliveries[0].webhook == webhooks[0]
 
 
+def test_order_created_with_details(
+    order_with_lines, subscription_order_created_with_details_webhook
+):
+    # given
+    order = order_with_lines
+    webhooks = [subscription_order_created_with_details_webhook]
+    event_type = WebhookEventAsyncType.ORDER_CREATED
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, order, webhooks)
+
+    # then
+    payload = json.loads(deliveries[0].payload.payload)["order"]
+    assert payload["id"] == graphene.Node.to_global_id("Order", order.id)
+    assert payload["userEmail"] == order.user_email
+    assert len(payload["lines"]) == order.lines.count()
+    assert payload["total"]["gross"]["amount"] == float(order.total_gross_amount)
+    assert payload["billingAddress"]["city"] == order.billing_address.city
+
+
 def test_order_confirmed(order, subscription_order_confirmed_webhook):
     webhooks = [subscription_order_confirmed_webhook]
     event_type = WebhookEventAsyncType.ORDER_CONFIRMED
@@ -2922,18 +2963,18 @@ def test_create_deliveries_for_subscriptions_unsubscribable_event(
     assert len(deliveries) == 0
 
 
-@patch("saleor.graphql.webhook.subscription_payload.get_default_backend")
+@patch("saleor.graphql.webhook.subscription_payload.get_subscription_document")
 @patch.object(logger, "info")
 def test_create_deliveries_for_subscriptions_document_executed_with_error(
     mocked_task_logger,
-    mocked_backend,
+    mocked_get_document,
     product,
     subscription_product_updated_webhook,
 ):
     # given
     webhooks = [subscription_product_updated_webhook]
     event_type = WebhookEventAsyncType.ORDER_CREATED
-    mocked_backend.document_from_string.execute.errors = "errors"
+    mocked_get_document.return_value.execute.return_value.errors = "errors"
     # when
     deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
     # then
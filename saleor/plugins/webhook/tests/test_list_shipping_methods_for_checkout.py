@@ -2,6 +2,7 @@ from datetime import timedelta
 from decimal import Decimal
 from unittest import mock
 
+from django.conf import settings
 from django.utils import timezone
 
 from ....webhook.event_types import WebhookEventSyncType
@@ -182,8 +183,9 @@ def test_checkout_change_invalidates_cache_key(
     mocked_cache_get.assert_called_once_with(new_cache_key)
     mocked_cache_set.assert_called_once_with(
         new_cache_key,
-        mocked_webhook_response,
-        timeout=CACHE_TIME_SHIPPING_LIST_METHODS_FOR_CHECKOUT,
+        (mock.ANY, mocked_webhook_response),
+        timeout=CACHE_TIME_SHIPPING_LIST_METHODS_FOR_CHECKOUT
+        + settings.WEBHOOK_SYNC_CACHE_STALE_TIMEOUT,
     )
 
 
@@ -239,6 +241,7 @@ def test_ignore_selected_fields_on_generating_cache_key(
     mocked_cache_get.assert_called_once_with(new_cache_key)
     mocked_cache_set.assert_called_once_with(
         new_cache_key,
-        mocked_webhook_response,
-        timeout=CACHE_TIME_SHIPPING_LIST_METHODS_FOR_CHECKOUT,
+        (mock.ANY, mocked_webhook_response),
+        timeout=CACHE_TIME_SHIPPING_LIST_METHODS_FOR_CHECKOUT
+        + settings.WEBHOOK_SYNC_CACHE_STALE_TIMEOUT,
     )
@@ -2,6 +2,7 @@ import json
 from unittest import mock
 
 import graphene
+from django.conf import settings
 
 from ....core.models import EventDelivery
 from ....payment.interface import ListStoredPaymentMethodsRequestData
@@ -77,8 +78,9 @@ def test_list_stored_payment_methods_with_static_payload(
     mocked_cache_get.assert_called_once_with(expected_cache_key)
     mocked_cache_set.assert_called_once_with(
         expected_cache_key,
-        webhook_list_stored_payment_methods_response,
-        timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
+        (mock.ANY, webhook_list_stored_payment_methods_response),
+        timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT
+        + settings.WEBHOOK_SYNC_CACHE_STALE_TIMEOUT,
     )
 
     assert response
@@ -231,8 +233,9 @@ def test_list_stored_payment_methods_with_subscription_payload(
     mocked_cache_get.assert_called_once_with(expected_cache_key)
     mocked_cache_set.assert_called_once_with(
         expected_cache_key,
-        webhook_list_stored_payment_methods_response,
-        timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
+        (mock.ANY, webhook_list_stored_payment_methods_response),
+        timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT
+        + settings.WEBHOOK_SYNC_CACHE_STALE_TIMEOUT,
     )
 
     assert response
@@ -3,6 +3,7 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.conf import settings
 
 from ....core.models import EventDelivery
 from ....payment import TokenizedPaymentFlow
@@ -479,9 +480,13 @@ def test_expected_result_invalidates_cache_for_app(
     mocked_cache_get.assert_called_once_with(expected_cache_key)
     mocked_cache_set.assert_called_once_with(
         expected_cache_key,
-        list_stored_payment_methods_response,
-        timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
+        (mock.ANY, list_stored_payment_methods_response),
+        timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT
+        + settings.WEBHOOK_SYNC_CACHE_STALE_TIMEOUT,
     )
+    # the lock of the request is released
+    mocked_cache_delete.assert_called_once_with(f"{expected_cache_key}:lock")
+    mocked_cache_delete.reset_mock()
 
     # when
     response = plugin.payment_method_initialize_tokenization(
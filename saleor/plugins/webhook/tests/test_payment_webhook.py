@@ -279,7 +279,7 @@ def test_send_webhook_request_sync_invalid_scheme(webhook, app):
         send_webhook_request_sync(delivery)
 
 
-@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_requests_sync")
 def test_get_payment_gateways(
     mock_send_request, payment_app, permission_manage_payments, webhook_plugin
 ):
@@ -308,7 +308,7 @@ def test_get_payment_gateways(
             "config": [],
         }
     ]
-    mock_send_request.return_value = mock_json_response
+    mock_send_request.return_value = [mock_json_response, mock_json_response]
     response_data = plugin.get_payment_gateways("USD", None, None, None)
     expected_response_1 = parse_list_payment_gateways_response(
         mock_json_response, payment_app
@@ -319,6 +319,8 @@ def test_get_payment_gateways(
     assert len(response_data) == 2
     assert response_data[0] == expected_response_1[0]
     assert response_data[1] == expected_response_2[0]
+    ((deliveries,), _) = mock_send_request.call_args
+    assert len(deliveries) == 2
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
@@ -379,7 +381,7 @@ def test_get_payment_gateways_with_transactions_and_app_without_identifier(
     assert len(response_data) == 0
 
 
-@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_requests_sync")
 def test_get_payment_gateways_multiple_webhooks_in_the_same_app(
     mock_send_request, payment_app, permission_manage_payments, webhook_plugin
 ):
@@ -406,7 +408,7 @@ def test_get_payment_gateways_multiple_webhooks_in_the_same_app(
             "config": [],
         }
     ]
-    mock_send_request.return_value = mock_json_response
+    mock_send_request.return_value = [mock_json_response, mock_json_response]
 
     # when
     response_data = plugin.get_payment_gateways("USD", None, None, None)
@@ -421,6 +423,8 @@ def test_get_payment_gateways_multiple_webhooks_in_the_same_app(
     assert len(response_data) == 2
     assert response_data[0] == expected_response_1[0]
     assert response_data[1] == expected_response_2[0]
+    ((deliveries,), _) = mock_send_request.call_args
+    assert len(deliveries) == 2
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
@@ -68,7 +68,7 @@ CHECKOUT_QUERY_SHIPPING_METHOD = """
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin.generate_excluded_shipping_methods_for_order_payload"
 )
@@ -86,14 +86,16 @@ def test_excluded_shipping_methods_for_order(
     shipping_app = shipping_app_factory()
     webhook_reason = "Order contains dangerous products."
     other_reason = "Shipping is not applicable for this order."
-    mocked_webhook.return_value = {
-        "excluded_methods": [
-            {
-                "id": graphene.Node.to_global_id("ShippingMethod", "1"),
-                "reason": webhook_reason,
-            }
-        ]
-    }
+    mocked_webhook.return_value = [
+        {
+            "excluded_methods": [
+                {
+                    "id": graphene.Node.to_global_id("ShippingMethod", "1"),
+                    "reason": webhook_reason,
+                }
+            ]
+        }
+    ]
     payload = mock.MagicMock()
     mocked_payload.return_value = payload
     plugin = webhook_plugin()
@@ -117,13 +119,16 @@ def test_excluded_shipping_methods_for_order(
     assert other_reason in em.reason
     event_type = WebhookEventSyncType.ORDER_FILTER_SHIPPING_METHODS
     mocked_webhook.assert_called_once_with(
-        WebhookEventSyncType.ORDER_FILTER_SHIPPING_METHODS,
+        event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        mock.ANY,
         False,
         subscribable_object=order_with_lines,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
+    assert list(mocked_webhook.call_args.args[2]) == [
+        shipping_app.webhooks.get(events__event_type=event_type)
+    ]
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(order_with_lines.id)
 
     expected_excluded_shipping_method = [{"id": "1", "reason": webhook_reason}]
@@ -136,7 +141,7 @@ def test_excluded_shipping_methods_for_order(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin.generate_excluded_shipping_methods_for_order_payload"
 )
@@ -156,7 +161,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_order(
     webhook_reason = "Order contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this order."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -199,22 +204,18 @@ def test_multiple_app_with_excluded_shipping_methods_for_order(
     assert webhook_reason in em.reason
     assert webhook_second_reason in em.reason
     event_type = WebhookEventSyncType.ORDER_FILTER_SHIPPING_METHODS
-    mocked_webhook.assert_any_call(
+    mocked_webhook.assert_called_once_with(
         event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        mock.ANY,
         False,
         subscribable_object=order_with_lines,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
-    mocked_webhook.assert_any_call(
-        event_type,
-        payload,
+    assert list(mocked_webhook.call_args.args[2]) == [
+        shipping_app.webhooks.get(events__event_type=event_type),
         second_shipping_app.webhooks.get(events__event_type=event_type),
-        False,
-        subscribable_object=order_with_lines,
-        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-    )
+    ]
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(order_with_lines.id)
 
     expected_excluded_shipping_method = [
@@ -231,7 +232,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_order(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin.generate_excluded_shipping_methods_for_order_payload"
 )
@@ -263,7 +264,7 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_or
     webhook_reason = "Order contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this order."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -307,15 +308,15 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_or
     assert webhook_second_reason in em.reason
     webhooks = shipping_app.webhooks.filter(events__event_type=event_type)
     assert len(webhooks) > 1
-    for webhook in webhooks:
-        mocked_webhook.assert_any_call(
-            event_type,
-            payload,
-            webhook,
-            False,
-            subscribable_object=order_with_lines,
-            timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-        )
+    mocked_webhook.assert_called_once_with(
+        event_type,
+        payload,
+        mock.ANY,
+        False,
+        subscribable_object=order_with_lines,
+        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
+    )
+    assert set(mocked_webhook.call_args.args[2]) == set(webhooks)
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(order_with_lines.id)
 
@@ -530,7 +531,7 @@ def test_trigger_webhook_sync(mock_request, shipping_app):
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin."
     "generate_excluded_shipping_methods_for_checkout_payload"
@@ -550,14 +551,16 @@ def test_excluded_shipping_methods_for_checkout_webhook(
     webhook_reason = "Checkout contains dangerous products."
     other_reason = "Shipping is not applicable for this checkout."
 
-    mocked_webhook.return_value = {
-        "excluded_methods": [
-            {
-                "id": graphene.Node.to_global_id("ShippingMethod", "1"),
-                "reason": webhook_reason,
-            }
-        ]
-    }
+    mocked_webhook.return_value = [
+        {
+            "excluded_methods": [
+                {
+                    "id": graphene.Node.to_global_id("ShippingMethod", "1"),
+                    "reason": webhook_reason,
+                }
+            ]
+        }
+    ]
     payload = mock.MagicMock()
     mocked_payload.return_value = payload
     plugin = webhook_plugin()
@@ -582,11 +585,14 @@ def test_excluded_shipping_methods_for_checkout_webhook(
     mocked_webhook.assert_called_once_with(
         event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        mock.ANY,
         False,
         subscribable_object=checkout_with_items,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
+    assert list(mocked_webhook.call_args.args[2]) == [
+        shipping_app.webhooks.get(events__event_type=event_type)
+    ]
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(checkout_with_items.token)
 
@@ -645,7 +651,7 @@ def test_excluded_shipping_methods_for_checkout(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin."
     "generate_excluded_shipping_methods_for_checkout_payload"
@@ -666,7 +672,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_checkout(
     webhook_reason = "Checkout contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this checkout."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -708,22 +714,18 @@ def test_multiple_app_with_excluded_shipping_methods_for_checkout(
     assert webhook_reason in em.reason
     assert webhook_second_reason in em.reason
     event_type = WebhookEventSyncType.CHECKOUT_FILTER_SHIPPING_METHODS
-    mocked_webhook.assert_any_call(
+    mocked_webhook.assert_called_once_with(
         event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        mock.ANY,
         False,
         subscribable_object=checkout_with_items,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
-    mocked_webhook.assert_any_call(
-        event_type,
-        payload,
+    assert list(mocked_webhook.call_args.args[2]) == [
+        shipping_app.webhooks.get(events__event_type=event_type),
         second_shipping_app.webhooks.get(events__event_type=event_type),
-        False,
-        subscribable_object=checkout_with_items,
-        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-    )
+    ]
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(checkout_with_items.token)
 
@@ -741,7 +743,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_checkout(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin."
     "generate_excluded_shipping_methods_for_checkout_payload"
@@ -774,7 +776,7 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_ch
     webhook_reason = "Checkout contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this checkout."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -817,15 +819,15 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_ch
     assert webhook_second_reason in em.reason
     webhooks = shipping_app.webhooks.filter(events__event_type=event_type)
     assert len(webhooks) > 1
-    for webhook in webhooks:
-        mocked_webhook.assert_any_call(
-            event_type,
-            payload,
-            webhook,
-            False,
-            subscribable_object=checkout_with_items,
-            timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-        )
+    mocked_webhook.assert_called_once_with(
+        event_type,
+        payload,
+        mock.ANY,
+        False,
+        subscribable_object=checkout_with_items,
+        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
+    )
+    assert set(mocked_webhook.call_args.args[2]) == set(webhooks)
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(checkout_with_items.token)
 
@@ -900,7 +902,7 @@ def test_generate_excluded_shipping_methods_for_checkout_payload(
 
 
 @mock.patch("saleor.webhook.transport.shipping.parse_excluded_shipping_methods")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.webhook.transport.shipping.get_excluded_shipping_methods_from_response"
 )
@@ -671,6 +671,16 @@ EVENT_PAYLOAD_DELETE_PERIOD = timedelta(
 EVENT_PAYLOAD_DELETE_TASK_TIME_LIMIT = timedelta(
     seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_TASK_TIME_LIMIT", "1 hour"))
 )
+# Outdated event data is deleted in buckets of rows created within this period.
+EVENT_PAYLOAD_DELETE_BUCKET_PERIOD = timedelta(
+    seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_BUCKET_PERIOD", "1 hour"))
+)
+# Event payloads larger than this number of bytes after compression are saved in
+# the default storage instead of the database. Set to 0 to keep all payloads in
+# the database.
+EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE = int(
+    os.environ.get("EVENT_PAYLOAD_STORAGE_OFFLOAD_SIZE", 0)
+)
 # Time between marking app "to remove" and removing the app from the database.
 # App is not visible for the user after removing, but it still exists in the database.
 # Saleor needs time to process sending `APP_DELETED` webhook and possible retrying,
@@ -693,6 +703,12 @@ OBSERVABILITY_BUFFER_SIZE_LIMIT = int(
 OBSERVABILITY_BUFFER_BATCH_SIZE = int(
     os.environ.get("OBSERVABILITY_BUFFER_BATCH_SIZE", 100)
 )
+# Interval (sec) of putting the observability events collected by the process into
+# the buffer by a background thread. When 0, the events are put into the buffer by
+# the request reporting them.
+OBSERVABILITY_BUFFER_FLUSH_INTERVAL = parse(
+    os.environ.get("OBSERVABILITY_BUFFER_FLUSH_INTERVAL", "0.5 seconds")
+)
 OBSERVABILITY_REPORT_PERIOD = timedelta(
     seconds=parse(os.environ.get("OBSERVABILITY_REPORT_PERIOD", "20 seconds"))
 )
@@ -752,6 +768,42 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
 )
 
+# Enable automatic persisted queries: clients may send a sha256 hash of the query
+# instead of the full query text. Known queries are stored in the cache for
+# GRAPHQL_PERSISTED_QUERIES_TIMEOUT.
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", False
+)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", "7 days")
+)
+
+# Execute queries sent in a single batched request concurrently. Mutations are
+# still executed one by one, in the order in which they were sent.
+GRAPHQL_BATCH_PARALLEL_EXECUTION = get_bool_from_env(
+    "GRAPHQL_BATCH_PARALLEL_EXECUTION", False
+)
+GRAPHQL_BATCH_MAX_WORKERS = int(os.environ.get("GRAPHQL_BATCH_MAX_WORKERS", 4))
+
+# Time in seconds for which the values of the reference data loaders (channels,
+# attributes, product types, tax classes and warehouses) are shared between
+# requests. Set to 0 to disable sharing.
+DATALOADER_SHARED_CACHE_TIMEOUT = int(
+    os.environ.get("DATALOADER_SHARED_CACHE_TIMEOUT", 0)
+)
+
+# Allow clients to request data loader usage stats (batches, keys and SQL time per
+# loader) in the response extensions with the `X-Saleor-Debug-Dataloaders` header.
+GRAPHQL_DATALOADER_STATS_ENABLED = get_bool_from_env(
+    "GRAPHQL_DATALOADER_STATS_ENABLED", DEBUG
+)
+
+# Write GraphQL responses to the client in chunks instead of serializing the whole
+# result into memory first. Recommended for large admin queries.
+GRAPHQL_STREAMING_RESPONSE_ENABLED = get_bool_from_env(
+    "GRAPHQL_STREAMING_RESPONSE_ENABLED", False
+)
+
 # Max number entities that can be requested in single query by Apollo Federation
 # Federation protocol implements no securities on its own part - malicious actor
 # may build a query that requests for potentially few thousands of entities.
@@ -945,6 +997,96 @@ COMMON_REQUESTS_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 WEBHOOK_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 WEBHOOK_SYNC_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 
+# Maximum number of sync webhook requests of a single event, like listing payment
+# gateways or filtering shipping methods, sent to the apps at the same time.
+WEBHOOK_SYNC_MAX_CONCURRENT_REQUESTS = int(
+    os.environ.get("WEBHOOK_SYNC_MAX_CONCURRENT_REQUESTS", 10)
+)
+
+# Time for which the cached responses of sync webhooks, like lists of shipping methods
+# or stored payment methods, are still returned after they expire, while a single
+# worker requests the new response from the app.
+WEBHOOK_SYNC_CACHE_STALE_TIMEOUT = parse(
+    os.environ.get("WEBHOOK_SYNC_CACHE_STALE_TIMEOUT", "1 minute")
+)
+
+# Send async webhooks with a dispatcher task that picks up pending deliveries in
+# batches instead of scheduling a separate task for each delivery. Requests to
+# the same host reuse connections; hosts are handled concurrently by up to
+# WEBHOOK_BATCH_DELIVERY_MAX_WORKERS threads. Failed deliveries are retried with
+# the regular per-delivery task.
+WEBHOOK_BATCH_DELIVERY_ENABLED = get_bool_from_env(
+    "WEBHOOK_BATCH_DELIVERY_ENABLED", False
+)
+WEBHOOK_BATCH_DELIVERY_SIZE = int(os.environ.get("WEBHOOK_BATCH_DELIVERY_SIZE", 500))
+WEBHOOK_BATCH_DELIVERY_MAX_WORKERS = int(
+    os.environ.get("WEBHOOK_BATCH_DELIVERY_MAX_WORKERS", 10)
+)
+# Time the dispatcher waits after a webhook is triggered, to collect more
+# deliveries in a single batch.
+WEBHOOK_BATCH_DELIVERY_DELAY = parse(
+    os.environ.get("WEBHOOK_BATCH_DELIVERY_DELAY", "1 second")
+)
+# Period of the dispatcher run picking up deliveries that were not sent.
+WEBHOOK_BATCH_DELIVERY_PERIOD = timedelta(
+    seconds=parse(os.environ.get("WEBHOOK_BATCH_DELIVERY_PERIOD", "1 minute"))
+)
+# Time after which the deliveries claimed by a dispatcher that didn't finish, for
+# example because its worker was killed, are sent again. It has to be longer than
+# sending a whole batch to a single host takes.
+WEBHOOK_BATCH_DELIVERY_STALE_TIMEOUT = parse(
+    os.environ.get("WEBHOOK_BATCH_DELIVERY_STALE_TIMEOUT", "1 hour")
+)
+if WEBHOOK_BATCH_DELIVERY_ENABLED:
+    CELERY_BEAT_SCHEDULE["send-pending-webhook-requests"] = {
+        "task": "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_batch_task",  # noqa
+        "schedule": WEBHOOK_BATCH_DELIVERY_PERIOD,
+        "options": {"expires": WEBHOOK_BATCH_DELIVERY_PERIOD.total_seconds()},
+    }
+
+# Track the health of webhook target URLs in the cache. After
+# WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD failed requests within
+# WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW, deliveries to the target are postponed
+# for WEBHOOK_CIRCUIT_BREAKER_COOLDOWN without sending the requests. Each
+# postponement counts as a retry of the delivery.
+WEBHOOK_CIRCUIT_BREAKER_ENABLED = get_bool_from_env(
+    "WEBHOOK_CIRCUIT_BREAKER_ENABLED", False
+)
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 20)
+)
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW", "1 minute")
+)
+WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_COOLDOWN", "30 seconds")
+)
+# Max number of concurrent async webhook requests to a single target URL. It's
+# lowered proportionally when the average response time of the target exceeds
+# WEBHOOK_TARGET_LATENCY_THRESHOLD seconds. Applies when the circuit breaker is
+# enabled.
+WEBHOOK_TARGET_MAX_IN_FLIGHT = int(os.environ.get("WEBHOOK_TARGET_MAX_IN_FLIGHT", 20))
+WEBHOOK_TARGET_LATENCY_THRESHOLD = float(
+    os.environ.get("WEBHOOK_TARGET_LATENCY_THRESHOLD", 2)
+)
+# Max number of times a delivery is postponed because of the limit of requests in
+# flight, before it's marked as failed.
+WEBHOOK_TARGET_MAX_POSTPONEMENTS = int(
+    os.environ.get("WEBHOOK_TARGET_MAX_POSTPONEMENTS", 100)
+)
+
+# Webhooks subscribed to the events are found with an in-memory routing table that is
+# rebuilt when webhooks, apps or app permissions change. Each process rebuilds its
+# table at least once per this period. Set to 0 to query the database for each event.
+WEBHOOK_ROUTING_TABLE_TIMEOUT = parse(
+    os.environ.get("WEBHOOK_ROUTING_TABLE_TIMEOUT", "1 minute")
+)
+# Max time after which processes notice the changes of webhooks made by other
+# processes.
+WEBHOOK_ROUTING_TABLE_VERSION_CHECK_INTERVAL = parse(
+    os.environ.get("WEBHOOK_ROUTING_TABLE_VERSION_CHECK_INTERVAL", "1 second")
+)
+
 # The max number of rules with order_predicate defined
 ORDER_RULES_LIMIT = os.environ.get("ORDER_RULES_LIMIT", 100)
 
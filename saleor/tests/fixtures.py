@@ -19,6 +19,7 @@ from django.contrib.sites.models import Site
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
+from django.db.models import F
 from django.template.defaultfilters import truncatechars
 from django.test.utils import CaptureQueriesContext as BaseCaptureQueriesContext
 from django.utils import timezone
@@ -164,6 +165,7 @@ from ..warehouse.models import (
 from ..webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
 from ..webhook.models import Webhook, WebhookEvent
 from ..webhook.observability import WebhookData
+from ..webhook.routing import local_routing_table
 from ..webhook.transport.utils import WebhookResponse, to_payment_app_id
 from .utils import dummy_editorjs
 
@@ -378,6 +380,18 @@ def setup_dummy_gateways(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def _reset_webhook_routing_table():
+    """Build the webhook routing table from the data of each test.
+
+    The routing table is kept by the process, so it would be shared between tests
+    and the queries building it would be counted in a random test.
+    """
+    local_routing_table.reset()
+    yield
+    local_routing_table.reset()
+
+
 @pytest.fixture
 def _sample_gateway(settings):
     settings.PLUGINS += [
@@ -4665,7 +4679,7 @@ def order_line_with_one_allocation(
         order_line=order_line, stock=stocks[0], quantity_allocated=1
     )
     stock = stocks[0]
-    stock.quantity_allocated = 1
+    stock.quantity_allocated = F("quantity_allocated") + 1
     stock.save(update_fields=["quantity_allocated"])
 
     return order_line
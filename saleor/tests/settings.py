@@ -52,6 +52,7 @@ PASSWORD_HASHERS = ["saleor.tests.dummy_password_hasher.DummyHasher"]
 
 OBSERVABILITY_ACTIVE = False
 OBSERVABILITY_REPORT_ALL_API_CALLS = False
+OBSERVABILITY_BUFFER_FLUSH_INTERVAL = 0
 
 PLUGINS = []
 
@@ -7,7 +7,6 @@ from uuid import UUID
 from django.db import transaction
 from django.db.models import F, Sum
 from django.db.models.expressions import Exists, OuterRef
-from django.db.models.functions import Coalesce
 
 from ..channel import AllocationStrategy
 from ..checkout.models import CheckoutLine
@@ -87,27 +86,24 @@ def allocate_stocks(
         stocks.select_for_update(of=("self",))
         .filter(**filter_lookup)
         .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
+        .values(
+            "product_variant",
+            "pk",
+            "quantity",
+            "quantity_allocated",
+            "quantity_reserved",
+            "warehouse_id",
+        )
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
 
     quantity_reservation_for_stocks: dict = _prepare_stock_to_reserved_quantity_map(
-        checkout_lines, check_reservations, stocks_id
-    )
-
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        checkout_lines, check_reservations, stocks
     )
     quantity_allocation_for_stocks: dict = defaultdict(int)
-    for allocation_data in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
-            "quantity_allocated_sum"
-        ]
+    for stock_data in stocks:
+        quantity_allocation_for_stocks[stock_data["pk"]] = max(
+            stock_data.pop("quantity_allocated"), 0
+        )
 
     stocks = sort_stocks(
         channel.allocation_strategy,
@@ -150,40 +146,76 @@ def allocate_stocks(
         Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
 
         for allocation in allocations:
-            allocated_stock = (
-                Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
-                    Sum("quantity_allocated")
-                )["quantity_allocated__sum"]
-                or 0
+            quantity_allocation_for_stocks[allocation.stock_id] += (
+                allocation.quantity_allocated
             )
+        for allocation in allocations:
+            allocated_stock = quantity_allocation_for_stocks[allocation.stock_id]
             if not max(allocation.stock.quantity - allocated_stock, 0):
                 transaction.on_commit(
                     lambda: manager.product_variant_out_of_stock(allocation.stock)
                 )
 
 
-def _prepare_stock_to_reserved_quantity_map(
-    checkout_lines, check_reservations, stocks_id
-):
-    """Prepare stock id to quantity reserved map for provided stock ids."""
+def _prepare_stock_to_reserved_quantity_map(checkout_lines, check_reservations, stocks):
+    """Prepare stock id to quantity reserved map for provided stocks."""
+    if not check_reservations:
+        for stock_data in stocks:
+            stock_data.pop("quantity_reserved")
+        return defaultdict(int)
+    return get_reserved_quantity_for_stocks(stocks, checkout_lines)
+
+
+def get_reserved_quantity_for_stocks(
+    stocks: list[dict],
+    checkout_lines: Optional[Iterable["CheckoutLine"]],
+    *,
+    delete_expired: bool = True,
+) -> dict[int, int]:
+    """Return the quantity reserved in the stocks by other checkouts than given.
+
+    The stocks have to contain the `pk` and `quantity_reserved` values, the latter
+    is popped from them. As `Stock.quantity_reserved` includes the expired
+    reservations until they are deleted, the expired reservations of the stocks are
+    deleted first, unless `delete_expired` is disabled; the stocks have to be locked
+    for update then.
+    """
     quantity_reservation_for_stocks: dict = defaultdict(int)
+    for stock_data in stocks:
+        quantity_reservation_for_stocks[stock_data["pk"]] = stock_data.pop(
+            "quantity_reserved"
+        )
+    stocks_id = list(quantity_reservation_for_stocks.keys())
+    if not stocks_id:
+        return quantity_reservation_for_stocks
+
+    deleted_count = 0
+    if delete_expired:
+        deleted_count, _ = (
+            Reservation.objects.filter(stock_id__in=stocks_id).expired().delete()
+        )
+    if deleted_count:
+        quantity_reservation_for_stocks.update(
+            Stock.objects.filter(pk__in=stocks_id).values_list(
+                "pk", "quantity_reserved"
+            )
+        )
 
-    if check_reservations:
-        quantity_reservation = (
+    if checkout_lines:
+        checkout_lines_reservations = (
             Reservation.objects.filter(
-                stock_id__in=stocks_id,
+                stock_id__in=stocks_id, checkout_line__in=checkout_lines
             )
-            .not_expired()
-            .exclude_checkout_lines(checkout_lines or [])
             .values("stock")
-            .annotate(
-                quantity_reserved=Coalesce(Sum("quantity_reserved"), 0),
-            )
+            .annotate(quantity_reserved_sum=Sum("quantity_reserved"))
         )
-        for reservation in quantity_reservation:
-            quantity_reservation_for_stocks[reservation["stock"]] += reservation[
-                "quantity_reserved"
+        for reservation in checkout_lines_reservations:
+            quantity_reservation_for_stocks[reservation["stock"]] -= reservation[
+                "quantity_reserved_sum"
             ]
+
+    for stock_id, quantity_reserved in quantity_reservation_for_stocks.items():
+        quantity_reservation_for_stocks[stock_id] = max(quantity_reserved, 0)
     return quantity_reservation_for_stocks
 
 
@@ -0,0 +1,111 @@
+# Generated by Django 3.2.25 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+# Reservations are removed with their checkout lines by cascade, so the counter is
+# maintained by statement level triggers, which see every change of the reservations.
+# The stocks are locked in the order of their ids, like in `reserve_stocks`, before
+# they are updated, as the update itself doesn't lock the rows in any given order.
+CREATE_TRIGGERS = """
+CREATE FUNCTION warehouse_stock_quantity_reserved_update() RETURNS trigger AS $$
+begin
+  IF TG_OP = 'INSERT' THEN
+    PERFORM 1 FROM warehouse_stock
+    WHERE id IN (SELECT stock_id FROM new_reservations)
+    ORDER BY id FOR UPDATE;
+    UPDATE warehouse_stock stock
+    SET quantity_reserved = stock.quantity_reserved + changes.quantity
+    FROM (
+      SELECT stock_id, SUM(quantity_reserved) AS quantity
+      FROM new_reservations GROUP BY stock_id
+    ) changes
+    WHERE stock.id = changes.stock_id;
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM 1 FROM warehouse_stock
+    WHERE id IN (SELECT stock_id FROM old_reservations)
+    ORDER BY id FOR UPDATE;
+    UPDATE warehouse_stock stock
+    SET quantity_reserved = stock.quantity_reserved - changes.quantity
+    FROM (
+      SELECT stock_id, SUM(quantity_reserved) AS quantity
+      FROM old_reservations GROUP BY stock_id
+    ) changes
+    WHERE stock.id = changes.stock_id;
+  ELSE
+    PERFORM 1 FROM warehouse_stock
+    WHERE id IN (
+      SELECT stock_id FROM new_reservations
+      UNION
+      SELECT stock_id FROM old_reservations
+    )
+    ORDER BY id FOR UPDATE;
+    UPDATE warehouse_stock stock
+    SET quantity_reserved = stock.quantity_reserved + changes.quantity
+    FROM (
+      SELECT stock_id, SUM(quantity) AS quantity
+      FROM (
+        SELECT stock_id, quantity_reserved AS quantity FROM new_reservations
+        UNION ALL
+        SELECT stock_id, -quantity_reserved AS quantity FROM old_reservations
+      ) reservations
+      GROUP BY stock_id
+      HAVING SUM(quantity) <> 0
+    ) changes
+    WHERE stock.id = changes.stock_id;
+  END IF;
+  RETURN NULL;
+end
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER warehouse_reservation_insert
+    AFTER INSERT ON warehouse_reservation
+    REFERENCING NEW TABLE AS new_reservations
+    FOR EACH STATEMENT EXECUTE FUNCTION warehouse_stock_quantity_reserved_update();
+
+CREATE TRIGGER warehouse_reservation_update
+    AFTER UPDATE ON warehouse_reservation
+    REFERENCING OLD TABLE AS old_reservations NEW TABLE AS new_reservations
+    FOR EACH STATEMENT EXECUTE FUNCTION warehouse_stock_quantity_reserved_update();
+
+CREATE TRIGGER warehouse_reservation_delete
+    AFTER DELETE ON warehouse_reservation
+    REFERENCING OLD TABLE AS old_reservations
+    FOR EACH STATEMENT EXECUTE FUNCTION warehouse_stock_quantity_reserved_update();
+
+UPDATE warehouse_stock stock
+SET quantity_reserved = reservations.quantity
+FROM (
+  SELECT stock_id, SUM(quantity_reserved) AS quantity
+  FROM warehouse_reservation GROUP BY stock_id
+) reservations
+WHERE stock.id = reservations.stock_id;
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS warehouse_reservation_insert ON warehouse_reservation;
+DROP TRIGGER IF EXISTS warehouse_reservation_update ON warehouse_reservation;
+DROP TRIGGER IF EXISTS warehouse_reservation_delete ON warehouse_reservation;
+DROP FUNCTION IF EXISTS warehouse_stock_quantity_reserved_update();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0033_warehouse_external_reference"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="quantity_reserved",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["stock", "reserved_until"],
+                name="warehouse_r_stock_i_3fa125_idx",
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+    ]
@@ -381,6 +381,9 @@ class Stock(models.Model):
     )
     quantity = models.IntegerField(default=0)
     quantity_allocated = models.IntegerField(default=0)
+    # Sum of the reservations of the stock, including the expired ones until they
+    # are deleted, maintained by a database trigger on the reservation changes.
+    quantity_reserved = models.IntegerField(default=0)
 
     objects = StockManager()
 
@@ -473,6 +476,9 @@ class ReservationQuerySet(models.QuerySet[T]):
     def not_expired(self):
         return self.filter(reserved_until__gt=timezone.now())
 
+    def expired(self):
+        return self.filter(reserved_until__lte=timezone.now())
+
     def exclude_checkout_lines(self, checkout_lines: Optional[Iterable[CheckoutLine]]):
         if checkout_lines:
             return self.exclude(checkout_line__in=checkout_lines)
@@ -535,5 +541,6 @@ class Reservation(models.Model):
         unique_together = [["checkout_line", "stock"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            models.Index(fields=["stock", "reserved_until"]),
         ]
         ordering = ("pk",)
@@ -1,23 +1,28 @@
+import logging
 from collections import defaultdict, namedtuple
 from collections.abc import Iterable
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Optional
 
 from django.conf import settings
+from django.db import OperationalError, transaction
 from django.db.models import F, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from ..channel import ReservationStrategy
 from ..core.exceptions import InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
 from ..product.models import ProductVariant, ProductVariantChannelListing
-from .management import sort_stocks
-from .models import Allocation, PreorderReservation, Reservation, Stock
+from .management import get_reserved_quantity_for_stocks, sort_stocks
+from .models import PreorderReservation, Reservation, Stock, StockQuerySet
 
 if TYPE_CHECKING:
     from ..channel.models import Channel
     from ..checkout.fetch import CheckoutLine
 
+logger = logging.getLogger(__name__)
+
 StockData = namedtuple("StockData", ["pk", "quantity"])
 
 
@@ -102,53 +107,126 @@ def reserve_stocks(
     if not checkout_lines:
         return
 
-    stocks = list(
-        Stock.objects.select_for_update(of=("self",))
-        .get_variants_stocks_for_country(country_code, channel.slug, variants)
-        .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
+    if channel.reservation_strategy == ReservationStrategy.OPTIMISTIC:
+        if _reserve_stocks_optimistically(
+            checkout_lines,
+            variants,
+            variants_map,
+            country_code,
+            channel,
+            reserved_until,
+            replace=replace,
+        ):
+            return
+
+    stocks = Stock.objects.select_for_update(
+        of=("self",)
+    ).get_variants_stocks_for_country(country_code, channel.slug, variants)
+    insufficient_stocks, reservations = _prepare_stock_reservations(
+        stocks, checkout_lines, variants_map, channel, reserved_until
+    )
+    if insufficient_stocks:
+        raise InsufficientStock(insufficient_stocks)
+
+    if reservations:
+        _save_stock_reservations(checkout_lines, reservations, replace=replace)
+
+
+def _reserve_stocks_optimistically(
+    checkout_lines: Iterable["CheckoutLine"],
+    variants: Iterable["ProductVariant"],
+    variants_map: dict[int, "ProductVariant"],
+    country_code: str,
+    channel: "Channel",
+    reserved_until: datetime,
+    *,
+    replace: bool,
+) -> bool:
+    """Reserve stocks for given `checkout_lines` without locking the stocks first.
+
+    The reservations are calculated from the stock counters read without a lock.
+    Saving them updates the reserved quantity of the stocks, so the stocks are
+    checked once more afterwards. When they were reserved by other checkouts in
+    the meantime, or are reported as insufficient, which might be caused by not yet
+    deleted expired reservations, nothing is reserved and `False` is returned.
+
+    The counters are updated in the order of stock ids, but deleting the replaced
+    reservations and creating the new ones lock the stocks in separate statements,
+    so a deadlock is still possible. The reservation then falls back to locking the
+    stocks as well.
+    """
+    stocks = Stock.objects.get_variants_stocks_for_country(
+        country_code, channel.slug, variants
+    )
+    insufficient_stocks, reservations = _prepare_stock_reservations(
+        stocks,
+        checkout_lines,
+        variants_map,
+        channel,
+        reserved_until,
+        delete_expired=False,
     )
-    stocks_id = [stock.pop("id") for stock in stocks]
+    if insufficient_stocks:
+        return False
+    if not reservations:
+        return True
+
+    try:
+        with transaction.atomic():
+            _save_stock_reservations(checkout_lines, reservations, replace=replace)
+            reserved = not Stock.objects.filter(
+                pk__in={reservation.stock_id for reservation in reservations},
+                quantity__lt=F("quantity_allocated") + F("quantity_reserved"),
+            ).exists()
+            if not reserved:
+                transaction.set_rollback(True)
+    except OperationalError:
+        logger.warning(
+            "Optimistic stock reservation failed, falling back to locking the stocks.",
+            exc_info=True,
+        )
+        return False
+    return reserved
+
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
+def _prepare_stock_reservations(
+    stocks: StockQuerySet,
+    checkout_lines: Iterable["CheckoutLine"],
+    variants_map: dict[int, "ProductVariant"],
+    channel: "Channel",
+    reserved_until: datetime,
+    *,
+    delete_expired: bool = True,
+) -> tuple[list[InsufficientStockData], list[Reservation]]:
+    stocks_data = list(
+        stocks.order_by("pk").values(
+            "product_variant",
+            "pk",
+            "quantity",
+            "quantity_allocated",
+            "quantity_reserved",
+            "warehouse_id",
         )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
     )
+
     quantity_allocation_for_stocks: dict = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated_sum"
-        ]
-
-    quantity_reservation_list = list(
-        Reservation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_reserved__gt=0,
+    for stock_data in stocks_data:
+        quantity_allocation_for_stocks[stock_data["pk"]] = max(
+            stock_data.pop("quantity_allocated"), 0
         )
-        .not_expired()
-        .exclude_checkout_lines(checkout_lines)
-        .values("stock")
-        .annotate(quantity_reserved_sum=Sum("quantity_reserved"))
+    quantity_reservation_for_stocks = get_reserved_quantity_for_stocks(
+        stocks_data, checkout_lines, delete_expired=delete_expired
     )
-    quantity_reservation_for_stocks: dict = defaultdict(int)
-    for reservation in quantity_reservation_list:
-        quantity_reservation_for_stocks[reservation["stock"]] += reservation[
-            "quantity_reserved_sum"
-        ]
 
-    stocks = sort_stocks(
+    stocks_data = sort_stocks(
         channel.allocation_strategy,
-        stocks,
+        stocks_data,
         channel,
         quantity_allocation_for_stocks,
     )
 
     variant_to_stocks: dict[int, list[StockData]] = defaultdict(list)
-    for stock_data in stocks:
+    for stock_data in stocks_data:
         variant = stock_data.pop("product_variant")
         variant_to_stocks[variant].append(StockData(**stock_data))
 
@@ -166,14 +244,18 @@ def reserve_stocks(
             reserved_until,
         )
         reservations.extend(reserved_items)
+    return insufficient_stocks, reservations
 
-    if insufficient_stocks:
-        raise InsufficientStock(insufficient_stocks)
 
-    if reservations:
-        if replace:
-            Reservation.objects.filter(checkout_line__in=checkout_lines).delete()
-        Reservation.objects.bulk_create(reservations)
+def _save_stock_reservations(
+    checkout_lines: Iterable["CheckoutLine"],
+    reservations: list[Reservation],
+    *,
+    replace: bool,
+):
+    if replace:
+        Reservation.objects.filter(checkout_line__in=checkout_lines).delete()
+    Reservation.objects.bulk_create(reservations)
 
 
 def _create_stock_reservations(
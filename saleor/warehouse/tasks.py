@@ -1,5 +1,6 @@
 from celery.utils.log import get_task_logger
-from django.db.models import F, Sum
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum, Value
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
@@ -8,6 +9,8 @@ from .models import Allocation, PreorderReservation, Reservation, Stock
 
 task_logger = get_task_logger(__name__)
 
+UPDATE_STOCKS_BATCH_SIZE = 1000
+
 
 @app.task
 def delete_empty_allocations_task():
@@ -33,27 +36,100 @@ def delete_expired_reservations_task():
         )
 
 
+def _filter_mismatched_stocks(stocks):
+    allocations_quantity = (
+        Allocation.objects.filter(stock=OuterRef("pk"))
+        .values("stock")
+        .annotate(quantity=Sum("quantity_allocated"))
+        .values("quantity")
+    )
+    reservations_quantity = (
+        Reservation.objects.filter(stock=OuterRef("pk"))
+        .values("stock")
+        .annotate(quantity=Sum("quantity_reserved"))
+        .values("quantity")
+    )
+    return stocks.annotate(
+        allocations_allocated=Coalesce(Subquery(allocations_quantity), Value(0)),
+        reservations_reserved=Coalesce(Subquery(reservations_quantity), Value(0)),
+    ).filter(
+        ~Q(quantity_allocated=F("allocations_allocated"))
+        | ~Q(quantity_reserved=F("reservations_reserved"))
+    )
+
+
 @app.task
 def update_stocks_quantity_allocated_task():
-    stocks_to_update = []
-    for mismatched_stock in Stock.objects.annotate(
-        allocations_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
-    ).exclude(quantity_allocated=F("allocations_allocated")):
-        allocations_allocated = getattr(
-            mismatched_stock, "allocations_allocated"
-        )  # annotation
-        task_logger.info(
-            "Mismatch updating quantity_allocated: stock %d had "
-            "%d allocated, but should have %d.",
-            mismatched_stock.pk,
-            mismatched_stock.quantity_allocated,
-            allocations_allocated,
-        )
-        mismatched_stock.quantity_allocated = allocations_allocated
-        stocks_to_update.append(mismatched_stock)
+    """Correct the drift of the allocated and reserved quantity counters of stocks.
+
+    The counters of the mismatched stocks are recalculated in batches, with the
+    stocks locked in the order of their ids, like when the stocks are allocated or
+    reserved, so the counters can't change in the meantime.
+    """
+    mismatched_stocks_pks = list(
+        _filter_mismatched_stocks(Stock.objects.all())
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    corrected_count = 0
+    for index in range(0, len(mismatched_stocks_pks), UPDATE_STOCKS_BATCH_SIZE):
+        batch_pks = mismatched_stocks_pks[index : index + UPDATE_STOCKS_BATCH_SIZE]
+        with transaction.atomic():
+            locked_pks = list(
+                Stock.objects.select_for_update()
+                .filter(pk__in=batch_pks)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            # the counters are recalculated after locking, as they might have changed
+            mismatched_stocks = _filter_mismatched_stocks(
+                Stock.objects.filter(pk__in=locked_pks)
+            ).values_list(
+                "pk",
+                "quantity_allocated",
+                "allocations_allocated",
+                "quantity_reserved",
+                "reservations_reserved",
+            )
+            stocks_to_update = []
+            for (
+                stock_pk,
+                quantity_allocated,
+                allocations_allocated,
+                quantity_reserved,
+                reservations_reserved,
+            ) in mismatched_stocks:
+                if quantity_allocated != allocations_allocated:
+                    task_logger.info(
+                        "Mismatch updating quantity_allocated: stock %d had "
+                        "%d allocated, but should have %d.",
+                        stock_pk,
+                        quantity_allocated,
+                        allocations_allocated,
+                    )
+                if quantity_reserved != reservations_reserved:
+                    task_logger.info(
+                        "Mismatch updating quantity_reserved: stock %d had "
+                        "%d reserved, but should have %d.",
+                        stock_pk,
+                        quantity_reserved,
+                        reservations_reserved,
+                    )
+                stocks_to_update.append(
+                    Stock(
+                        pk=stock_pk,
+                        quantity_allocated=allocations_allocated,
+                        quantity_reserved=reservations_reserved,
+                    )
+                )
+            Stock.objects.bulk_update(
+                stocks_to_update, ["quantity_allocated", "quantity_reserved"]
+            )
+        corrected_count += len(stocks_to_update)
 
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
     task_logger.info(
-        "Finished updating quantity_allocated on stocks, %d were corrected.",
-        len(stocks_to_update),
+        "Finished updating quantity_allocated and quantity_reserved on stocks, "
+        "%d were corrected.",
+        corrected_count,
     )
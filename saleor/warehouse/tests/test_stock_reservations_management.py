@@ -1,13 +1,19 @@
 from datetime import timedelta
+from unittest.mock import DEFAULT, patch
 
 import pytest
+from django.db import OperationalError
 from django.utils import timezone
 
-from ...channel import AllocationStrategy
+from ...channel import AllocationStrategy, ReservationStrategy
 from ...checkout.models import Checkout
 from ...core.exceptions import InsufficientStock
 from ..models import ChannelWarehouse, Reservation, Stock, Warehouse
-from ..reservations import reserve_stocks
+from ..reservations import (
+    _prepare_stock_reservations,
+    _save_stock_reservations,
+    reserve_stocks,
+)
 
 COUNTRY_CODE = "US"
 RESERVATION_LENGTH = 5
@@ -294,3 +300,246 @@ def test_stock_reservation_accounts_for_order_allocations_and_reservations(
             channel_USD,
             timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
         )
+
+
+def test_stock_quantity_reserved_maintained_on_reservation_changes(
+    checkout_line, channel_USD
+):
+    # given
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    reservation = Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=3,
+        reserved_until=timezone.now() + timedelta(hours=1),
+    )
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 3
+
+    # when
+    Reservation.objects.filter(pk=reservation.pk).update(quantity_reserved=5)
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
+
+    # when
+    # the reservations are removed with the checkout line
+    checkout_line.delete()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 0
+
+
+def test_stock_reservation_skips_and_deletes_expired_reservations(
+    checkout_line, checkout, channel_USD
+):
+    # given
+    variant = checkout_line.variant
+    stock = Stock.objects.get(product_variant=variant)
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+
+    other_checkout_line = checkout.lines.create(quantity=5, variant=variant)
+    expired_reservation = Reservation.objects.create(
+        checkout_line=other_checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() - timedelta(minutes=1),
+    )
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # then
+    assert not Reservation.objects.filter(pk=expired_reservation.pk).exists()
+    assert Reservation.objects.get(checkout_line=checkout_line).quantity_reserved == 5
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
+
+
+def test_stock_reservation_excludes_reserved_quantity_of_the_checkout_lines(
+    checkout_line, channel_USD
+):
+    # given
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=3,
+        reserved_until=timezone.now() + timedelta(hours=1),
+    )
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # then
+    assert Reservation.objects.get(checkout_line=checkout_line).quantity_reserved == 5
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
+
+
+def test_reserve_stocks_optimistic_strategy_doesnt_lock_stocks(
+    checkout_line, channel_USD, capture_queries
+):
+    # given
+    channel_USD.reservation_strategy = ReservationStrategy.OPTIMISTIC
+    channel_USD.save(update_fields=["reservation_strategy"])
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+
+    # when
+    with capture_queries() as ctx:
+        reserve_stocks(
+            [checkout_line],
+            [checkout_line.variant],
+            COUNTRY_CODE,
+            channel_USD,
+            timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+        )
+
+    # then
+    assert not any("FOR UPDATE" in query["sql"] for query in ctx.captured_queries)
+    reservation = Reservation.objects.get(checkout_line=checkout_line, stock=stock)
+    assert reservation.quantity_reserved == 5
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
+
+
+def test_reserve_stocks_optimistic_strategy_reserved_concurrently(
+    checkout_line, checkout, channel_USD
+):
+    # given
+    channel_USD.reservation_strategy = ReservationStrategy.OPTIMISTIC
+    channel_USD.save(update_fields=["reservation_strategy"])
+    variant = checkout_line.variant
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+    stock = Stock.objects.get(product_variant=variant)
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+    other_checkout_line = checkout.lines.create(quantity=3, variant=variant)
+
+    def prepare_stock_reservations(*args, **kwargs):
+        result = _prepare_stock_reservations(*args, **kwargs)
+        # other checkout reserves the stock after the stocks were read
+        if not Reservation.objects.filter(checkout_line=other_checkout_line):
+            Reservation.objects.create(
+                checkout_line=other_checkout_line,
+                stock=stock,
+                quantity_reserved=3,
+                reserved_until=timezone.now() + timedelta(hours=1),
+            )
+        return result
+
+    # when
+    with patch(
+        "saleor.warehouse.reservations._prepare_stock_reservations",
+        side_effect=prepare_stock_reservations,
+    ):
+        with pytest.raises(InsufficientStock):
+            reserve_stocks(
+                [checkout_line],
+                [variant],
+                COUNTRY_CODE,
+                channel_USD,
+                timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+            )
+
+    # then
+    assert not Reservation.objects.filter(checkout_line=checkout_line).exists()
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 3
+
+
+def test_reserve_stocks_optimistic_strategy_with_expired_reservations(
+    checkout_line, checkout, channel_USD
+):
+    # given
+    channel_USD.reservation_strategy = ReservationStrategy.OPTIMISTIC
+    channel_USD.save(update_fields=["reservation_strategy"])
+    variant = checkout_line.variant
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+    stock = Stock.objects.get(product_variant=variant)
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+    Reservation.objects.create(
+        checkout_line=checkout.lines.create(quantity=5, variant=variant),
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() - timedelta(minutes=1),
+    )
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # then
+    # the reservation falls back to locking the stocks, which removes the expired
+    # reservations
+    reservation = Reservation.objects.get()
+    assert reservation.checkout_line == checkout_line
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
+
+
+def test_reserve_stocks_optimistic_strategy_falls_back_on_deadlock(
+    checkout_line, channel_USD
+):
+    # given
+    channel_USD.reservation_strategy = ReservationStrategy.OPTIMISTIC
+    channel_USD.save(update_fields=["reservation_strategy"])
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+
+    # when
+    with patch(
+        "saleor.warehouse.reservations._save_stock_reservations",
+        side_effect=[OperationalError("deadlock detected"), DEFAULT],
+        wraps=_save_stock_reservations,
+    ) as mocked_save_stock_reservations:
+        reserve_stocks(
+            [checkout_line],
+            [checkout_line.variant],
+            COUNTRY_CODE,
+            channel_USD,
+            timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+        )
+
+    # then
+    assert mocked_save_stock_reservations.call_count == 2
+    reservation = Reservation.objects.get(checkout_line=checkout_line, stock=stock)
+    assert reservation.quantity_reserved == 5
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
@@ -1,9 +1,11 @@
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
+from django.db.models import F
 from django.utils import timezone
 
-from ..models import PreorderReservation, Reservation
+from ..models import PreorderReservation, Reservation, Stock
 from ..tasks import (
     delete_expired_reservations_task,
     update_stocks_quantity_allocated_task,
@@ -85,3 +87,40 @@ def test_update_stocks_quantity_allocated_task_stock_without_allocations(stock):
 
     stock.refresh_from_db()
     assert stock.quantity_allocated == 0
+
+
+def test_update_stocks_quantity_allocated_task_corrects_quantity_reserved(
+    checkout_line_with_reservation_in_many_stocks,
+):
+    # given
+    stocks = Stock.objects.filter(reservations__isnull=False)
+    expected = {stock.pk: stock.quantity_reserved for stock in stocks}
+    # the counter drifts when it's changed without the reservations
+    stocks.update(quantity_reserved=100)
+
+    # when
+    update_stocks_quantity_allocated_task()
+
+    # then
+    assert dict(stocks.values_list("pk", "quantity_reserved")) == expected
+    assert sum(expected.values()) == sum(
+        Reservation.objects.values_list("quantity_reserved", flat=True)
+    )
+
+
+@patch("saleor.warehouse.tasks.UPDATE_STOCKS_BATCH_SIZE", 1)
+def test_update_stocks_quantity_allocated_task_in_batches(
+    checkout_line_with_reservation_in_many_stocks,
+):
+    # given
+    stocks = Stock.objects.filter(reservations__isnull=False)
+    expected = {stock.pk: stock.quantity_reserved for stock in stocks}
+    assert len(expected) > 1
+    stocks.update(quantity_reserved=100, quantity_allocated=F("quantity_allocated") + 1)
+
+    # when
+    update_stocks_quantity_allocated_task()
+
+    # then
+    assert dict(stocks.values_list("pk", "quantity_reserved")) == expected
+    assert not stocks.filter(quantity_allocated__gt=0).exists()
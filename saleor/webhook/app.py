@@ -0,0 +1,28 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class WebhookAppConfig(AppConfig):
+    name = "saleor.webhook"
+
+    def ready(self):
+        from ..app.models import App
+        from .models import Webhook, WebhookEvent
+        from .signals import invalidate_routing_table, invalidate_routing_table_on_m2m
+
+        for model in [App, Webhook, WebhookEvent]:
+            post_save.connect(
+                invalidate_routing_table,
+                sender=model,
+                dispatch_uid=f"invalidate_routing_table_{model.__name__}_save",
+            )
+            post_delete.connect(
+                invalidate_routing_table,
+                sender=model,
+                dispatch_uid=f"invalidate_routing_table_{model.__name__}_delete",
+            )
+        m2m_changed.connect(
+            invalidate_routing_table_on_m2m,
+            sender=App.permissions.through,
+            dispatch_uid="invalidate_routing_table_app_permissions",
+        )
@@ -0,0 +1,240 @@
+import random
+import statistics
+import threading
+import time
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from ....app.models import App
+from ....celeryconf import app as celery_app
+from ....order.models import Order
+from ....permission.enums import OrderPermissions, ProductPermissions, get_permissions
+from ....product.models import Product
+from ...event_types import WebhookEventAsyncType
+from ...models import Webhook
+from ...subscription_queries import (
+    ORDER_CREATED,
+    ORDER_UPDATED,
+    PRODUCT_CREATED,
+    PRODUCT_UPDATED,
+)
+from ...transport.asynchronous.transport import trigger_webhooks_async
+from ...utils import get_webhooks_for_event
+
+# event type: (model, subscription query, permission)
+BENCHMARK_EVENTS = {
+    WebhookEventAsyncType.PRODUCT_CREATED: (
+        Product,
+        PRODUCT_CREATED,
+        ProductPermissions.MANAGE_PRODUCTS,
+    ),
+    WebhookEventAsyncType.PRODUCT_UPDATED: (
+        Product,
+        PRODUCT_UPDATED,
+        ProductPermissions.MANAGE_PRODUCTS,
+    ),
+    WebhookEventAsyncType.ORDER_CREATED: (
+        Order,
+        ORDER_CREATED,
+        OrderPermissions.MANAGE_ORDERS,
+    ),
+    WebhookEventAsyncType.ORDER_UPDATED: (
+        Order,
+        ORDER_UPDATED,
+        OrderPermissions.MANAGE_ORDERS,
+    ),
+}
+
+
+class BenchmarkReceiver(ThreadingHTTPServer):
+    """Local HTTP server standing in for the apps receiving the webhooks."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int, latency: float, error_rate: float):
+        super().__init__(("127.0.0.1", port), BenchmarkRequestHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.event_started_at: Optional[float] = None
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def record_request(self) -> bool:
+        """Record the request latency and return whether it should fail."""
+        with self.lock:
+            if self.event_started_at is not None:
+                self.latencies.append(time.monotonic() - self.event_started_at)
+            failed = random.random() < self.error_rate
+            self.errors += failed
+        return failed
+
+
+class BenchmarkRequestHandler(BaseHTTPRequestHandler):
+    server: BenchmarkReceiver
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        failed = self.server.record_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        # failures are returned with 400, as the retries of 5xx responses would be
+        # sent immediately by the eagerly executed tasks
+        self.send_response(400 if failed else 200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the throughput of async webhook deliveries. Generates events with "
+        "subscription webhooks of a temporary app and delivers them to a local HTTP "
+        "receiver, executing the Celery tasks in the process. Reports deliveries per "
+        "second, end-to-end latencies and database queries per delivery."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=100,
+            help="Number of events to generate.",
+        )
+        parser.add_argument(
+            "--event-type",
+            choices=list(BENCHMARK_EVENTS),
+            default=WebhookEventAsyncType.PRODUCT_UPDATED,
+            help="Type of events to generate.",
+        )
+        parser.add_argument(
+            "--webhooks",
+            type=int,
+            default=1,
+            help="Number of webhooks subscribed to the events.",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Number of seconds the receiver waits before responding.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests the receiver responds to with an error.",
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=0,
+            help="Port of the receiver, a free port is used by default.",
+        )
+
+    def handle(self, **options):
+        if (
+            settings.HTTP_IP_FILTER_ENABLED
+            and not settings.HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS
+        ):
+            raise CommandError(
+                "Requests to the local receiver are blocked. Set "
+                "HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS=True to run the benchmark."
+            )
+        if not 0 <= options["error_rate"] <= 1:
+            raise CommandError("The error rate must be between 0 and 1.")
+
+        event_type = options["event_type"]
+        model, subscription_query, permission = BENCHMARK_EVENTS[event_type]
+        subscribable_object = model.objects.order_by("pk").first()
+        if subscribable_object is None:
+            raise CommandError(
+                f"No {model._meta.verbose_name} to generate the events for. "
+                "Populate the database first."
+            )
+
+        receiver = BenchmarkReceiver(
+            options["port"], options["latency"], options["error_rate"]
+        )
+        threading.Thread(target=receiver.serve_forever, daemon=True).start()
+        app = App.objects.create(name="Webhook benchmark", is_active=True)
+        try:
+            app.permissions.set(get_permissions([permission.value]))
+            for i in range(options["webhooks"]):
+                webhook = Webhook.objects.create(
+                    name=f"Webhook benchmark {i}",
+                    app=app,
+                    target_url=receiver.url,
+                    subscription_query=subscription_query,
+                )
+                webhook.events.create(event_type=event_type)
+            self.run_benchmark(
+                receiver, app, event_type, subscribable_object, options["events"]
+            )
+        finally:
+            receiver.shutdown()
+            receiver.server_close()
+            # the deliveries are removed with the webhooks of the app
+            app.delete()
+
+    def run_benchmark(self, receiver, app, event_type, subscribable_object, events):
+        task_always_eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        try:
+            # the replica may use the same connection as the default database
+            database_connections = {
+                id(connections[alias]): connections[alias]
+                for alias in settings.DATABASES
+            }
+            with ExitStack() as stack:
+                queries = [
+                    stack.enter_context(CaptureQueriesContext(connection))
+                    for connection in database_connections.values()
+                ]
+                started_at = time.monotonic()
+                for _ in range(events):
+                    receiver.event_started_at = time.monotonic()
+                    webhooks = get_webhooks_for_event(event_type, apps_ids=[app.id])
+                    trigger_webhooks_async(
+                        None,
+                        event_type,
+                        webhooks,
+                        subscribable_object=subscribable_object,
+                    )
+                duration = time.monotonic() - started_at
+        finally:
+            celery_app.conf.task_always_eager = task_always_eager
+
+        deliveries = len(receiver.latencies)
+        if not deliveries:
+            raise CommandError("The receiver didn't get any webhook requests.")
+        queries_count = sum(len(captured) for captured in queries)
+        latencies_ms = [latency * 1000 for latency in receiver.latencies]
+        self.stdout.write(
+            f"Delivered {events} {event_type} events with {deliveries} requests "
+            f"({receiver.errors} failed) in {duration:.2f}s.\n"
+            f"Deliveries per second: {deliveries / duration:.1f}\n"
+            f"End-to-end latency: p50 {percentile(latencies_ms, 50):.1f}ms, "
+            f"p99 {percentile(latencies_ms, 99):.1f}ms\n"
+            f"Database queries per delivery: {queries_count / deliveries:.1f}"
+        )
@@ -1,13 +1,21 @@
+import atexit
+import logging
 import math
+import os
+import threading
 import zlib
+from collections import defaultdict, deque
 from typing import Optional
 
 from asgiref.local import Local
 from django.conf import settings
 from redis import ConnectionPool, Redis
+from redis.exceptions import ResponseError
 
 from .exceptions import ConnectionNotConfigured
 
+logger = logging.getLogger(__name__)
+
 KEY_TYPE = str
 DEFAULT_CONNECTION_TIMEOUT = 0.5
 _local = Local()
@@ -88,6 +96,8 @@ class RedisBuffer(BaseBuffer):
     _pools: dict[str, ConnectionPool] = {}
     _socket_connect_timeout = 0.25
     _client_name = "observability_buffer"
+    # `RPOP` with the count argument requires Redis 6.2
+    _pop_with_count = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -154,13 +164,25 @@ class RedisBuffer(BaseBuffer):
         return trimmed
 
     def _pop_events(self, key: KEY_TYPE, batch_size: int) -> tuple[list[bytes], int]:
-        events = []
+        batch_size = max(1, batch_size)
         with self.client.pipeline(transaction=False) as pipe:
             pipe.llen(key)
-            for i in range(max(1, batch_size)):
-                pipe.rpop(key)
-            result = pipe.execute()
+            if self._pop_with_count:
+                pipe.rpop(key, batch_size)
+            else:
+                for i in range(batch_size):
+                    pipe.rpop(key)
+            try:
+                result = pipe.execute()
+            except ResponseError:
+                if not self._pop_with_count:
+                    raise
+                RedisBuffer._pop_with_count = False
+                return self._pop_events(key, batch_size)
         size = result.pop(0)
+        if self._pop_with_count:
+            result = result[0] or []
+        events = []
         for elem in result:
             if elem is None:
                 break
@@ -189,6 +211,95 @@ class RedisBuffer(BaseBuffer):
         return self.client.llen(self.key)
 
 
+class EventBatcher:
+    """Collect the events in the process and put them into the buffers in batches.
+
+    `put_event` only appends the event to a bounded deque, which doesn't need a lock,
+    so the compression and the round trip to the broker are not part of the request.
+    The events are put into the buffers by a daemon thread every `flush_interval`
+    seconds, or as soon as `batch_size` of them are collected. When the deque is
+    full, the oldest events are dropped, the same way as in the buffers.
+    """
+
+    def __init__(self, flush_interval: float, max_size: int, batch_size: int):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.events: deque[tuple[KEY_TYPE, bytes]] = deque(maxlen=max_size)
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def put_event(self, key: KEY_TYPE, event: bytes) -> int:
+        dropped = int(len(self.events) == self.events.maxlen)
+        self.events.append((key, event))
+        if len(self.events) >= self.batch_size:
+            self._wakeup.set()
+        self._ensure_thread()
+        return dropped
+
+    def flush(self) -> int:
+        events_dict: dict[KEY_TYPE, list[bytes]] = defaultdict(list)
+        while True:
+            try:
+                key, event = self.events.popleft()
+            except IndexError:
+                break
+            events_dict[key].append(event)
+        if not events_dict:
+            return 0
+        buffer = get_buffer(next(iter(events_dict)))
+        return sum(buffer.put_multi_key_events(events_dict).values())
+
+    def flush_and_report(self):
+        try:
+            if dropped := self.flush():
+                logger.warning("Observability buffer full, %s events dropped.", dropped)
+        except Exception:
+            logger.error("Observability events dropped.", exc_info=True)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush_and_report()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="observability-batcher", daemon=True
+                )
+                self._thread.start()
+
+
+_event_batcher: Optional[EventBatcher] = None
+
+
+def get_event_batcher() -> EventBatcher:
+    global _event_batcher
+    if not settings.OBSERVABILITY_BROKER_URL:
+        raise ConnectionNotConfigured("The observability broker url not set")
+    if _event_batcher is None:
+        _event_batcher = EventBatcher(
+            settings.OBSERVABILITY_BUFFER_FLUSH_INTERVAL,
+            settings.OBSERVABILITY_BUFFER_SIZE_LIMIT,
+            settings.OBSERVABILITY_BUFFER_BATCH_SIZE,
+        )
+        atexit.register(_event_batcher.flush_and_report)
+    return _event_batcher
+
+
+def _reset_event_batcher():
+    # the events collected by the parent process are flushed by the parent
+    global _event_batcher
+    _event_batcher = None
+
+
+os.register_at_fork(after_in_child=_reset_event_batcher)
+
+
 def get_buffer(
     key: KEY_TYPE, connection_timeout=DEFAULT_CONNECTION_TIMEOUT
 ) -> BaseBuffer:
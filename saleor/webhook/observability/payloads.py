@@ -170,7 +170,11 @@ def generate_api_call_payload(
         response=ApiCallResponse(
             headers=serialize_headers(dict(response.headers)),
             status_code=response.status_code,
-            content_length=len(response.content),
+            content_length=(
+                getattr(response, "streamed_length", 0)
+                if response.streaming
+                else len(response.content)
+            ),
         ),
         app=None,
         gql_operations=[],
@@ -1,10 +1,12 @@
+import time
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
 from freezegun import freeze_time
 
-from ..buffers import RedisBuffer, get_buffer
+from ..buffers import EventBatcher, RedisBuffer, get_buffer, get_event_batcher
 from ..exceptions import ConnectionNotConfigured
 from ..tests.conftest import BATCH_SIZE, BROKER_URL_HOST, KEY, MAX_SIZE
 
@@ -156,3 +158,73 @@ def test_pop_expired_events(buffer):
     with freeze_time(push_time + timedelta(seconds=buffer.timeout + 1)):
         popped_events = buffer.pop_events()
     assert popped_events == []
+
+
+def test_pop_events_without_pop_count_support(buffer, monkeypatch):
+    monkeypatch.setattr(RedisBuffer, "_pop_with_count", False)
+    events = [f"event-data-{i}".encode() for i in range(BATCH_SIZE + 1)]
+    buffer.put_events(events)
+    popped_events, size = buffer.pop_events_get_size()
+    assert popped_events == events[:BATCH_SIZE]
+    assert size == 1
+
+
+@pytest.fixture
+def event_batcher(redis_server):
+    return EventBatcher(flush_interval=60, max_size=MAX_SIZE, batch_size=BATCH_SIZE)
+
+
+def test_event_batcher_flush(patch_connection_pool, event_batcher):
+    key_a, key_b = "buffer_a", "buffer_b"
+    events = [f"event-data-{i}".encode() for i in range(3)]
+    for event in events:
+        event_batcher.put_event(key_a, event)
+    event_batcher.put_event(key_b, events[0])
+    buffer_a, buffer_b = get_buffer(key_a), get_buffer(key_b)
+    assert buffer_a.size() == 0
+
+    dropped = event_batcher.flush()
+
+    assert dropped == 0
+    assert buffer_a.pop_events() == events
+    assert buffer_b.pop_events() == events[:1]
+    assert not event_batcher.events
+
+
+def test_event_batcher_drops_oldest_events(patch_connection_pool, event_batcher):
+    events = [f"event-data-{i}".encode() for i in range(MAX_SIZE + 1)]
+    dropped = [event_batcher.put_event(KEY, event) for event in events]
+    event_batcher.flush()
+    assert dropped == [0] * MAX_SIZE + [1]
+    assert get_buffer(KEY).pop_events() == events[1 : BATCH_SIZE + 1]
+
+
+def test_event_batcher_flushes_full_batch_in_background(
+    patch_connection_pool, event_batcher
+):
+    buffer = get_buffer(KEY)
+    events = [f"event-data-{i}".encode() for i in range(BATCH_SIZE)]
+    for event in events:
+        event_batcher.put_event(KEY, event)
+
+    for _ in range(50):
+        if buffer.size() == BATCH_SIZE:
+            break
+        time.sleep(0.05)
+    assert buffer.pop_events() == events
+
+
+def test_get_event_batcher(redis_server, settings):
+    settings.OBSERVABILITY_BUFFER_FLUSH_INTERVAL = 1
+    with patch("saleor.webhook.observability.buffers._event_batcher", None):
+        batcher = get_event_batcher()
+        assert get_event_batcher() is batcher
+    assert batcher.flush_interval == 1
+    assert batcher.events.maxlen == settings.OBSERVABILITY_BUFFER_SIZE_LIMIT
+    assert batcher.batch_size == settings.OBSERVABILITY_BUFFER_BATCH_SIZE
+
+
+def test_get_event_batcher_with_no_config(settings):
+    settings.OBSERVABILITY_BROKER_URL = None
+    with pytest.raises(ConnectionNotConfigured):
+        get_event_batcher()
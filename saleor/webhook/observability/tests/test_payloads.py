@@ -9,6 +9,7 @@ from django.http import JsonResponse
 from django.utils import timezone
 
 from ....core import EventDeliveryStatus
+from ....core.utils.json_serializer import StreamingJsonResponse
 from ....webhook.event_types import WebhookEventAsyncType
 from ..exceptions import TruncationError
 from ..obfuscation import MASK
@@ -322,6 +323,19 @@ def test_generate_api_call_payload_request_not_from_app(rf):
     assert json.loads(payload)["app"] is None
 
 
+def test_generate_api_call_payload_streaming_response_content_length(rf):
+    request = rf.post(
+        "/graphql", data={"request": "data"}, content_type="application/json"
+    )
+    request.app = None
+    response = StreamingJsonResponse({"response": "data"})
+    b"".join(response.streaming_content)
+
+    payload = generate_api_call_payload(request, response, [], 1024)
+
+    assert json.loads(payload)["response"]["contentLength"] == 19
+
+
 def test_generate_api_call_payload_skip_operations_when_size_limit_too_low(
     app, rf, gql_operation_factory
 ):
@@ -7,11 +7,14 @@ from celery.exceptions import Retry
 from django.http import HttpResponse
 from freezegun import freeze_time
 
+from ....core.utils.json_serializer import StreamingJsonResponse
+from ..buffers import EventBatcher
 from ..exceptions import ApiCallTruncationError, EventDeliveryAttemptTruncationError
 from ..payload_schema import JsonTruncText
 from ..payloads import CustomJsonEncoder
 from ..utils import (
     ApiCall,
+    get_buffer_name,
     get_webhooks,
     get_webhooks_clear_mem_cache,
     pop_events_with_remaining_size,
@@ -21,7 +24,7 @@ from ..utils import (
     report_gql_operation,
     task_next_retry_date,
 )
-from .conftest import BATCH_SIZE
+from .conftest import BATCH_SIZE, MAX_SIZE
 
 
 @pytest.fixture
@@ -182,6 +185,33 @@ def test_api_call_report(
     mock_put_event.assert_called_once()
 
 
+@patch("saleor.webhook.observability.utils.put_event")
+def test_api_call_report_streaming_response_after_close(
+    mock_put_event,
+    _observability_enabled,
+    patch_get_webhooks,
+    app,
+    api_call,
+    test_request,
+):
+    # given
+    test_request.app = app
+    api_call.response = StreamingJsonResponse({"response": "data"})
+
+    # when
+    api_call.report()
+
+    # then
+    mock_put_event.assert_not_called()
+
+    # when
+    b"".join(api_call.response.streaming_content)
+    api_call.response.close()
+
+    # then
+    mock_put_event.assert_called_once()
+
+
 @patch("saleor.webhook.observability.utils.put_event")
 def test_api_call_response_report_when_observability_not_active(
     mock_put_event,
@@ -284,3 +314,16 @@ def test_pop_events_with_remaining_size_catch_exceptions(
     buffer.put_events([f"event-data-{i}".encode() for i in range(BATCH_SIZE)])
     redis_server.connected = False
     assert pop_events_with_remaining_size() == ([], 0)
+
+
+def test_put_event_with_event_batcher(patch_get_buffer, buffer, event_data, settings):
+    settings.OBSERVABILITY_BUFFER_FLUSH_INTERVAL = 60
+    batcher = EventBatcher(flush_interval=60, max_size=MAX_SIZE, batch_size=MAX_SIZE)
+
+    with patch(
+        "saleor.webhook.observability.utils.get_event_batcher", return_value=batcher
+    ):
+        put_event(lambda: event_data)
+
+    assert buffer.size() == 0
+    assert list(batcher.events) == [(get_buffer_name(), event_data)]
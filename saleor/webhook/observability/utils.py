@@ -5,7 +5,6 @@ from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial
-from time import monotonic
 from typing import TYPE_CHECKING, Callable, Optional
 
 from asgiref.local import Local
@@ -16,9 +15,10 @@ from graphql import GraphQLDocument
 from pytimeparse import parse
 
 from ...core.utils import get_domain
+from ...core.utils.cache import CacheDict
 from ..event_types import WebhookEventAsyncType
 from ..utils import get_webhooks_for_event
-from .buffers import get_buffer
+from .buffers import get_buffer, get_event_batcher
 from .exceptions import TruncationError
 from .payloads import generate_api_call_payload, generate_event_delivery_attempt_payload
 from .tracing import opentracing_trace
@@ -49,7 +49,7 @@ def get_buffer_name() -> str:
     return cache.make_key(BUFFER_KEY, version=2)
 
 
-_webhooks_mem_cache: dict[str, tuple[list[WebhookData], float]] = {}
+_webhooks_mem_cache = CacheDict(100)
 
 
 def get_webhooks_clear_mem_cache():
@@ -59,10 +59,9 @@ def get_webhooks_clear_mem_cache():
 def get_webhooks(timeout=CACHE_TIMEOUT) -> list[WebhookData]:
     with opentracing_trace("get_observability_webhooks", "webhooks"):
         buffer_name = get_buffer_name()
-        if cached := _webhooks_mem_cache.get(buffer_name, None):
-            webhooks_data, check_time = cached
-            if monotonic() - check_time <= timeout:
-                return webhooks_data
+        webhooks_data = _webhooks_mem_cache.get(buffer_name)
+        if webhooks_data is not None:
+            return webhooks_data
         webhooks_data = cache.get(WEBHOOKS_KEY)
         if webhooks_data is None:
             webhooks_data = []
@@ -78,7 +77,7 @@ def get_webhooks(timeout=CACHE_TIMEOUT) -> list[WebhookData]:
                         )
                     )
             cache.set(WEBHOOKS_KEY, webhooks_data, timeout=CACHE_TIMEOUT)
-        _webhooks_mem_cache[buffer_name] = (webhooks_data, monotonic())
+        _webhooks_mem_cache.set(buffer_name, webhooks_data, ttl=timeout)
         return webhooks_data
 
 
@@ -94,7 +93,11 @@ def put_event(generate_payload: Callable[[], bytes]):
     try:
         payload = generate_payload()
         with opentracing_trace("put_event", "buffer"):
-            if get_buffer(get_buffer_name()).put_event(payload):
+            if settings.OBSERVABILITY_BUFFER_FLUSH_INTERVAL:
+                dropped = get_event_batcher().put_event(get_buffer_name(), payload)
+            else:
+                dropped = get_buffer(get_buffer_name()).put_event(payload)
+            if dropped:
                 logger.warning("Observability buffer full, event dropped.")
     except TruncationError as err:
         logger.warning("Observability event dropped. %s", err, extra=err.extra)
@@ -140,6 +143,13 @@ class ApiCall:
             logger.error("HttpResponse not provided, observability event dropped.")
             return
         self._reported = True
+        if self.response.streaming:
+            # the size of the streamed content is known once the response is sent
+            self.response._resource_closers.append(self._put_event)  # type: ignore[attr-defined] # private attribute # noqa: E501
+            return
+        self._put_event()
+
+    def _put_event(self):
         with opentracing_trace("report_api_call", "reporter"):
             if get_webhooks():
                 put_event(
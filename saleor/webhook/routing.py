@@ -0,0 +1,172 @@
+"""In-memory routing table of webhooks subscribed to the events.
+
+The table maps event types to the active webhooks of active apps, together with the
+permissions of the apps, so finding the webhooks for an event doesn't query the
+database. The table is built from the database once per process and version. The
+version is kept in the Django cache and changed each time a webhook, its events, an
+app or the app permissions are changed. Processes compare their version with it at
+most once per `WEBHOOK_ROUTING_TABLE_VERSION_CHECK_INTERVAL` seconds and rebuild
+their tables when it differs. Changes that don't send model signals, like `QuerySet.update()`, have to call
+`invalidate_webhook_routing_table` or are only picked up after
+`WEBHOOK_ROUTING_TABLE_TIMEOUT` seconds.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..app.models import App
+from ..core.db.connection import allow_writer
+from .event_types import WebhookEventAsyncType
+from .models import Webhook, WebhookEvent
+
+ROUTING_TABLE_VERSION_KEY = "webhook-routing-table-version"
+
+
+@dataclass(frozen=True)
+class WebhookRoute:
+    webhook_id: int
+    app_id: int
+    app_identifier: Optional[str]
+    app_removed: bool
+    # permissions in the `app_label.codename` format
+    app_permissions: frozenset[str]
+
+
+RoutingTable = dict[str, list[WebhookRoute]]
+
+
+class LocalRoutingTable:
+    """Routing table of the process with the version it was built for."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.table: Optional[RoutingTable] = None
+        self.built_at = 0.0
+        self.version: Optional[int] = None
+        self.version_checked_at: Optional[float] = None
+
+    def invalidate(self, version: Optional[int] = None):
+        with self.lock:
+            self.table = None
+            if version is not None:
+                self.version = version
+            # the process already knows about the change
+            self.version_checked_at = time.monotonic()
+
+    def reset(self):
+        with self.lock:
+            self.table = None
+            self.built_at = 0.0
+            self.version = None
+            self.version_checked_at = None
+
+
+local_routing_table = LocalRoutingTable()
+
+
+def _publish_routing_table_version():
+    version = time.time_ns()
+    cache.set(ROUTING_TABLE_VERSION_KEY, version, None)
+    local_routing_table.invalidate(version)
+
+
+def invalidate_webhook_routing_table():
+    """Rebuild the routing table of the process and of other processes.
+
+    Other processes rebuild their tables after the current transaction is committed,
+    as before that they can't see the changes.
+    """
+    local_routing_table.invalidate()
+    transaction.on_commit(_publish_routing_table_version)
+
+
+def build_routing_table() -> RoutingTable:
+    # The table is built from the writer database, as it is kept until the next
+    # change and a replica lag would be cached with it.
+    permissions = defaultdict(set)
+    app_permissions = App.permissions.through.objects.filter(
+        app__is_active=True
+    ).values_list(
+        "app_id", "permission__content_type__app_label", "permission__codename"
+    )
+    for app_id, app_label, codename in app_permissions:
+        permissions[app_id].add(f"{app_label}.{codename}")
+
+    routes = {}
+    webhooks = Webhook.objects.filter(is_active=True, app__is_active=True).values_list(
+        "id", "app_id", "app__identifier", "app__removed_at"
+    )
+    for webhook_id, app_id, app_identifier, app_removed_at in webhooks:
+        routes[webhook_id] = WebhookRoute(
+            webhook_id=webhook_id,
+            app_id=app_id,
+            app_identifier=app_identifier,
+            app_removed=app_removed_at is not None,
+            app_permissions=frozenset(permissions[app_id]),
+        )
+
+    table: RoutingTable = defaultdict(list)
+    webhook_events = WebhookEvent.objects.filter(
+        webhook__is_active=True, webhook__app__is_active=True
+    ).values_list("event_type", "webhook_id")
+    for event_type, webhook_id in webhook_events.order_by("webhook_id"):
+        # skip the webhooks created after fetching the webhooks
+        if route := routes.get(webhook_id):
+            table[event_type].append(route)
+    return dict(table)
+
+
+def get_routing_table() -> RoutingTable:
+    local = local_routing_table
+    with local.lock:
+        now = time.monotonic()
+        if (
+            local.version_checked_at is None
+            or now - local.version_checked_at
+            >= settings.WEBHOOK_ROUTING_TABLE_VERSION_CHECK_INTERVAL
+        ):
+            version = cache.get_or_set(ROUTING_TABLE_VERSION_KEY, time.time_ns, None)
+            if version != local.version:
+                local.version = version
+                local.table = None
+            local.version_checked_at = now
+        if (
+            local.table is None
+            or now - local.built_at >= settings.WEBHOOK_ROUTING_TABLE_TIMEOUT
+        ):
+            with allow_writer():
+                local.table = build_routing_table()
+            local.built_at = now
+        return local.table
+
+
+def get_webhook_routes_for_event(
+    event_type: str,
+    required_permission: Optional[str] = None,
+    apps_ids: Optional[list[int]] = None,
+    apps_identifier: Optional[list[str]] = None,
+) -> list[WebhookRoute]:
+    table = get_routing_table()
+    routes = table.get(event_type, [])
+    if event_type in WebhookEventAsyncType.ALL:
+        routes = routes + table.get(WebhookEventAsyncType.ANY, [])
+    include_removed_apps = event_type == WebhookEventAsyncType.APP_DELETED
+    routes_by_webhook_id = {}
+    for route in routes:
+        if required_permission and required_permission not in route.app_permissions:
+            continue
+        if route.app_removed and not include_removed_apps:
+            continue
+        if apps_ids and route.app_id not in apps_ids:
+            continue
+        if apps_identifier and route.app_identifier not in apps_identifier:
+            continue
+        routes_by_webhook_id[route.webhook_id] = route
+    return list(routes_by_webhook_id.values())
@@ -0,0 +1,10 @@
+from .routing import invalidate_webhook_routing_table
+
+
+def invalidate_routing_table(**kwargs):
+    invalidate_webhook_routing_table()
+
+
+def invalidate_routing_table_on_m2m(action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_webhook_routing_table()
@@ -0,0 +1,213 @@
+"""Subscription queries representative of the payloads requested by apps.
+
+The queries request the fields commonly used by apps, so generating their payloads
+costs about as much as for real subscriptions. They are used by the
+`benchmark_webhooks` command and tested with the subscription webhooks.
+"""
+
+MONEY_FRAGMENT = """
+fragment MoneyDetails on Money {
+  amount
+  currency
+}
+"""
+
+ADDRESS_FRAGMENT = """
+fragment AddressDetails on Address {
+  firstName
+  lastName
+  companyName
+  streetAddress1
+  streetAddress2
+  city
+  postalCode
+  country {
+    code
+  }
+  countryArea
+  phone
+}
+"""
+
+PRODUCT_FRAGMENT = (
+    MONEY_FRAGMENT
+    + """
+fragment ProductDetails on Product {
+  id
+  name
+  slug
+  description
+  updatedAt
+  productType {
+    id
+    name
+  }
+  category {
+    id
+    name
+  }
+  attributes {
+    attribute {
+      slug
+    }
+    values {
+      name
+      slug
+    }
+  }
+  channelListings {
+    channel {
+      slug
+    }
+    isPublished
+    visibleInListings
+  }
+  variants {
+    id
+    sku
+    name
+    channelListings {
+      channel {
+        slug
+      }
+      price {
+        ...MoneyDetails
+      }
+    }
+    stocks {
+      warehouse {
+        slug
+      }
+      quantity
+    }
+  }
+  metadata {
+    key
+    value
+  }
+}
+"""
+)
+
+ORDER_FRAGMENT = (
+    MONEY_FRAGMENT
+    + ADDRESS_FRAGMENT
+    + """
+fragment OrderDetails on Order {
+  id
+  number
+  status
+  created
+  userEmail
+  channel {
+    slug
+  }
+  billingAddress {
+    ...AddressDetails
+  }
+  shippingAddress {
+    ...AddressDetails
+  }
+  shippingMethodName
+  lines {
+    id
+    productName
+    variantName
+    productSku
+    quantity
+    unitPrice {
+      gross {
+        ...MoneyDetails
+      }
+    }
+    totalPrice {
+      gross {
+        ...MoneyDetails
+      }
+    }
+  }
+  subtotal {
+    gross {
+      ...MoneyDetails
+    }
+  }
+  shippingPrice {
+    gross {
+      ...MoneyDetails
+    }
+  }
+  total {
+    gross {
+      ...MoneyDetails
+    }
+    tax {
+      ...MoneyDetails
+    }
+  }
+  metadata {
+    key
+    value
+  }
+}
+"""
+)
+
+PRODUCT_CREATED = (
+    PRODUCT_FRAGMENT
+    + """
+subscription {
+  event {
+    ... on ProductCreated {
+      product {
+        ...ProductDetails
+      }
+    }
+  }
+}
+"""
+)
+
+PRODUCT_UPDATED = (
+    PRODUCT_FRAGMENT
+    + """
+subscription {
+  event {
+    ... on ProductUpdated {
+      product {
+        ...ProductDetails
+      }
+    }
+  }
+}
+"""
+)
+
+ORDER_CREATED = (
+    ORDER_FRAGMENT
+    + """
+subscription {
+  event {
+    ... on OrderCreated {
+      order {
+        ...OrderDetails
+      }
+    }
+  }
+}
+"""
+)
+
+ORDER_UPDATED = (
+    ORDER_FRAGMENT
+    + """
+subscription {
+  event {
+    ... on OrderUpdated {
+      order {
+        ...OrderDetails
+      }
+    }
+  }
+}
+"""
+)
@@ -0,0 +1,66 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from ...app.models import App
+from ...core.models import EventDelivery
+from ..event_types import WebhookEventAsyncType
+
+
+# the benchmark sends the requests to a receiver listening on the loopback interface
+@pytest.mark.enable_socket
+def test_benchmark_webhooks(product):
+    # given
+    out = StringIO()
+
+    # when
+    call_command(
+        "benchmark_webhooks",
+        events=3,
+        webhooks=2,
+        event_type=WebhookEventAsyncType.PRODUCT_UPDATED,
+        stdout=out,
+    )
+
+    # then
+    output = out.getvalue()
+    assert "Delivered 3 product_updated events with 6 requests (0 failed)" in output
+    assert "Deliveries per second" in output
+    assert "Database queries per delivery" in output
+    assert not App.objects.exists()
+    assert not EventDelivery.objects.exists()
+
+
+@pytest.mark.enable_socket
+def test_benchmark_webhooks_reports_failed_requests(order):
+    # given
+    out = StringIO()
+
+    # when
+    call_command(
+        "benchmark_webhooks",
+        events=2,
+        event_type=WebhookEventAsyncType.ORDER_CREATED,
+        error_rate=1,
+        stdout=out,
+    )
+
+    # then
+    assert "with 2 requests (2 failed)" in out.getvalue()
+    assert not EventDelivery.objects.exists()
+
+
+def test_benchmark_webhooks_without_objects():
+    with pytest.raises(CommandError, match="Populate the database first"):
+        call_command("benchmark_webhooks", events=1)
+
+
+def test_benchmark_webhooks_loopback_blocked(product, settings):
+    # given
+    settings.HTTP_IP_FILTER_ENABLED = True
+    settings.HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS = False
+
+    # when & then
+    with pytest.raises(CommandError, match="HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS"):
+        call_command("benchmark_webhooks", events=1)
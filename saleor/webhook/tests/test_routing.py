@@ -0,0 +1,153 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from ...app.models import App
+from ..event_types import WebhookEventAsyncType
+from ..models import Webhook, WebhookEvent
+from ..routing import (
+    ROUTING_TABLE_VERSION_KEY,
+    get_routing_table,
+    get_webhook_routes_for_event,
+    local_routing_table,
+)
+from ..utils import get_webhooks_for_event
+
+EVENT_TYPE = WebhookEventAsyncType.ORDER_CREATED
+PERMISSION = "order.manage_orders"
+
+
+def _create_webhook(app, event_type=EVENT_TYPE):
+    webhook = Webhook.objects.create(name="webhook", app=app)
+    webhook.events.create(event_type=event_type)
+    return webhook
+
+
+def test_get_webhook_routes_for_event_uses_routing_table(
+    app, permission_manage_orders, django_assert_num_queries
+):
+    # given
+    app.permissions.add(permission_manage_orders)
+    webhook = _create_webhook(app)
+    get_routing_table()
+
+    # when
+    with django_assert_num_queries(0):
+        routes = get_webhook_routes_for_event(EVENT_TYPE, PERMISSION)
+
+    # then
+    assert [route.webhook_id for route in routes] == [webhook.id]
+    assert routes[0].app_permissions == {PERMISSION}
+
+
+def test_get_webhook_routes_for_event_filters_routes(
+    app, external_app, permission_manage_orders
+):
+    # given
+    app.permissions.add(permission_manage_orders)
+    webhook = _create_webhook(app)
+    any_webhook = _create_webhook(app, WebhookEventAsyncType.ANY)
+    _create_webhook(external_app)
+
+    # when
+    routes = get_webhook_routes_for_event(EVENT_TYPE, PERMISSION)
+    app_routes = get_webhook_routes_for_event(
+        EVENT_TYPE, PERMISSION, apps_ids=[external_app.id]
+    )
+
+    # then
+    assert {route.webhook_id for route in routes} == {webhook.id, any_webhook.id}
+    assert app_routes == []
+
+
+def test_routing_table_rebuilt_after_change(app, permission_manage_orders):
+    # given
+    app.permissions.add(permission_manage_orders)
+    webhook = _create_webhook(app)
+    assert get_webhook_routes_for_event(EVENT_TYPE, PERMISSION)
+
+    # when
+    app.permissions.remove(permission_manage_orders)
+
+    # then
+    assert get_webhook_routes_for_event(EVENT_TYPE, PERMISSION) == []
+
+    # when
+    app.permissions.add(permission_manage_orders)
+    webhook.is_active = False
+    webhook.save(update_fields=["is_active"])
+
+    # then
+    assert get_webhook_routes_for_event(EVENT_TYPE, PERMISSION) == []
+
+
+def test_get_webhooks_for_event_skips_deactivated_with_stale_routing_table(
+    app, permission_manage_orders
+):
+    # given
+    app.permissions.add(permission_manage_orders)
+    webhook = _create_webhook(app)
+    other_app = App.objects.create(name="Other app", is_active=True)
+    other_app.permissions.add(permission_manage_orders)
+    other_webhook = _create_webhook(other_app)
+    get_routing_table()
+
+    # when
+    # `update()` doesn't send signals, so the routing table isn't rebuilt
+    Webhook.objects.filter(id=webhook.id).update(is_active=False)
+    App.objects.filter(id=other_app.id).update(is_active=False)
+
+    # then
+    routes = get_webhook_routes_for_event(EVENT_TYPE, PERMISSION)
+    assert {route.webhook_id for route in routes} == {webhook.id, other_webhook.id}
+    assert not get_webhooks_for_event(EVENT_TYPE).exists()
+
+
+def test_routing_table_version_published_on_commit(
+    app, django_capture_on_commit_callbacks
+):
+    # given
+    version = cache.get_or_set(ROUTING_TABLE_VERSION_KEY, 1, None)
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        _create_webhook(app)
+
+    # then
+    assert cache.get(ROUTING_TABLE_VERSION_KEY) != version
+    assert local_routing_table.version == cache.get(ROUTING_TABLE_VERSION_KEY)
+
+
+@override_settings(WEBHOOK_ROUTING_TABLE_VERSION_CHECK_INTERVAL=0)
+def test_routing_table_rebuilt_after_version_changed(app, permission_manage_orders):
+    # given
+    app.permissions.add(permission_manage_orders)
+    get_routing_table()
+    # the webhook is created by other process
+    (webhook,) = Webhook.objects.bulk_create([Webhook(name="webhook", app=app)])
+    WebhookEvent.objects.bulk_create(
+        [WebhookEvent(webhook=webhook, event_type=EVENT_TYPE)]
+    )
+    assert get_webhook_routes_for_event(EVENT_TYPE, PERMISSION) == []
+
+    # when
+    cache.set(ROUTING_TABLE_VERSION_KEY, 1, None)
+
+    # then
+    routes = get_webhook_routes_for_event(EVENT_TYPE, PERMISSION)
+    assert [route.webhook_id for route in routes] == [webhook.id]
+
+
+@override_settings(WEBHOOK_ROUTING_TABLE_TIMEOUT=0)
+def test_get_webhooks_for_event_routing_table_disabled(app, permission_manage_orders):
+    # given
+    app.permissions.add(permission_manage_orders)
+    _create_webhook(app)
+    get_webhooks_for_event(EVENT_TYPE)
+    # the change doesn't send signals
+    App.objects.filter(pk=app.pk).update(is_active=False)
+
+    # when
+    webhooks = get_webhooks_for_event(EVENT_TYPE)
+
+    # then
+    assert list(webhooks) == []
@@ -20,6 +20,19 @@ SUBSCRIPTION_QUERY = """
     }
 """
 
+SUBSCRIPTION_QUERY_WITH_ID = """
+    subscription {
+        event {
+            ... on ProductVariantUpdated {
+                productVariant {
+                    id
+                    name
+                }
+            }
+        }
+    }
+"""
+
 
 @override_settings(ENABLE_LIMITING_WEBHOOKS_FOR_IDENTICAL_PAYLOADS=True)
 def test_create_deliveries_different_pre_save_payloads(webhook_app, variant):
@@ -128,7 +141,7 @@ def test_create_deliveries_reuse_request_for_webhooks(
     webhook_2 = Webhook.objects.create(
         name="Webhook 2",
         app=webhook_app,
-        subscription_query=SUBSCRIPTION_QUERY,
+        subscription_query=SUBSCRIPTION_QUERY_WITH_ID,
     )
     webhook_2.events.create(event_type=event_type)
 
@@ -154,3 +167,72 @@ def test_create_deliveries_reuse_request_for_webhooks(
     request_2 = mock_generate_payload_from_subscription.call_args_list[1][1]["request"]
     assert request_1 is request_2
     assert request_1.dataloaders is request_2.dataloaders
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_merge_webhooks_with_identical_queries(
+    mock_generate_payload_from_subscription, webhook_app, variant
+):
+    # given
+    event_type = WebhookEventAsyncType.PRODUCT_VARIANT_UPDATED
+    webhooks = []
+    for index in range(3):
+        webhook = Webhook.objects.create(
+            name=f"Webhook {index}",
+            app=webhook_app,
+            subscription_query=SUBSCRIPTION_QUERY,
+        )
+        webhook.events.create(event_type=event_type)
+        webhooks.append(webhook)
+
+    # when
+    event_deliveries = create_deliveries_for_subscriptions(
+        event_type=event_type,
+        subscribable_object=variant,
+        webhooks=webhooks,
+    )
+
+    # then
+    assert len(event_deliveries) == len(webhooks)
+    assert {delivery.webhook for delivery in event_deliveries} == set(webhooks)
+    assert len({delivery.payload.pk for delivery in event_deliveries}) == 1
+    assert json.loads(event_deliveries[0].payload.payload) == {
+        "productVariant": {"name": variant.name}
+    }
+    mock_generate_payload_from_subscription.assert_called_once()
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_dont_merge_webhooks_of_different_apps(
+    mock_generate_payload_from_subscription, webhook_app, app, variant
+):
+    # given
+    event_type = WebhookEventAsyncType.PRODUCT_VARIANT_UPDATED
+    webhooks = []
+    for webhook_owner in [webhook_app, app]:
+        webhook = Webhook.objects.create(
+            name="Webhook",
+            app=webhook_owner,
+            subscription_query=SUBSCRIPTION_QUERY,
+        )
+        webhook.events.create(event_type=event_type)
+        webhooks.append(webhook)
+
+    # when
+    event_deliveries = create_deliveries_for_subscriptions(
+        event_type=event_type,
+        subscribable_object=variant,
+        webhooks=webhooks,
+    )
+
+    # then
+    assert len(event_deliveries) == 2
+    assert mock_generate_payload_from_subscription.call_count == 2
+    # identical payloads generated separately are stored once
+    assert len({delivery.payload.pk for delivery in event_deliveries}) == 1
@@ -0,0 +1,373 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+from .....core import EventDeliveryStatus
+from .....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
+from .....webhook.event_types import WebhookEventAsyncType
+from .....webhook.models import Webhook
+from ... import circuit_breaker
+from ..transport import (
+    WEBHOOK_BATCH_DELIVERY_SCHEDULED_KEY,
+    _save_batch_results,
+    send_webhook_request_async,
+    send_webhook_requests_batch_task,
+    trigger_webhooks_async,
+)
+
+SEND_METHOD_PATH = (
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+RETRY_TASK_PATH = (
+    "saleor.webhook.transport.asynchronous.transport"
+    ".send_webhook_request_async.apply_async"
+)
+BATCH_TASK_PATH = (
+    "saleor.webhook.transport.asynchronous.transport"
+    ".send_webhook_requests_batch_task.apply_async"
+)
+
+
+def _create_deliveries(webhooks, event_payload):
+    return [
+        EventDelivery.objects.create(
+            event_type=WebhookEventAsyncType.ORDER_CREATED,
+            payload=event_payload,
+            webhook=webhook,
+        )
+        for webhook in webhooks
+    ]
+
+
+@mock.patch(BATCH_TASK_PATH)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task(
+    mocked_send_response,
+    mocked_batch_task,
+    webhook,
+    event_payload,
+    webhook_response,
+):
+    # given
+    other_webhook = Webhook.objects.create(
+        app=webhook.app, target_url="https://other.example.com/webhook"
+    )
+    _create_deliveries([webhook, webhook, other_webhook], event_payload)
+    mocked_send_response.return_value = webhook_response
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    assert mocked_send_response.call_count == 3
+    sessions = {
+        call.args[0]: call.kwargs["session"]
+        for call in mocked_send_response.call_args_list
+    }
+    assert sessions[webhook.target_url] != sessions[other_webhook.target_url]
+    assert not EventDelivery.objects.exists()
+    assert not EventPayload.objects.filter(pk=event_payload.pk).exists()
+    mocked_batch_task.assert_not_called()
+
+
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_reuses_session_for_host(
+    mocked_send_response, webhook, event_payload, webhook_response
+):
+    # given
+    _create_deliveries([webhook, webhook], event_payload)
+    mocked_send_response.return_value = webhook_response
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    first_call, second_call = mocked_send_response.call_args_list
+    assert first_call.kwargs["session"] is second_call.kwargs["session"]
+
+
+@mock.patch(RETRY_TASK_PATH)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_retries_failed_delivery(
+    mocked_send_response,
+    mocked_retry_task,
+    event_delivery,
+    webhook_response_failed,
+):
+    # given
+    mocked_send_response.return_value = webhook_response_failed
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    event_delivery.refresh_from_db()
+    attempt = event_delivery.attempts.get()
+    assert attempt.status == EventDeliveryStatus.FAILED
+    assert attempt.response == webhook_response_failed.content
+    assert attempt.response_status_code == 500
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+    mocked_retry_task.assert_called_once_with(
+        kwargs={"event_delivery_id": event_delivery.pk},
+        queue=None,
+        countdown=10,
+    )
+
+
+@mock.patch(RETRY_TASK_PATH)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_client_error_not_retried(
+    mocked_send_response,
+    mocked_retry_task,
+    event_delivery,
+    webhook_response_failed,
+):
+    # given
+    webhook_response_failed.response_status_code = 400
+    mocked_send_response.return_value = webhook_response_failed
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.FAILED
+    assert event_delivery.attempts.get().status == EventDeliveryStatus.FAILED
+    mocked_retry_task.assert_not_called()
+
+
+@mock.patch(RETRY_TASK_PATH)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_unexpected_error_retried(
+    mocked_send_response,
+    mocked_retry_task,
+    webhook,
+    event_payload,
+    webhook_response,
+):
+    # given
+    other_webhook = Webhook.objects.create(
+        app=webhook.app, target_url="https://other.example.com/webhook"
+    )
+    delivery, other_delivery = _create_deliveries(
+        [webhook, other_webhook], event_payload
+    )
+
+    def send_response(target_url, *args, **kwargs):
+        if target_url == webhook.target_url:
+            raise RuntimeError("Unexpected error")
+        return webhook_response
+
+    mocked_send_response.side_effect = send_response
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    delivery.refresh_from_db()
+    assert delivery.status == EventDeliveryStatus.PENDING
+    assert delivery.attempts.get().status == EventDeliveryStatus.FAILED
+    assert not EventDelivery.objects.filter(pk=other_delivery.pk).exists()
+    mocked_retry_task.assert_called_once_with(
+        kwargs={"event_delivery_id": delivery.pk},
+        queue=None,
+        countdown=10,
+    )
+
+
+@mock.patch(RETRY_TASK_PATH)
+@mock.patch("saleor.webhook.transport.asynchronous.transport._send_deliveries_to_host")
+def test_send_webhook_requests_batch_task_host_error_retried(
+    mocked_send_deliveries_to_host, mocked_retry_task, event_delivery
+):
+    # given
+    mocked_send_deliveries_to_host.side_effect = RuntimeError("Unexpected error")
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+    assert event_delivery.attempts.get().status == EventDeliveryStatus.FAILED
+    mocked_retry_task.assert_called_once_with(
+        kwargs={"event_delivery_id": event_delivery.pk},
+        queue=None,
+        countdown=10,
+    )
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport._save_batch_results",
+    wraps=_save_batch_results,
+)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_saves_results_per_host(
+    mocked_send_response,
+    mocked_save_batch_results,
+    webhook,
+    event_payload,
+    webhook_response,
+):
+    # given
+    other_webhook = Webhook.objects.create(
+        app=webhook.app, target_url="https://other.example.com/webhook"
+    )
+    _create_deliveries([webhook, webhook, other_webhook], event_payload)
+    mocked_send_response.return_value = webhook_response
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    assert mocked_save_batch_results.call_count == 2
+    assert sorted(
+        len(call.args[0]) for call in mocked_save_batch_results.call_args_list
+    ) == [1, 2]
+    assert not EventDelivery.objects.exists()
+
+
+@override_settings(WEBHOOK_BATCH_DELIVERY_STALE_TIMEOUT=600)
+@mock.patch(RETRY_TASK_PATH)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_requeues_stale_deliveries(
+    mocked_send_response, mocked_retry_task, webhook, event_payload
+):
+    # given
+    stale_delivery, fresh_delivery, failed_delivery = _create_deliveries(
+        [webhook, webhook, webhook], event_payload
+    )
+    stale_attempt = EventDeliveryAttempt.objects.create(delivery=stale_delivery)
+    EventDeliveryAttempt.objects.create(delivery=fresh_delivery)
+    failed_attempt = EventDeliveryAttempt.objects.create(
+        delivery=failed_delivery, status=EventDeliveryStatus.FAILED
+    )
+    EventDeliveryAttempt.objects.filter(
+        pk__in=[stale_attempt.pk, failed_attempt.pk]
+    ).update(created_at=timezone.now() - timedelta(minutes=11))
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_retry_task.assert_called_once_with(
+        kwargs={"event_delivery_id": stale_delivery.pk},
+        queue=None,
+    )
+    stale_attempt.refresh_from_db()
+    assert stale_attempt.status == EventDeliveryStatus.FAILED
+    stale_delivery.refresh_from_db()
+    assert stale_delivery.status == EventDeliveryStatus.PENDING
+
+
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_inactive_webhook(
+    mocked_send_response, event_delivery
+):
+    # given
+    event_delivery.webhook.is_active = False
+    event_delivery.webhook.save(update_fields=["is_active"])
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.FAILED
+    assert not event_delivery.attempts.exists()
+    mocked_send_response.assert_not_called()
+
+
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_skips_attempted_deliveries(
+    mocked_send_response, event_delivery
+):
+    # given
+    EventDeliveryAttempt.objects.create(delivery=event_delivery)
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    mocked_send_response.assert_not_called()
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_ENABLED=True, WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1
+)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_skips_postponed_deliveries(
+    mocked_send_response, event_delivery, webhook_response_failed
+):
+    # given
+    target_url = event_delivery.webhook.target_url
+    circuit_breaker.record_response(target_url, webhook_response_failed, 1.0)
+    with pytest.raises(Retry):
+        send_webhook_request_async(event_delivery.pk)
+    # the circuit is closed before the dispatcher runs
+    circuit_cache_keys = [
+        circuit_breaker.get_cache_key_failures(target_url),
+        circuit_breaker.get_cache_key_open(target_url),
+        circuit_breaker.get_cache_key_tripped(target_url),
+        circuit_breaker.get_cache_key_latency(target_url),
+    ]
+    cache.delete_many(circuit_cache_keys)
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    mocked_send_response.assert_not_called()
+    assert event_delivery.attempts.count() == 1
+
+
+@override_settings(WEBHOOK_BATCH_DELIVERY_SIZE=2)
+@mock.patch(BATCH_TASK_PATH)
+@mock.patch(SEND_METHOD_PATH)
+def test_send_webhook_requests_batch_task_schedules_next_batch(
+    mocked_send_response,
+    mocked_batch_task,
+    webhook,
+    event_payload,
+    webhook_response,
+):
+    # given
+    _create_deliveries([webhook, webhook, webhook], event_payload)
+    mocked_send_response.return_value = webhook_response
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    assert mocked_send_response.call_count == 2
+    assert EventDelivery.objects.count() == 1
+    mocked_batch_task.assert_called_once_with(queue=None)
+
+
+@override_settings(WEBHOOK_BATCH_DELIVERY_ENABLED=True, WEBHOOK_BATCH_DELIVERY_DELAY=5)
+@mock.patch(RETRY_TASK_PATH)
+@mock.patch(BATCH_TASK_PATH)
+def test_trigger_webhooks_async_schedules_batch_delivery(
+    mocked_batch_task, mocked_retry_task, webhook
+):
+    # given
+    cache.delete(WEBHOOK_BATCH_DELIVERY_SCHEDULED_KEY)
+    webhooks = Webhook.objects.filter(pk=webhook.pk)
+
+    # when
+    for _ in range(3):
+        trigger_webhooks_async(
+            '{"key": "value"}', WebhookEventAsyncType.ORDER_CREATED, webhooks
+        )
+
+    # then
+    assert EventDelivery.objects.filter(webhook=webhook).count() == 3
+    mocked_batch_task.assert_called_once_with(queue=None, countdown=5)
+    mocked_retry_task.assert_not_called()
+    cache.delete(WEBHOOK_BATCH_DELIVERY_SCHEDULED_KEY)
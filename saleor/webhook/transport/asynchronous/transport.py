@@ -1,18 +1,26 @@
 import datetime
 import json
 import logging
+from collections import defaultdict
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlparse
 
 from celery import group
+from celery.exceptions import MaxRetriesExceededError, Retry
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Subquery
+from django.utils import timezone
 
 from ....celeryconf import app
 from ....core import EventDeliveryStatus
 from ....core.db.connection import allow_writer
-from ....core.models import EventDelivery, EventPayload
+from ....core.http_client import HTTPClient
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
 from ....core.tracing import webhooks_opentracing_trace
 from ....core.utils import get_domain
 from ....graphql.core.dataloaders import DataLoader
@@ -25,12 +33,18 @@ from ....graphql.webhook.subscription_types import WEBHOOK_TYPES_MAP
 from ... import observability
 from ...event_types import WebhookEventAsyncType, WebhookEventSyncType
 from ...observability import WebhookData
+from .. import circuit_breaker
 from ..utils import (
     WebhookResponse,
     WebhookSchemes,
     attempt_update,
+    bulk_attempt_update,
+    bulk_delivery_update,
+    catch_duration_time,
+    clear_successful_deliveries,
     clear_successful_delivery,
     create_attempt,
+    create_attempts,
     delivery_update,
     get_delivery_for_webhook,
     handle_webhook_retry,
@@ -45,6 +59,7 @@ logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
 
 OBSERVABILITY_QUEUE_NAME = "observability"
+WEBHOOK_BATCH_DELIVERY_SCHEDULED_KEY = "webhook_batch_delivery_scheduled"
 
 
 def create_deliveries_for_subscriptions(
@@ -74,7 +89,6 @@ def create_deliveries_for_subscriptions(
         )
         return []
 
-    event_payloads = []
     event_deliveries = []
 
     # Dataloaders are shared between calls to generate_payload_from_subscription to
@@ -91,14 +105,23 @@ def create_deliveries_for_subscriptions(
         dataloaders=dataloaders,
     )
 
+    # Webhooks of the same app with identical queries get the same payload, so it's
+    # generated once and the stored payload is shared by their deliveries.
+    payloads_by_query: dict[tuple[str, Optional[int]], Optional[dict]] = {}
+    serialized_payloads_by_query: dict[tuple[str, Optional[int]], str] = {}
+    deliveries_query_keys = []
+
     for webhook in webhooks:
-        data = generate_payload_from_subscription(
-            event_type=event_type,
-            subscribable_object=subscribable_object,
-            subscription_query=webhook.subscription_query,
-            request=request,
-            app=webhook.app,
-        )
+        query_key = (webhook.subscription_query, webhook.app_id)
+        if query_key not in payloads_by_query:
+            payloads_by_query[query_key] = generate_payload_from_subscription(
+                event_type=event_type,
+                subscribable_object=subscribable_object,
+                subscription_query=webhook.subscription_query,
+                request=request,
+                app=webhook.app,
+            )
+        data = payloads_by_query[query_key]
 
         if not data:
             logger.info(
@@ -121,19 +144,26 @@ def create_deliveries_for_subscriptions(
                 )
                 continue
 
-        event_payload = EventPayload(payload=json.dumps({**data}))
-        event_payloads.append(event_payload)
+        if query_key not in serialized_payloads_by_query:
+            serialized_payloads_by_query[query_key] = json.dumps({**data})
         event_deliveries.append(
             EventDelivery(
                 status=EventDeliveryStatus.PENDING,
                 event_type=event_type,
-                payload=event_payload,
                 webhook=webhook,
             )
         )
+        deliveries_query_keys.append(query_key)
 
-    with allow_writer():
-        EventPayload.objects.bulk_create(event_payloads)
+    with allow_writer(), transaction.atomic():
+        event_payloads = EventPayload.objects.bulk_create_with_payloads(
+            list(serialized_payloads_by_query.values())
+        )
+        event_payloads_by_query = dict(
+            zip(serialized_payloads_by_query.keys(), event_payloads)
+        )
+        for delivery, query_key in zip(event_deliveries, deliveries_query_keys):
+            delivery.payload = event_payloads_by_query[query_key]
         return EventDelivery.objects.bulk_create(event_deliveries)
 
 
@@ -197,8 +227,8 @@ def trigger_webhooks_async(
         elif data is None:
             raise NotImplementedError("No payload was provided for regular webhooks.")
 
-        with allow_writer():
-            payload = EventPayload.objects.create(payload=data)
+        with allow_writer(), transaction.atomic():
+            payload = EventPayload.objects.create_with_payload(data)
             deliveries.extend(
                 create_event_delivery_list_for_webhooks(
                     webhooks=regular_webhooks,
@@ -219,6 +249,11 @@ def trigger_webhooks_async(
             )
         )
 
+    if settings.WEBHOOK_BATCH_DELIVERY_ENABLED:
+        if deliveries:
+            schedule_webhook_requests_batch(queue=queue)
+        return
+
     for delivery in deliveries:
         send_webhook_request_async.apply_async(
             kwargs={"event_delivery_id": delivery.id},
@@ -235,12 +270,17 @@ def trigger_webhooks_async(
     retry_backoff=10,
     retry_kwargs={"max_retries": 5},
 )
-def send_webhook_request_async(self, event_delivery_id):
+def send_webhook_request_async(self, event_delivery_id, postponements=0):
     delivery = get_delivery_for_webhook(event_delivery_id)
     if not delivery:
         return None
 
     webhook = delivery.webhook
+    use_circuit_breaker = settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED
+    if use_circuit_breaker:
+        if retry_after := circuit_breaker.acquire_request_slot(webhook.target_url):
+            postpone_webhook_request(self, delivery, retry_after, postponements)
+            return None
     domain = get_domain()
     attempt = create_attempt(delivery, self.request.id)
     delivery_status = EventDeliveryStatus.SUCCESS
@@ -250,7 +290,10 @@ def send_webhook_request_async(self, event_delivery_id):
                 f"Event delivery id: %{event_delivery_id}r has no payload."
             )
         data = delivery.payload.payload
-        with webhooks_opentracing_trace(delivery.event_type, domain, app=webhook.app):
+        with (
+            webhooks_opentracing_trace(delivery.event_type, domain, app=webhook.app),
+            catch_duration_time() as duration,
+        ):
             response = send_webhook_using_scheme_method(
                 webhook.target_url,
                 domain,
@@ -259,6 +302,8 @@ def send_webhook_request_async(self, event_delivery_id):
                 data,
                 webhook.custom_headers,
             )
+        if use_circuit_breaker:
+            circuit_breaker.record_response(webhook.target_url, response, duration())
 
         attempt_update(attempt, response)
         if response.status == EventDeliveryStatus.FAILED:
@@ -277,10 +322,352 @@ def send_webhook_request_async(self, event_delivery_id):
         response = WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED)
         attempt_update(attempt, response)
         delivery_update(delivery=delivery, status=EventDeliveryStatus.FAILED)
+    finally:
+        if use_circuit_breaker:
+            circuit_breaker.release_request_slot(webhook.target_url)
     observability.report_event_delivery_attempt(attempt)
     clear_successful_delivery(delivery)
 
 
+def postpone_webhook_request(
+    task, delivery: EventDelivery, countdown: int, postponements: int
+):
+    """Schedule the delivery again, when the target can't take the request now.
+
+    Postponing because of an open circuit records a failed attempt, which also keeps
+    the delivery from being claimed by the batch dispatcher, and counts as a retry,
+    so the deliveries to a target that stays unavailable fail after the retry limit.
+    Postponing because of the limit of requests in flight doesn't record an attempt
+    and the delivery fails after `WEBHOOK_TARGET_MAX_POSTPONEMENTS` postponements.
+    """
+    if not circuit_breaker.is_circuit_open(delivery.webhook.target_url):
+        if postponements < settings.WEBHOOK_TARGET_MAX_POSTPONEMENTS:
+            task_logger.info(
+                "Event delivery id: %r postponed by %ss, the target is busy.",
+                delivery.pk,
+                countdown,
+            )
+            delivery_info = task.request.delivery_info or {}
+            task.apply_async(
+                kwargs={
+                    "event_delivery_id": delivery.pk,
+                    "postponements": postponements + 1,
+                },
+                queue=delivery_info.get("routing_key")
+                or settings.WEBHOOK_CELERY_QUEUE_NAME,
+                countdown=countdown,
+                retries=task.request.retries,
+            )
+            return
+        task_logger.info(
+            "Event delivery id: %r exceeded postponement limit, the target is busy.",
+            delivery.pk,
+        )
+        attempt = create_attempt(delivery, task.request.id)
+        attempt_update(
+            attempt,
+            WebhookResponse(
+                content="Delivery postponed too many times, the target is busy.",
+                status=EventDeliveryStatus.FAILED,
+            ),
+        )
+        delivery_update(delivery, EventDeliveryStatus.FAILED)
+        observability.report_event_delivery_attempt(attempt)
+        return
+
+    attempt = create_attempt(delivery, task.request.id)
+    attempt_update(attempt, _get_postponed_response())
+    task_logger.info(
+        "Event delivery id: %r postponed by %ss, the target is unavailable.",
+        delivery.pk,
+        countdown,
+    )
+    try:
+        task.retry(countdown=countdown, **task.retry_kwargs)
+    except Retry as retry_error:
+        next_retry = observability.task_next_retry_date(retry_error)
+        observability.report_event_delivery_attempt(attempt, next_retry)
+        raise retry_error
+    except MaxRetriesExceededError:
+        task_logger.info(
+            "Event delivery id: %r exceeded retry limit, the target is unavailable.",
+            delivery.pk,
+        )
+        delivery_update(delivery, EventDeliveryStatus.FAILED)
+        observability.report_event_delivery_attempt(attempt)
+
+
+def _get_postponed_response() -> WebhookResponse:
+    return WebhookResponse(
+        content="Delivery postponed, the target is unavailable.",
+        status=EventDeliveryStatus.FAILED,
+    )
+
+
+def schedule_webhook_requests_batch(queue=None):
+    """Schedule the dispatcher of pending deliveries unless it's already scheduled.
+
+    The dispatcher is delayed by `WEBHOOK_BATCH_DELIVERY_DELAY` so the deliveries
+    created in the meantime are sent in the same batch. Deliveries committed after
+    the dispatcher run are picked up by the next one or by the periodic run.
+    """
+    delay = settings.WEBHOOK_BATCH_DELIVERY_DELAY
+    if cache.add(WEBHOOK_BATCH_DELIVERY_SCHEDULED_KEY, True, timeout=delay):
+        send_webhook_requests_batch_task.apply_async(
+            queue=queue or settings.WEBHOOK_CELERY_QUEUE_NAME, countdown=delay
+        )
+
+
+@allow_writer()
+def _claim_pending_deliveries(
+    batch_size: int, task_id: Optional[str]
+) -> tuple[int, list[tuple[EventDelivery, EventDeliveryAttempt]]]:
+    """Lock pending deliveries that were not attempted yet and create attempts.
+
+    Deliveries that already have an attempt are handled by the retry task. This
+    includes the deliveries postponed by `send_webhook_request_async` because of an
+    open circuit, which records a postponed attempt before scheduling the delivery
+    again. With the batch delivery enabled, the deliveries are passed to that task
+    only after an attempt, so the deliveries it postpones for the limit of requests
+    in flight are not claimed either.
+    Return the number of fetched deliveries and the deliveries to send with their
+    attempts.
+    """
+    with transaction.atomic():
+        deliveries = list(
+            EventDelivery.objects.select_for_update(of=("self",), skip_locked=True)
+            .filter(status=EventDeliveryStatus.PENDING)
+            .filter(
+                ~Exists(EventDeliveryAttempt.objects.filter(delivery=OuterRef("pk")))
+            )
+            .select_related("payload", "webhook__app")
+            .order_by("pk")[:batch_size]
+        )
+        if inactive_deliveries := [d for d in deliveries if not d.webhook.is_active]:
+            bulk_delivery_update(inactive_deliveries, EventDeliveryStatus.FAILED)
+            logger.info(
+                "Event delivery ids: %r webhooks are disabled.",
+                [delivery.pk for delivery in inactive_deliveries],
+            )
+        active_deliveries = [d for d in deliveries if d.webhook.is_active]
+        attempts = create_attempts(active_deliveries, task_id)
+    return len(deliveries), list(zip(active_deliveries, attempts))
+
+
+def _send_delivery(
+    delivery: EventDelivery, domain: str, session
+) -> tuple[WebhookResponse, Optional[int]]:
+    """Send the delivery payload.
+
+    Return the response and the countdown after which the delivery should be
+    retried, or None when it shouldn't be retried.
+    """
+    webhook = delivery.webhook
+    use_circuit_breaker = settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED
+    if use_circuit_breaker:
+        if retry_after := circuit_breaker.acquire_request_slot(webhook.target_url):
+            return _get_postponed_response(), retry_after
+    try:
+        if not delivery.payload:
+            raise ValueError(f"Event delivery id: {delivery.pk!r} has no payload.")
+        with (
+            webhooks_opentracing_trace(delivery.event_type, domain, app=webhook.app),
+            catch_duration_time() as duration,
+        ):
+            response = send_webhook_using_scheme_method(
+                webhook.target_url,
+                domain,
+                webhook.secret_key,
+                delivery.event_type,
+                delivery.payload.payload,
+                webhook.custom_headers,
+                session=session,
+            )
+    except ValueError as e:
+        response = WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED)
+        return response, None
+    except Exception:
+        # the other deliveries of the batch are still sent
+        logger.exception("Sending event delivery id: %r failed.", delivery.pk)
+        response = WebhookResponse(
+            content="Unexpected error while sending the request.",
+            status=EventDeliveryStatus.FAILED,
+        )
+        return response, send_webhook_request_async.retry_backoff
+    finally:
+        if use_circuit_breaker:
+            circuit_breaker.release_request_slot(webhook.target_url)
+    if use_circuit_breaker:
+        circuit_breaker.record_response(webhook.target_url, response, duration())
+    # do not retry for 30x and 40x status codes
+    if circuit_breaker.is_target_failure(response):
+        return response, send_webhook_request_async.retry_backoff
+    return response, None
+
+
+def _send_deliveries_to_host(
+    deliveries_attempts: list[tuple[EventDelivery, EventDeliveryAttempt]],
+    domain: str,
+) -> list[tuple[WebhookResponse, Optional[int]]]:
+    # a single session keeps the connection to the host alive between requests
+    with HTTPClient.get_session() as session:
+        return [
+            _send_delivery(delivery, domain, session)
+            for delivery, _attempt in deliveries_attempts
+        ]
+
+
+def _save_batch_results(
+    results: list[
+        tuple[
+            tuple[EventDelivery, EventDeliveryAttempt],
+            tuple[WebhookResponse, Optional[int]],
+        ]
+    ],
+):
+    attempts_responses = []
+    deliveries_by_status = defaultdict(list)
+    retried_deliveries = []
+    for (delivery, attempt), (response, retry_countdown) in results:
+        attempts_responses.append((attempt, response))
+        webhook = delivery.webhook
+        if response.status == EventDeliveryStatus.SUCCESS:
+            deliveries_by_status[EventDeliveryStatus.SUCCESS].append(delivery)
+            task_logger.info(
+                "[Webhook ID:%r] Payload sent to %r for event %r. Delivery id: %r",
+                webhook.id,
+                webhook.target_url,
+                delivery.event_type,
+                delivery.id,
+            )
+            continue
+        task_logger.info(
+            "[Webhook ID: %r] Failed request to %r: %r for event: %r."
+            " Delivery attempt id: %r",
+            webhook.id,
+            webhook.target_url,
+            response.content,
+            delivery.event_type,
+            attempt.id,
+        )
+        if retry_countdown is not None:
+            retried_deliveries.append((delivery, retry_countdown))
+        else:
+            deliveries_by_status[EventDeliveryStatus.FAILED].append(delivery)
+
+    if attempts_responses:
+        bulk_attempt_update(attempts_responses)
+    for status, deliveries in deliveries_by_status.items():
+        bulk_delivery_update(deliveries, status)
+    for attempt, _response in attempts_responses:
+        observability.report_event_delivery_attempt(attempt)
+    for delivery, retry_countdown in retried_deliveries:
+        send_webhook_request_async.apply_async(
+            kwargs={"event_delivery_id": delivery.id},
+            queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
+            countdown=retry_countdown,
+        )
+    clear_successful_deliveries(deliveries_by_status[EventDeliveryStatus.SUCCESS])
+
+
+@allow_writer()
+def _requeue_stale_deliveries(batch_size: int) -> int:
+    """Fail the stale attempts of pending deliveries and send the deliveries again.
+
+    The dispatcher creates the attempts before sending the deliveries, so when it is
+    killed, its deliveries stay pending with an unfinished attempt and are not
+    claimed again. Return the number of requeued deliveries.
+    """
+    stale_before = timezone.now() - datetime.timedelta(
+        seconds=settings.WEBHOOK_BATCH_DELIVERY_STALE_TIMEOUT
+    )
+    latest_attempts = EventDeliveryAttempt.objects.filter(
+        delivery=OuterRef("delivery_id")
+    ).order_by("-created_at", "-pk")
+    with transaction.atomic():
+        stale_attempts = list(
+            EventDeliveryAttempt.objects.select_for_update(
+                of=("self",), skip_locked=True
+            )
+            .filter(
+                status=EventDeliveryStatus.PENDING,
+                created_at__lt=stale_before,
+                delivery__status=EventDeliveryStatus.PENDING,
+                pk=Subquery(latest_attempts.values("pk")[:1]),
+            )
+            .order_by("pk")[:batch_size]
+        )
+        response = WebhookResponse(
+            content="Delivery attempt abandoned, the delivery is sent again.",
+            status=EventDeliveryStatus.FAILED,
+        )
+        bulk_attempt_update([(attempt, response) for attempt in stale_attempts])
+    for attempt in stale_attempts:
+        send_webhook_request_async.apply_async(
+            kwargs={"event_delivery_id": attempt.delivery_id},
+            queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
+        )
+    if stale_attempts:
+        logger.warning(
+            "Event delivery ids: %r had stale attempts and were scheduled again.",
+            [attempt.delivery_id for attempt in stale_attempts],
+        )
+    return len(stale_attempts)
+
+
+@app.task(queue=settings.WEBHOOK_CELERY_QUEUE_NAME, bind=True)
+def send_webhook_requests_batch_task(self):
+    """Send a batch of pending deliveries, grouped by the target host.
+
+    Hosts are handled concurrently and the attempts and deliveries of each host are
+    updated in bulk as soon as its requests are done. Deliveries that failed with a
+    retryable error are passed to `send_webhook_request_async`, which retries them
+    with a backoff. Deliveries left with unfinished attempts by a killed dispatcher
+    are sent again after `WEBHOOK_BATCH_DELIVERY_STALE_TIMEOUT`.
+    """
+    batch_size = settings.WEBHOOK_BATCH_DELIVERY_SIZE
+    _requeue_stale_deliveries(batch_size)
+    fetched_count, deliveries_attempts = _claim_pending_deliveries(
+        batch_size, self.request.id
+    )
+
+    deliveries_by_host = defaultdict(list)
+    for delivery, attempt in deliveries_attempts:
+        host = urlparse(delivery.webhook.target_url).netloc
+        deliveries_by_host[host].append((delivery, attempt))
+
+    domain = get_domain()
+    if deliveries_by_host:
+        max_workers = min(
+            settings.WEBHOOK_BATCH_DELIVERY_MAX_WORKERS, len(deliveries_by_host)
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_send_deliveries_to_host, group, domain): group
+                for group in deliveries_by_host.values()
+            }
+            # the results are saved per host, so a slow host doesn't delay the others
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    group_responses = future.result()
+                except Exception:
+                    logger.exception("Sending event deliveries to a host failed.")
+                    response = WebhookResponse(
+                        content="Unexpected error while sending the request.",
+                        status=EventDeliveryStatus.FAILED,
+                    )
+                    retry_countdown = send_webhook_request_async.retry_backoff
+                    group_responses = [(response, retry_countdown)] * len(group)
+                _save_batch_results(list(zip(group, group_responses)))
+
+    if fetched_count >= batch_size:
+        # more deliveries are probably waiting
+        send_webhook_requests_batch_task.apply_async(
+            queue=settings.WEBHOOK_CELERY_QUEUE_NAME
+        )
+
+
 def send_observability_events(webhooks: list[WebhookData], events: list[bytes]):
     event_type = WebhookEventAsyncType.OBSERVABILITY
     for webhook in webhooks:
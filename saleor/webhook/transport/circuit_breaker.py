@@ -0,0 +1,212 @@
+"""Health tracking of webhook targets shared between workers.
+
+Failed requests to a target URL are counted in the cache. When the number of
+failures within `WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW` reaches the threshold, the
+circuit is opened and no requests are sent to the target for
+`WEBHOOK_CIRCUIT_BREAKER_COOLDOWN`. After that time a single probe request is let
+through; the circuit is closed when it succeeds and opened again when it fails.
+
+The number of concurrent requests to a target is limited to
+`WEBHOOK_TARGET_MAX_IN_FLIGHT` and lowered proportionally when the average response
+time of the target exceeds `WEBHOOK_TARGET_LATENCY_THRESHOLD`.
+"""
+
+import hashlib
+import logging
+import time
+from math import ceil
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ...core import EventDeliveryStatus
+
+if TYPE_CHECKING:
+    from .utils import WebhookResponse
+
+logger = logging.getLogger(__name__)
+
+# weight of the last response time in the average response time of the target
+LATENCY_SMOOTHING_FACTOR = 0.2
+LATENCY_EXPIRE_TIME = 3600
+# time after which the in-flight counter is reset, in case a worker was killed
+# before releasing its slot
+IN_FLIGHT_EXPIRE_TIME = 60
+# time for which the circuit stays half-open after the cooldown
+TRIPPED_EXPIRE_TIME = 3600
+
+
+def _get_target_hash(target_url: str) -> str:
+    return hashlib.sha256(target_url.encode("utf-8")).hexdigest()
+
+
+def get_cache_key_failures(target_url: str) -> str:
+    return f"webhook:target:{_get_target_hash(target_url)}:failures"
+
+
+def get_cache_key_open(target_url: str) -> str:
+    return f"webhook:target:{_get_target_hash(target_url)}:open"
+
+
+def get_cache_key_tripped(target_url: str) -> str:
+    return f"webhook:target:{_get_target_hash(target_url)}:tripped"
+
+
+def get_cache_key_probe(target_url: str) -> str:
+    return f"webhook:target:{_get_target_hash(target_url)}:probe"
+
+
+def get_cache_key_in_flight(target_url: str) -> str:
+    return f"webhook:target:{_get_target_hash(target_url)}:in_flight"
+
+
+def get_cache_key_latency(target_url: str) -> str:
+    return f"webhook:target:{_get_target_hash(target_url)}:latency"
+
+
+def _increment(key: str, timeout: int) -> int:
+    # `cache.add` returns False and does nothing, when key already exists
+    if cache.add(key, 1, timeout=timeout):
+        return 1
+    try:
+        return cache.incr(key, 1)
+    except ValueError:
+        # the key expired in the meantime
+        cache.add(key, 1, timeout=timeout)
+        return 1
+
+
+def _check_circuit(target_url: str) -> tuple[int, bool]:
+    """Return the seconds for which requests are blocked and if the probe was taken."""
+    if open_until := cache.get(get_cache_key_open(target_url)):
+        return max(ceil(open_until - time.time()), 1), False
+    if cache.get(get_cache_key_tripped(target_url)):
+        cooldown = settings.WEBHOOK_CIRCUIT_BREAKER_COOLDOWN
+        if not cache.add(get_cache_key_probe(target_url), True, timeout=cooldown):
+            return cooldown, False
+        return 0, True
+    return 0, False
+
+
+def get_circuit_retry_after(target_url: str) -> int:
+    """Return the number of seconds for which requests to the target are blocked.
+
+    Return 0 when the request can be sent. When the cooldown of an open circuit has
+    passed, only the first caller is allowed to send a probe request.
+    """
+    retry_after, _probe_taken = _check_circuit(target_url)
+    return retry_after
+
+
+def is_circuit_open(target_url: str) -> bool:
+    """Return whether the requests to the target are blocked by the circuit.
+
+    The circuit stays open until a probe request succeeds after the cooldown.
+    """
+    return bool(
+        cache.get_many(
+            [get_cache_key_open(target_url), get_cache_key_tripped(target_url)]
+        )
+    )
+
+
+def get_max_in_flight(target_url: str) -> int:
+    max_in_flight = settings.WEBHOOK_TARGET_MAX_IN_FLIGHT
+    latency = cache.get(get_cache_key_latency(target_url))
+    threshold = settings.WEBHOOK_TARGET_LATENCY_THRESHOLD
+    if latency is None or latency <= threshold:
+        return max_in_flight
+    return max(int(max_in_flight * threshold / latency), 1)
+
+
+def acquire_request_slot(target_url: str) -> int:
+    """Reserve a slot for a request to the target.
+
+    Return 0 when the slot was reserved and `release_request_slot` has to be called
+    after the request. Otherwise, return the number of seconds after which the
+    request should be tried again.
+    """
+    retry_after, probe_taken = _check_circuit(target_url)
+    if retry_after:
+        return retry_after
+    key = get_cache_key_in_flight(target_url)
+    if _increment(key, IN_FLIGHT_EXPIRE_TIME) > get_max_in_flight(target_url):
+        release_request_slot(target_url)
+        if probe_taken:
+            # the probe request is not sent, so the next caller can send it
+            cache.delete(get_cache_key_probe(target_url))
+        latency = cache.get(get_cache_key_latency(target_url)) or 1
+        return max(ceil(latency), 1)
+    return 0
+
+
+def release_request_slot(target_url: str):
+    key = get_cache_key_in_flight(target_url)
+    try:
+        if cache.decr(key, 1) < 0:
+            cache.delete(key)
+    except ValueError:
+        pass
+
+
+def _update_latency(target_url: str, duration: float):
+    key = get_cache_key_latency(target_url)
+    latency = cache.get(key)
+    if latency is not None:
+        duration = (
+            LATENCY_SMOOTHING_FACTOR * duration
+            + (1 - LATENCY_SMOOTHING_FACTOR) * latency
+        )
+    cache.set(key, duration, timeout=LATENCY_EXPIRE_TIME)
+
+
+def _open_circuit(target_url: str):
+    cooldown = settings.WEBHOOK_CIRCUIT_BREAKER_COOLDOWN
+    cache.set(get_cache_key_open(target_url), time.time() + cooldown, timeout=cooldown)
+    cache.set(get_cache_key_tripped(target_url), True, timeout=TRIPPED_EXPIRE_TIME)
+    cache.delete_many(
+        [get_cache_key_failures(target_url), get_cache_key_probe(target_url)]
+    )
+    logger.warning(
+        "Too many failed requests to %r, requests postponed for %ss.",
+        target_url,
+        cooldown,
+    )
+
+
+def _close_circuit(target_url: str):
+    cache.delete_many(
+        [
+            get_cache_key_tripped(target_url),
+            get_cache_key_probe(target_url),
+            get_cache_key_failures(target_url),
+        ]
+    )
+    logger.info("Requests to %r are sent again.", target_url)
+
+
+def is_target_failure(response: "WebhookResponse") -> bool:
+    """Return whether the response indicates that the target is unavailable.
+
+    Responses with 30x and 40x status codes are sent by a working target.
+    """
+    status_code = response.response_status_code
+    return response.status == EventDeliveryStatus.FAILED and not (
+        status_code and 300 <= status_code < 500
+    )
+
+
+def record_response(target_url: str, response: "WebhookResponse", duration: float):
+    _update_latency(target_url, duration)
+    if is_target_failure(response):
+        failures = _increment(
+            get_cache_key_failures(target_url),
+            settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW,
+        )
+        if failures >= settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD or cache.get(
+            get_cache_key_tripped(target_url)
+        ):
+            _open_circuit(target_url)
+    elif cache.get(get_cache_key_tripped(target_url)):
+        _close_circuit(target_url)
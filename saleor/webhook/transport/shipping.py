@@ -19,7 +19,7 @@ from ...plugins.base_plugin import ExcludedShippingMethod
 from ...shipping.interface import ShippingMethodData
 from ...webhook.utils import get_webhooks_for_event
 from ..const import APP_ID_PREFIX, CACHE_EXCLUDED_SHIPPING_TIME
-from .synchronous.transport import trigger_webhook_sync
+from .synchronous.transport import trigger_webhooks_sync
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +126,7 @@ def get_excluded_shipping_methods_or_fetch(
     """Return data of all excluded shipping methods.
 
     The data will be fetched from the cache. If missing it will fetch it from all
-    defined webhooks by calling a request to each of them one by one.
+    defined webhooks by sending the requests to all of them concurrently.
     """
     cached_data = cache.get(cache_key)
     if cached_data:
@@ -138,17 +138,15 @@ def get_excluded_shipping_methods_or_fetch(
 
     excluded_methods = []
     # Gather responses from webhooks
-    for webhook in webhooks:
-        if not webhook:
-            continue
-        response_data = trigger_webhook_sync(
-            event_type,
-            payload,
-            webhook,
-            allow_replica,
-            subscribable_object=subscribable_object,
-            timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-        )
+    responses = trigger_webhooks_sync(
+        event_type,
+        payload,
+        webhooks,
+        allow_replica,
+        subscribable_object=subscribable_object,
+        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
+    )
+    for response_data in responses:
         if response_data and isinstance(response_data, dict):
             excluded_methods.extend(
                 get_excluded_shipping_methods_from_response(response_data)
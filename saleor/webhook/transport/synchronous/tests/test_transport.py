@@ -0,0 +1,307 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from .....core import EventDeliveryStatus
+from .....core.models import EventDelivery, EventPayload
+from ....event_types import WebhookEventSyncType
+from ....models import Webhook
+from ...utils import WebhookResponse, generate_cache_key_for_webhook
+from ..transport import (
+    send_webhook_requests_sync,
+    trigger_webhook_sync_if_not_cached,
+    trigger_webhooks_sync,
+)
+
+EVENT_TYPE = WebhookEventSyncType.SHIPPING_LIST_METHODS_FOR_CHECKOUT
+CACHE_DATA = {"checkout": "data"}
+RESPONSE = [{"id": "method-1"}]
+NEW_RESPONSE = [{"id": "method-2"}]
+
+
+@pytest.fixture
+def cache_key(webhook):
+    cache_key = generate_cache_key_for_webhook(
+        CACHE_DATA, webhook.target_url, EVENT_TYPE, webhook.app_id
+    )
+    yield cache_key
+    cache.delete_many([cache_key, f"{cache_key}:lock"])
+
+
+def _trigger(webhook):
+    return trigger_webhook_sync_if_not_cached(
+        EVENT_TYPE,
+        "payload",
+        webhook,
+        CACHE_DATA,
+        allow_replica=False,
+        request_timeout=1,
+        cache_timeout=10,
+    )
+
+
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_returns_fresh_response(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    cache.set(cache_key, (time.time() + 10, RESPONSE))
+
+    # when
+    response = _trigger(webhook)
+
+    # then
+    assert response == RESPONSE
+    mocked_trigger_webhook_sync.assert_not_called()
+
+
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_refreshes_expired_response(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    cache.set(cache_key, (time.time() - 1, RESPONSE))
+    mocked_trigger_webhook_sync.return_value = NEW_RESPONSE
+
+    # when
+    response = _trigger(webhook)
+
+    # then
+    assert response == NEW_RESPONSE
+    mocked_trigger_webhook_sync.assert_called_once()
+    fresh_until, cached_response = cache.get(cache_key)
+    assert cached_response == NEW_RESPONSE
+    assert fresh_until > time.time()
+    assert cache.get(f"{cache_key}:lock") is None
+
+
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_returns_stale_response_when_locked(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    cache.set(cache_key, (time.time() - 1, RESPONSE))
+    # the response is refreshed by another worker
+    cache.add(f"{cache_key}:lock", True)
+
+    # when
+    response = _trigger(webhook)
+
+    # then
+    assert response == RESPONSE
+    mocked_trigger_webhook_sync.assert_not_called()
+    assert cache.get(f"{cache_key}:lock") is True
+
+
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_returns_stale_response_on_failure(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    cache.set(cache_key, (time.time() - 1, RESPONSE))
+    mocked_trigger_webhook_sync.return_value = None
+
+    # when
+    response = _trigger(webhook)
+
+    # then
+    assert response == RESPONSE
+    mocked_trigger_webhook_sync.assert_called_once()
+    assert cache.get(f"{cache_key}:lock") is None
+
+
+@patch(
+    "saleor.webhook.transport.synchronous.transport.SYNC_WEBHOOK_CACHE_POLL_INTERVAL", 0
+)
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_waits_for_locked_request(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    cache.add(f"{cache_key}:lock", True)
+    cached_values = iter([None, (time.time() + 10, RESPONSE)])
+
+    # when
+    # the other worker caches the response while the request waits
+    with patch(
+        "saleor.webhook.transport.synchronous.transport._get_cached_response",
+        side_effect=lambda key: (
+            (value[1], True) if (value := next(cached_values)) else (None, False)
+        ),
+    ):
+        response = _trigger(webhook)
+
+    # then
+    assert response == RESPONSE
+    mocked_trigger_webhook_sync.assert_not_called()
+
+
+@patch(
+    "saleor.webhook.transport.synchronous.transport.SYNC_WEBHOOK_CACHE_POLL_INTERVAL", 0
+)
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_sends_request_when_lock_released(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    mocked_trigger_webhook_sync.return_value = NEW_RESPONSE
+    # the lock is released without caching the response, as the request failed
+    with patch(
+        "saleor.webhook.transport.synchronous.transport.cache.add",
+        side_effect=[False, True],
+    ):
+        # when
+        response = _trigger(webhook)
+
+    # then
+    assert response == NEW_RESPONSE
+    mocked_trigger_webhook_sync.assert_called_once()
+
+
+@patch(
+    "saleor.webhook.transport.synchronous.transport.SYNC_WEBHOOK_CACHE_POLL_INTERVAL", 0
+)
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_does_not_send_request_after_wait_timeout(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    # the lock is held by another worker until the request timeout
+    cache.add(f"{cache_key}:lock", True)
+
+    # when
+    response = _trigger(webhook)
+
+    # then
+    assert response is None
+    mocked_trigger_webhook_sync.assert_not_called()
+
+
+@patch("saleor.webhook.transport.synchronous.transport.trigger_webhook_sync")
+def test_trigger_webhook_sync_if_not_cached_resends_failed_request_once(
+    mocked_trigger_webhook_sync, webhook, cache_key
+):
+    # given
+    workers_count = 5
+    first_request_started = threading.Event()
+
+    def trigger_webhook_sync(*args, **kwargs):
+        if not first_request_started.is_set():
+            first_request_started.set()
+            # the other workers wait for the response while the request fails
+            time.sleep(0.2)
+            return None
+        return NEW_RESPONSE
+
+    mocked_trigger_webhook_sync.side_effect = trigger_webhook_sync
+    responses = []
+
+    def worker():
+        responses.append(_trigger(webhook))
+
+    first_worker = threading.Thread(target=worker)
+    first_worker.start()
+    first_request_started.wait(timeout=5)
+    other_workers = [threading.Thread(target=worker) for _ in range(workers_count - 1)]
+
+    # when
+    for thread in other_workers:
+        thread.start()
+    for thread in [first_worker, *other_workers]:
+        thread.join(timeout=5)
+
+    # then
+    assert mocked_trigger_webhook_sync.call_count == 2
+    assert sorted(responses, key=bool) == [None] + [NEW_RESPONSE] * (workers_count - 1)
+
+
+@pytest.fixture
+def sync_deliveries(webhook, app):
+    second_webhook = Webhook.objects.create(
+        name="second webhook", app=app, target_url="http://www.example.com/second"
+    )
+    payload = EventPayload.objects.create_with_payload('{"key": "data"}')
+    return [
+        EventDelivery.objects.create(
+            event_type=EVENT_TYPE, payload=payload, webhook=delivery_webhook
+        )
+        for delivery_webhook in [webhook, second_webhook]
+    ]
+
+
+@patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_send_webhook_requests_sync(mocked_send_webhook_using_http, sync_deliveries):
+    # given
+    # the requests finish only when both of them are sent at the same time
+    barrier = threading.Barrier(len(sync_deliveries), timeout=5)
+
+    def send_request(target_url, *args, **kwargs):
+        barrier.wait()
+        return WebhookResponse(content=json.dumps({"url": target_url}))
+
+    mocked_send_webhook_using_http.side_effect = send_request
+
+    # when
+    responses = send_webhook_requests_sync(sync_deliveries, timeout=5)
+
+    # then
+    assert responses == [
+        {"url": delivery.webhook.target_url} for delivery in sync_deliveries
+    ]
+    # successful deliveries are removed
+    assert not EventDelivery.objects.exists()
+
+
+@patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_send_webhook_requests_sync_cuts_off_slow_requests(
+    mocked_send_webhook_using_http, sync_deliveries
+):
+    # given
+    slow_delivery, fast_delivery = sync_deliveries
+    release = threading.Event()
+
+    def send_request(target_url, *args, **kwargs):
+        if target_url == slow_delivery.webhook.target_url:
+            release.wait(timeout=5)
+        return WebhookResponse(content=json.dumps({"url": target_url}))
+
+    mocked_send_webhook_using_http.side_effect = send_request
+
+    # when
+    try:
+        responses = send_webhook_requests_sync(sync_deliveries, timeout=0.2)
+    finally:
+        release.set()
+
+    # then
+    assert responses == [None, {"url": fast_delivery.webhook.target_url}]
+    slow_delivery.refresh_from_db()
+    assert slow_delivery.status == EventDeliveryStatus.FAILED
+    assert slow_delivery.attempts.get().response == "Request timed out."
+    assert not EventDelivery.objects.filter(pk=fast_delivery.pk).exists()
+
+
+@patch("saleor.webhook.transport.synchronous.transport.send_webhook_requests_sync")
+def test_trigger_webhooks_sync_returns_responses_in_webhooks_order(
+    mocked_send_webhook_requests_sync, webhook, app
+):
+    # given
+    second_webhook = Webhook.objects.create(
+        name="second webhook", app=app, target_url="http://www.example.com/second"
+    )
+    mocked_send_webhook_requests_sync.return_value = [RESPONSE, NEW_RESPONSE]
+
+    # when
+    responses = trigger_webhooks_sync(
+        EVENT_TYPE, '{"key": "data"}', [webhook, second_webhook], False
+    )
+
+    # then
+    assert responses == [RESPONSE, NEW_RESPONSE]
+    ((deliveries,), _) = mocked_send_webhook_requests_sync.call_args
+    assert [delivery.webhook for delivery in deliveries] == [webhook, second_webhook]
+    assert deliveries[0].payload == deliveries[1].payload
@@ -1,12 +1,17 @@
 import json
 import logging
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
 from json import JSONDecodeError
+from math import ceil
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 from urllib.parse import urlparse
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 
 from ....celeryconf import app
 from ....core import EventDeliveryStatus
@@ -51,6 +56,9 @@ R = TypeVar("R")
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
 
+# time between the checks whether the response requested by other worker is cached
+SYNC_WEBHOOK_CACHE_POLL_INTERVAL = 0.05
+
 
 @app.task(
     bind=True,
@@ -85,46 +93,44 @@ def handle_transaction_request_task(self, delivery_id, request_event_id):
     )
 
 
-def _send_webhook_request_sync(
-    delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
-) -> tuple[WebhookResponse, Optional[dict[Any, Any]]]:
-    event_payload = delivery.payload
-    data = event_payload.payload
+def _prepare_webhook_request_sync(delivery) -> tuple[bytes, str]:
+    data = delivery.payload.payload
     webhook = delivery.webhook
     parts = urlparse(webhook.target_url)
-    domain = get_domain()
     message = data.encode("utf-8")
     signature = signature_for_payload(message, webhook.secret_key)
 
     if parts.scheme.lower() not in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
         delivery_update(delivery, EventDeliveryStatus.FAILED)
         raise ValueError(f"Unknown webhook scheme: {parts.scheme!r}")
+    return message, signature
 
+
+def _send_webhook_using_http_sync(
+    webhook, event_type, message, signature, domain, timeout
+) -> WebhookResponse:
     logger.debug(
         "[Webhook] Sending payload to %r for event %r.",
         webhook.target_url,
-        delivery.event_type,
+        event_type,
     )
-    if attempt is None:
-        attempt = create_attempt(delivery=delivery, task_id=None)
-    response = WebhookResponse(content="")
-    response_data = None
+    with webhooks_opentracing_trace(event_type, domain, sync=True, app=webhook.app):
+        return send_webhook_using_http(
+            webhook.target_url,
+            message,
+            domain,
+            signature,
+            event_type,
+            timeout=timeout,
+            custom_headers=webhook.custom_headers,
+        )
 
-    try:
-        with webhooks_opentracing_trace(
-            delivery.event_type, domain, sync=True, app=webhook.app
-        ):
-            response = send_webhook_using_http(
-                webhook.target_url,
-                message,
-                domain,
-                signature,
-                delivery.event_type,
-                timeout=timeout,
-                custom_headers=webhook.custom_headers,
-            )
-            response_data = json.loads(response.content)
 
+def _parse_webhook_response_sync(
+    webhook, attempt, response: WebhookResponse
+) -> Optional[dict[Any, Any]]:
+    try:
+        response_data = json.loads(response.content)
     except JSONDecodeError as e:
         logger.info(
             "[Webhook] Failed parsing JSON response from %r: %r."
@@ -134,27 +140,43 @@ def _send_webhook_request_sync(
             attempt.id,
         )
         response.status = EventDeliveryStatus.FAILED
-    else:
-        if response.status == EventDeliveryStatus.FAILED:
-            logger.info(
-                "[Webhook] Failed request to %r: %r. "
-                "ID of failed DeliveryAttempt: %r . ",
-                webhook.target_url,
-                response.content,
-                attempt.id,
-            )
-        if response.status == EventDeliveryStatus.SUCCESS:
-            logger.debug(
-                "[Webhook] Success response from %r."
-                "Successful DeliveryAttempt id: %r",
-                webhook.target_url,
-                attempt.id,
-            )
+        return None
+
+    if response.status == EventDeliveryStatus.FAILED:
+        logger.info(
+            "[Webhook] Failed request to %r: %r. ID of failed DeliveryAttempt: %r . ",
+            webhook.target_url,
+            response.content,
+            attempt.id,
+        )
+    if response.status == EventDeliveryStatus.SUCCESS:
+        logger.debug(
+            "[Webhook] Success response from %r.Successful DeliveryAttempt id: %r",
+            webhook.target_url,
+            attempt.id,
+        )
+    return response_data
 
+
+def _finish_webhook_request_sync(delivery, attempt, response: WebhookResponse):
     attempt_update(attempt, response)
     delivery_update(delivery, response.status)
     observability.report_event_delivery_attempt(attempt)
     clear_successful_delivery(delivery)
+
+
+def _send_webhook_request_sync(
+    delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
+) -> tuple[WebhookResponse, Optional[dict[Any, Any]]]:
+    message, signature = _prepare_webhook_request_sync(delivery)
+    webhook = delivery.webhook
+    if attempt is None:
+        attempt = create_attempt(delivery=delivery, task_id=None)
+    response = _send_webhook_using_http_sync(
+        webhook, delivery.event_type, message, signature, get_domain(), timeout
+    )
+    response_data = _parse_webhook_response_sync(webhook, attempt, response)
+    _finish_webhook_request_sync(delivery, attempt, response)
     return response, response_data
 
 
@@ -165,6 +187,116 @@ def send_webhook_request_sync(
     return response_data if response.status == EventDeliveryStatus.SUCCESS else None
 
 
+def send_webhook_requests_sync(
+    deliveries: list[EventDelivery], timeout=settings.WEBHOOK_SYNC_TIMEOUT
+) -> list[Optional[dict[Any, Any]]]:
+    """Send synchronous webhook requests concurrently.
+
+    Only the HTTP requests are sent from the threads, the deliveries and attempts
+    are updated in the current thread. All requests share the deadline of the total
+    request timeout. Requests not finished before the deadline are cut off and
+    treated as failed. Responses are returned in the order of the deliveries.
+    """
+    max_workers = min(len(deliveries), settings.WEBHOOK_SYNC_MAX_CONCURRENT_REQUESTS)
+    if max_workers <= 1:
+        return [
+            send_webhook_request_sync(delivery, timeout=timeout)
+            for delivery in deliveries
+        ]
+
+    total_timeout = _get_total_timeout(timeout)
+    deadline = time.monotonic() + total_timeout
+    domain = get_domain()
+    requests = []
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for delivery in deliveries:
+            message, signature = _prepare_webhook_request_sync(delivery)
+            attempt = create_attempt(delivery=delivery, task_id=None)
+            future = executor.submit(
+                _send_webhook_using_http_sync,
+                delivery.webhook,
+                delivery.event_type,
+                message,
+                signature,
+                domain,
+                timeout,
+            )
+            requests.append((delivery, attempt, future))
+        wait(
+            [future for _, _, future in requests],
+            timeout=max(deadline - time.monotonic(), 0),
+        )
+    finally:
+        # don't wait for the requests that are cut off
+        executor.shutdown(wait=False)
+
+    responses = []
+    for delivery, attempt, future in requests:
+        if future.done():
+            response = future.result()
+            response_data = _parse_webhook_response_sync(
+                delivery.webhook, attempt, response
+            )
+        else:
+            logger.info(
+                "[Webhook] Request to %r cut off after %rs. "
+                "ID of failed DeliveryAttempt: %r . ",
+                delivery.webhook.target_url,
+                total_timeout,
+                attempt.id,
+            )
+            response = WebhookResponse(
+                content="Request timed out.",
+                status=EventDeliveryStatus.FAILED,
+                duration=total_timeout,
+            )
+            response_data = None
+        _finish_webhook_request_sync(delivery, attempt, response)
+        responses.append(
+            response_data if response.status == EventDeliveryStatus.SUCCESS else None
+        )
+    return responses
+
+
+def _get_total_timeout(timeout) -> float:
+    if isinstance(timeout, (tuple, list)):
+        return float(sum(timeout))
+    return float(timeout)
+
+
+def _get_cached_response(cache_key: str) -> tuple[Optional[dict], bool]:
+    """Return the cached response and whether it is still fresh."""
+    cached_data = cache.get(cache_key)
+    if cached_data is None:
+        return None, False
+    if not isinstance(cached_data, tuple):
+        # response cached without the freshness time
+        return cached_data, True
+    fresh_until, response_data = cached_data
+    return response_data, time.time() < fresh_until
+
+
+def _wait_for_cached_response(
+    cache_key: str, lock_key: str, timeout: float
+) -> tuple[Optional[dict], bool]:
+    """Wait for the response cached by the worker holding the lock.
+
+    When the lock is released without caching the response, as the request failed,
+    the waiting workers compete for the lock again, so only one of them sends
+    the request. Return the response and whether the lock was acquired.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(SYNC_WEBHOOK_CACHE_POLL_INTERVAL)
+        response_data, _ = _get_cached_response(cache_key)
+        if response_data is not None:
+            return response_data, False
+        if cache.add(lock_key, True, timeout=ceil(timeout)):
+            return None, True
+    return None, False
+
+
 def trigger_webhook_sync_if_not_cached(
     event_type: str,
     payload: str,
@@ -181,13 +313,35 @@ def trigger_webhook_sync_if_not_cached(
 
     - Send a synchronous webhook request if cache is expired.
     - Fetch response from cache if it is still valid.
+
+    Only one worker sends the request for the same cache key at a time. Others wait
+    for its response to be cached or, when an expired response is still kept for
+    `WEBHOOK_SYNC_CACHE_STALE_TIMEOUT`, return the expired response right away.
+    The expired response is also returned when the request fails. When the request
+    fails, one of the waiting workers sends it again, and the workers that don't get
+    the response within the request timeout return None.
     """
 
     cache_key = generate_cache_key_for_webhook(
         cache_data, webhook.target_url, event_type, webhook.app_id
     )
-    response_data = cache.get(cache_key)
-    if response_data is None:
+    cached_response_data, is_fresh = _get_cached_response(cache_key)
+    if is_fresh:
+        return cached_response_data
+
+    lock_key = f"{cache_key}:lock"
+    lock_timeout = _get_total_timeout(request_timeout or settings.WEBHOOK_SYNC_TIMEOUT)
+    locked = cache.add(lock_key, True, timeout=ceil(lock_timeout))
+    if not locked:
+        if cached_response_data is not None:
+            return cached_response_data
+        response_data, locked = _wait_for_cached_response(
+            cache_key, lock_key, lock_timeout
+        )
+        if not locked:
+            return response_data
+
+    try:
         response_data = trigger_webhook_sync(
             event_type,
             payload,
@@ -198,13 +352,18 @@ def trigger_webhook_sync_if_not_cached(
             request=request,
             requestor=requestor,
         )
-        if response_data is not None:
-            cache.set(
-                cache_key,
-                response_data,
-                timeout=cache_timeout or WEBHOOK_CACHE_DEFAULT_TIMEOUT,
-            )
-    return response_data
+        if response_data is None:
+            return cached_response_data
+        cache_timeout = cache_timeout or WEBHOOK_CACHE_DEFAULT_TIMEOUT
+        cache.set(
+            cache_key,
+            (time.time() + cache_timeout, response_data),
+            timeout=cache_timeout + settings.WEBHOOK_SYNC_CACHE_STALE_TIMEOUT,
+        )
+        return response_data
+    finally:
+        if locked:
+            cache.delete(lock_key)
 
 
 def create_delivery_for_subscription_sync_event(
@@ -256,8 +415,8 @@ def create_delivery_for_subscription_sync_event(
         # log the issue and continue without creating a delivery.
         return None
 
-    with allow_writer():
-        event_payload = EventPayload.objects.create(payload=json.dumps({**data}))
+    with allow_writer(), transaction.atomic():
+        event_payload = EventPayload.objects.create_with_payload(json.dumps({**data}))
         event_delivery = EventDelivery.objects.create(
             status=EventDeliveryStatus.PENDING,
             event_type=event_type,
@@ -267,19 +426,17 @@ def create_delivery_for_subscription_sync_event(
     return event_delivery
 
 
-def trigger_webhook_sync(
+def create_delivery_for_sync_event(
     event_type: str,
     payload: str,
     webhook: "Webhook",
     allow_replica,
     subscribable_object=None,
-    timeout=None,
     request=None,
     requestor=None,
-) -> Optional[dict[Any, Any]]:
-    """Send a synchronous webhook request."""
+) -> Optional[EventDelivery]:
     if webhook.subscription_query:
-        delivery = create_delivery_for_subscription_sync_event(
+        return create_delivery_for_subscription_sync_event(
             event_type=event_type,
             subscribable_object=subscribable_object,
             webhook=webhook,
@@ -287,17 +444,38 @@ def trigger_webhook_sync(
             request=request,
             allow_replica=allow_replica,
         )
-        if not delivery:
-            return None
-    else:
-        with allow_writer():
-            event_payload = EventPayload.objects.create(payload=payload)
-            delivery = EventDelivery.objects.create(
-                status=EventDeliveryStatus.PENDING,
-                event_type=event_type,
-                payload=event_payload,
-                webhook=webhook,
-            )
+    with allow_writer(), transaction.atomic():
+        event_payload = EventPayload.objects.create_with_payload(payload)
+        return EventDelivery.objects.create(
+            status=EventDeliveryStatus.PENDING,
+            event_type=event_type,
+            payload=event_payload,
+            webhook=webhook,
+        )
+
+
+def trigger_webhook_sync(
+    event_type: str,
+    payload: str,
+    webhook: "Webhook",
+    allow_replica,
+    subscribable_object=None,
+    timeout=None,
+    request=None,
+    requestor=None,
+) -> Optional[dict[Any, Any]]:
+    """Send a synchronous webhook request."""
+    delivery = create_delivery_for_sync_event(
+        event_type,
+        payload,
+        webhook,
+        allow_replica,
+        subscribable_object=subscribable_object,
+        request=request,
+        requestor=requestor,
+    )
+    if not delivery:
+        return None
 
     kwargs = {}
     if timeout:
@@ -306,6 +484,49 @@ def trigger_webhook_sync(
     return send_webhook_request_sync(delivery, **kwargs)
 
 
+def trigger_webhooks_sync(
+    event_type: str,
+    payload: str,
+    webhooks: Iterable["Webhook"],
+    allow_replica,
+    subscribable_object=None,
+    timeout=None,
+    request=None,
+    requestor=None,
+) -> list[Optional[dict[Any, Any]]]:
+    """Send synchronous webhook requests to all webhooks concurrently.
+
+    Return the responses in the order of the webhooks, with None for the webhooks
+    that didn't respond successfully before the deadline.
+    """
+    webhooks = list(webhooks)
+    deliveries = {}
+    for webhook in webhooks:
+        delivery = create_delivery_for_sync_event(
+            event_type,
+            payload,
+            webhook,
+            allow_replica,
+            subscribable_object=subscribable_object,
+            request=request,
+            requestor=requestor,
+        )
+        if delivery:
+            deliveries[webhook.pk] = delivery
+
+    kwargs = {}
+    if timeout:
+        kwargs = {"timeout": timeout}
+
+    responses = dict(
+        zip(
+            deliveries.keys(),
+            send_webhook_requests_sync(list(deliveries.values()), **kwargs),
+        )
+    )
+    return [responses.get(webhook.pk) for webhook in webhooks]
+
+
 def trigger_all_webhooks_sync(
     event_type: str,
     generate_payload: Callable,
@@ -345,10 +566,10 @@ def trigger_all_webhooks_sync(
             if not delivery:
                 return None
         else:
-            with allow_writer():
+            with allow_writer(), transaction.atomic():
                 if event_payload is None:
-                    event_payload = EventPayload.objects.create(
-                        payload=generate_payload()
+                    event_payload = EventPayload.objects.create_with_payload(
+                        generate_payload()
                     )
                 delivery = EventDelivery.objects.create(
                     status=EventDeliveryStatus.PENDING,
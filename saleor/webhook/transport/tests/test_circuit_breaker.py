@@ -0,0 +1,390 @@
+from unittest import mock
+
+import pytest
+from celery.exceptions import MaxRetriesExceededError, Retry
+from django.core.cache import cache
+from django.test import override_settings
+
+from ....core import EventDeliveryStatus
+from ....core.models import EventDeliveryAttempt
+from ..asynchronous.transport import (
+    send_webhook_request_async,
+    send_webhook_requests_batch_task,
+)
+from ..circuit_breaker import (
+    acquire_request_slot,
+    get_cache_key_in_flight,
+    get_cache_key_latency,
+    get_cache_key_open,
+    get_cache_key_probe,
+    get_circuit_retry_after,
+    get_max_in_flight,
+    record_response,
+    release_request_slot,
+)
+from ..utils import WebhookResponse
+
+TARGET_URL = "https://www.example.com/webhook"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _failed_response(status_code=None):
+    return WebhookResponse(
+        content="error",
+        response_status_code=status_code,
+        status=EventDeliveryStatus.FAILED,
+    )
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=3, WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30
+)
+def test_circuit_opened_after_failure_threshold():
+    # given
+    for _ in range(2):
+        record_response(TARGET_URL, _failed_response(), 1.0)
+    assert get_circuit_retry_after(TARGET_URL) == 0
+
+    # when
+    record_response(TARGET_URL, _failed_response(), 1.0)
+
+    # then
+    assert get_circuit_retry_after(TARGET_URL) == 30
+    assert get_circuit_retry_after("https://other.example.com/") == 0
+
+
+@override_settings(WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1)
+def test_circuit_not_opened_for_client_errors():
+    # when
+    record_response(TARGET_URL, _failed_response(status_code=400), 1.0)
+
+    # then
+    assert get_circuit_retry_after(TARGET_URL) == 0
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1, WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30
+)
+def test_circuit_half_open_allows_single_probe(webhook_response):
+    # given
+    record_response(TARGET_URL, _failed_response(), 1.0)
+    # the cooldown has passed
+    cache.delete(get_cache_key_open(TARGET_URL))
+
+    # when
+    first_retry_after = get_circuit_retry_after(TARGET_URL)
+    second_retry_after = get_circuit_retry_after(TARGET_URL)
+
+    # then
+    assert first_retry_after == 0
+    assert second_retry_after == 30
+
+    # when
+    record_response(TARGET_URL, webhook_response, 1.0)
+
+    # then
+    assert get_circuit_retry_after(TARGET_URL) == 0
+    assert get_circuit_retry_after(TARGET_URL) == 0
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=5, WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30
+)
+def test_failed_probe_opens_circuit_again():
+    # given
+    for _ in range(5):
+        record_response(TARGET_URL, _failed_response(), 1.0)
+    # the cooldown has passed
+    cache.delete(get_cache_key_open(TARGET_URL))
+    assert get_circuit_retry_after(TARGET_URL) == 0
+
+    # when
+    record_response(TARGET_URL, _failed_response(), 1.0)
+
+    # then
+    assert get_circuit_retry_after(TARGET_URL) == 30
+
+
+@override_settings(
+    WEBHOOK_TARGET_MAX_IN_FLIGHT=10, WEBHOOK_TARGET_LATENCY_THRESHOLD=2.0
+)
+def test_max_in_flight_lowered_for_slow_target():
+    # given
+    assert get_max_in_flight(TARGET_URL) == 10
+
+    # when
+    cache.set(get_cache_key_latency(TARGET_URL), 10.0)
+
+    # then
+    assert get_max_in_flight(TARGET_URL) == 2
+
+
+@override_settings(WEBHOOK_TARGET_MAX_IN_FLIGHT=2)
+def test_acquire_request_slot_limited():
+    # given
+    assert acquire_request_slot(TARGET_URL) == 0
+    assert acquire_request_slot(TARGET_URL) == 0
+
+    # when
+    retry_after = acquire_request_slot(TARGET_URL)
+
+    # then
+    assert retry_after == 1
+    release_request_slot(TARGET_URL)
+    assert acquire_request_slot(TARGET_URL) == 0
+
+
+@override_settings(
+    WEBHOOK_TARGET_MAX_IN_FLIGHT=1,
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1,
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30,
+)
+def test_acquire_request_slot_limited_releases_probe():
+    # given
+    record_response(TARGET_URL, _failed_response(), 1.0)
+    # the cooldown has passed
+    cache.delete(get_cache_key_open(TARGET_URL))
+    cache.set(get_cache_key_in_flight(TARGET_URL), 1)
+
+    # when
+    retry_after = acquire_request_slot(TARGET_URL)
+
+    # then
+    assert retry_after == 1
+    assert cache.get(get_cache_key_probe(TARGET_URL)) is None
+
+    # when
+    release_request_slot(TARGET_URL)
+
+    # then
+    assert acquire_request_slot(TARGET_URL) == 0
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_ENABLED=True,
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1,
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30,
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.apply_async"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_postponed_when_circuit_open(
+    mocked_send_response, mocked_apply_async, event_delivery
+):
+    # given
+    record_response(event_delivery.webhook.target_url, _failed_response(), 1.0)
+
+    # when
+    with pytest.raises(Retry):
+        send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_apply_async.assert_not_called()
+    attempt = EventDeliveryAttempt.objects.get()
+    assert attempt.delivery == event_delivery
+    assert attempt.status == EventDeliveryStatus.FAILED
+    assert attempt.response == "Delivery postponed, the target is unavailable."
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_ENABLED=True,
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1,
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30,
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.retry"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_postponed_exceeds_max_retries(
+    mocked_send_response, mocked_retry, event_delivery
+):
+    # given
+    mocked_retry.side_effect = MaxRetriesExceededError()
+    record_response(event_delivery.webhook.target_url, _failed_response(), 1.0)
+
+    # when
+    send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_retry.assert_called_once_with(
+        countdown=30, **send_webhook_request_async.retry_kwargs
+    )
+    assert EventDeliveryAttempt.objects.get().delivery == event_delivery
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.FAILED
+
+
+@override_settings(WEBHOOK_CIRCUIT_BREAKER_ENABLED=True, WEBHOOK_TARGET_MAX_IN_FLIGHT=1)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.apply_async"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_postponed_when_max_in_flight_reached(
+    mocked_send_response, mocked_apply_async, event_delivery
+):
+    # given
+    assert acquire_request_slot(event_delivery.webhook.target_url) == 0
+
+    # when
+    send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_apply_async.assert_called_once_with(
+        kwargs={"event_delivery_id": event_delivery.pk, "postponements": 1},
+        queue=None,
+        countdown=1,
+        retries=0,
+    )
+    assert not EventDeliveryAttempt.objects.exists()
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_ENABLED=True,
+    WEBHOOK_TARGET_MAX_IN_FLIGHT=1,
+    WEBHOOK_TARGET_MAX_POSTPONEMENTS=3,
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.apply_async"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_exceeds_max_postponements(
+    mocked_send_response, mocked_apply_async, event_delivery
+):
+    # given
+    assert acquire_request_slot(event_delivery.webhook.target_url) == 0
+
+    # when
+    send_webhook_request_async(event_delivery.pk, postponements=3)
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_apply_async.assert_not_called()
+    attempt = EventDeliveryAttempt.objects.get()
+    assert attempt.status == EventDeliveryStatus.FAILED
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.FAILED
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_ENABLED=True, WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_records_response(
+    mocked_send_response, event_delivery, webhook_response_failed
+):
+    # given
+    mocked_send_response.return_value = webhook_response_failed
+    target_url = event_delivery.webhook.target_url
+
+    # when
+    with pytest.raises(Retry):
+        send_webhook_request_async(event_delivery.pk)
+
+    # then
+    assert get_circuit_retry_after(target_url) > 0
+    assert acquire_request_slot("https://other.example.com/") == 0
+    assert cache.get(get_cache_key_in_flight(target_url)) == 0
+
+
+@override_settings(
+    WEBHOOK_CIRCUIT_BREAKER_ENABLED=True,
+    WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=1,
+    WEBHOOK_CIRCUIT_BREAKER_COOLDOWN=30,
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.apply_async"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_requests_batch_task_postpones_when_circuit_open(
+    mocked_send_response, mocked_apply_async, event_delivery
+):
+    # given
+    record_response(event_delivery.webhook.target_url, _failed_response(), 1.0)
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_apply_async.assert_called_once_with(
+        kwargs={"event_delivery_id": event_delivery.pk},
+        queue=None,
+        countdown=30,
+    )
+    attempt = EventDeliveryAttempt.objects.get()
+    assert attempt.status == EventDeliveryStatus.FAILED
+    assert attempt.response == "Delivery postponed, the target is unavailable."
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+
+
+@override_settings(WEBHOOK_CIRCUIT_BREAKER_ENABLED=True, WEBHOOK_TARGET_MAX_IN_FLIGHT=1)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.apply_async"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_requests_batch_task_respects_max_in_flight(
+    mocked_send_response, mocked_apply_async, event_delivery
+):
+    # given
+    target_url = event_delivery.webhook.target_url
+    assert acquire_request_slot(target_url) == 0
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    mocked_send_response.assert_not_called()
+    mocked_apply_async.assert_called_once_with(
+        kwargs={"event_delivery_id": event_delivery.pk},
+        queue=None,
+        countdown=1,
+    )
+    assert cache.get(get_cache_key_in_flight(target_url)) == 1
+
+
+@override_settings(WEBHOOK_CIRCUIT_BREAKER_ENABLED=True, WEBHOOK_TARGET_MAX_IN_FLIGHT=1)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_requests_batch_task_releases_request_slot(
+    mocked_send_response, event_delivery, webhook_response
+):
+    # given
+    mocked_send_response.return_value = webhook_response
+    target_url = event_delivery.webhook.target_url
+
+    # when
+    send_webhook_requests_batch_task()
+
+    # then
+    mocked_send_response.assert_called_once()
+    assert cache.get(get_cache_key_in_flight(target_url)) == 0
@@ -15,9 +15,11 @@ from celery import Task
 from celery.exceptions import MaxRetriesExceededError, Retry
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
 from google.cloud import pubsub_v1
 from requests import RequestException
+from requests_hardened import HTTPSession
 from requests_hardened.ip_filter import InvalidIPAddress
 
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
@@ -109,6 +111,7 @@ def send_webhook_using_http(
     event_type,
     timeout=settings.WEBHOOK_TIMEOUT,
     custom_headers: Optional[dict[str, str]] = None,
+    session: Optional[HTTPSession] = None,
 ) -> WebhookResponse:
     """Send a webhook request using http / https protocol.
 
@@ -119,6 +122,8 @@ def send_webhook_using_http(
     :param event_type: Webhook event type.
     :param timeout: Request timeout.
     :param custom_headers: Custom headers which will be added to request headers.
+    :param session: HTTP session to send the request with, allows reusing
+        connections between requests to the same host.
 
     :return: WebhookResponse object.
     """
@@ -137,8 +142,9 @@ def send_webhook_using_http(
     if custom_headers:
         headers.update(custom_headers)
 
+    send_request = session.request if session is not None else HTTPClient.send_request
     try:
-        response = HTTPClient.send_request(
+        response = send_request(
             "POST",
             target_url,
             data=message,
@@ -270,6 +276,7 @@ def send_webhook_using_scheme_method(
     event_type,
     data,
     custom_headers=None,
+    session: Optional[HTTPSession] = None,
 ) -> WebhookResponse:
     parts = urlparse(target_url)
     message = data if isinstance(data, bytes) else data.encode("utf-8")
@@ -282,6 +289,9 @@ def send_webhook_using_scheme_method(
     }
 
     if send_method := scheme_matrix.get(parts.scheme.lower()):
+        kwargs: dict[str, Any] = {"custom_headers": custom_headers}
+        if session is not None:
+            kwargs["session"] = session
         # try:
         return send_method(
             target_url,
@@ -289,7 +299,7 @@ def send_webhook_using_scheme_method(
             domain,
             signature,
             event_type,
-            custom_headers=custom_headers,
+            **kwargs,
         )
     raise ValueError(f"Unknown webhook scheme: {parts.scheme!r}")
 
@@ -396,10 +406,34 @@ def create_attempt(
     return attempt
 
 
+ATTEMPT_RESPONSE_FIELDS = [
+    "duration",
+    "response",
+    "response_headers",
+    "response_status_code",
+    "request_headers",
+    "status",
+]
+
+
 @allow_writer()
-def attempt_update(
-    attempt: "EventDeliveryAttempt",
-    webhook_response: "WebhookResponse",
+def create_attempts(
+    deliveries: list["EventDelivery"], task_id: Optional[str] = None
+) -> list["EventDeliveryAttempt"]:
+    return EventDeliveryAttempt.objects.bulk_create(
+        [
+            EventDeliveryAttempt(
+                delivery=delivery,
+                task_id=task_id,
+                status=EventDeliveryStatus.PENDING,
+            )
+            for delivery in deliveries
+        ]
+    )
+
+
+def _set_attempt_response(
+    attempt: "EventDeliveryAttempt", webhook_response: "WebhookResponse"
 ):
     attempt.duration = webhook_response.duration
     attempt.response = webhook_response.content
@@ -407,15 +441,25 @@ def attempt_update(
     attempt.response_status_code = webhook_response.response_status_code
     attempt.request_headers = json.dumps(webhook_response.request_headers)
     attempt.status = webhook_response.status
-    attempt.save(
-        update_fields=[
-            "duration",
-            "response",
-            "response_headers",
-            "response_status_code",
-            "request_headers",
-            "status",
-        ]
+
+
+@allow_writer()
+def attempt_update(
+    attempt: "EventDeliveryAttempt",
+    webhook_response: "WebhookResponse",
+):
+    _set_attempt_response(attempt, webhook_response)
+    attempt.save(update_fields=ATTEMPT_RESPONSE_FIELDS)
+
+
+@allow_writer()
+def bulk_attempt_update(
+    attempts_responses: list[tuple["EventDeliveryAttempt", "WebhookResponse"]],
+):
+    for attempt, webhook_response in attempts_responses:
+        _set_attempt_response(attempt, webhook_response)
+    EventDeliveryAttempt.objects.bulk_update(
+        [attempt for attempt, _ in attempts_responses], ATTEMPT_RESPONSE_FIELDS
     )
 
 
@@ -425,7 +469,7 @@ def clear_successful_delivery(delivery: "EventDelivery"):
         payload_id = delivery.payload_id
         delivery.delete()
         if payload_id:
-            EventPayload.objects.filter(pk=payload_id, deliveries__isnull=True).delete()
+            EventPayload.objects.filter(pk=payload_id).delete_unused()
 
 
 @allow_writer()
@@ -434,6 +478,26 @@ def delivery_update(delivery: "EventDelivery", status: str):
     delivery.save(update_fields=["status"])
 
 
+@allow_writer()
+def bulk_delivery_update(deliveries: list["EventDelivery"], status: str):
+    for delivery in deliveries:
+        delivery.status = status
+    EventDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(
+        status=status
+    )
+
+
+@allow_writer()
+def clear_successful_deliveries(deliveries: list["EventDelivery"]):
+    successful = [d for d in deliveries if d.status == EventDeliveryStatus.SUCCESS]
+    if not successful:
+        return
+    payload_ids = {d.payload_id for d in successful if d.payload_id}
+    EventDelivery.objects.filter(pk__in=[d.pk for d in successful]).delete()
+    if payload_ids:
+        EventPayload.objects.filter(pk__in=payload_ids).delete_unused()
+
+
 def trigger_transaction_request(
     transaction_data: "TransactionActionData", event_type: str, requestor
 ):
@@ -491,8 +555,8 @@ def trigger_transaction_request(
         payload = generate_transaction_action_request_payload(
             transaction_data, requestor
         )
-        with allow_writer():
-            event_payload = EventPayload.objects.create(payload=payload)
+        with allow_writer(), transaction.atomic():
+            event_payload = EventPayload.objects.create_with_payload(payload)
             delivery = EventDelivery.objects.create(
                 status=EventDeliveryStatus.PENDING,
                 event_type=event_type,
@@ -7,6 +7,7 @@ from django.db.models.expressions import Exists, OuterRef
 from ..app.models import App
 from .event_types import WebhookEventAsyncType, WebhookEventSyncType
 from .models import Webhook, WebhookEvent
+from .routing import get_webhook_routes_for_event
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -18,11 +19,40 @@ def get_webhooks_for_event(
     apps_ids: Optional["list[int]"] = None,
     apps_identifier: Optional[list[str]] = None,
 ) -> "QuerySet[Webhook]":
-    """Get active webhooks from the database for an event."""
-    permissions = {}
+    """Get active webhooks from the database for an event.
+
+    The webhooks are found with the routing table, unless it is disabled with
+    `WEBHOOK_ROUTING_TABLE_TIMEOUT`.
+    """
     required_permission = WebhookEventAsyncType.PERMISSIONS.get(
         event_type, WebhookEventSyncType.PERMISSIONS.get(event_type)
     )
+    if webhooks is None:
+        # For this QS replica usage is applied later, as this QS could be also passed
+        # as parameter.
+        webhooks = Webhook.objects.all()
+
+    if settings.WEBHOOK_ROUTING_TABLE_TIMEOUT:
+        routes = get_webhook_routes_for_event(
+            event_type,
+            required_permission.value if required_permission else None,
+            apps_ids=apps_ids,
+            apps_identifier=apps_identifier,
+        )
+        # the routing table may be stale until its version is checked again, so the
+        # webhooks and apps deactivated in the meantime are filtered out here
+        return (
+            webhooks.using(settings.DATABASE_CONNECTION_REPLICA_NAME)
+            .filter(
+                id__in=[route.webhook_id for route in routes],
+                is_active=True,
+                app__is_active=True,
+            )
+            .select_related("app")
+            .prefetch_related("app__permissions__content_type")
+        )
+
+    permissions = {}
     if required_permission:
         app_label, codename = required_permission.value.split(".")
         permissions["permissions__content_type__app_label"] = app_label
@@ -31,11 +61,6 @@ def get_webhooks_for_event(
     # In this function we use the replica database for all queryset reads, as there is
     # no risk that any mutation would change the result of these querysets.
 
-    if webhooks is None:
-        # For this QS replica usage is applied later, as this QS could be also passed
-        # as parameter.
-        webhooks = Webhook.objects.all()
-
     app_kwargs: dict = {"is_active": True, **permissions}
     if event_type != WebhookEventAsyncType.APP_DELETED:
         app_kwargs["removed_at__isnull"] = True